@@ -0,0 +1,144 @@
+"""
+p99 latency of GET /users/me while concurrent logins hash passwords.
+
+Runs the app in-process over an ASGI transport with the database swapped for a
+stub session, so the only CPU-heavy work on the request path is bcrypt. The
+"inline" mode reproduces the old behaviour (bcrypt on the event loop), the
+"pool" mode uses AuthUtil's bounded hash pool.
+
+    python -m benchmarks.bench_login_contention --logins 40 --probes 200
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import time
+from unittest.mock import patch
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret")
+
+import httpx  # noqa: E402
+
+from src.auth.utils.util import AuthUtil  # noqa: E402
+from src.database import get_db  # noqa: E402
+from src.main import app  # noqa: E402
+from src.user.models.user import User  # noqa: E402
+
+PASSWORD = "Password123#"
+
+
+class _StubResult:
+    def __init__(self, user):
+        self._user = user
+
+    def scalar_one_or_none(self):
+        return self._user
+
+
+class _StubSession:
+    def __init__(self, user):
+        self._user = user
+
+    async def execute(self, *args, **kwargs):
+        return _StubResult(self._user)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def _run(mode: str, logins: int, probes: int, concurrency: int) -> dict:
+    hashed = AuthUtil.HashPassword(PASSWORD)
+
+    def make_user():
+        return User(id=1, login="bench", email="bench@example.com", password=hashed,
+                    first_name="Bench", last_name="User")
+
+    async def stub_db():
+        yield _StubSession(make_user())
+
+    app.dependency_overrides[get_db] = stub_db
+    token = AuthUtil.GenerateToken({"id": "1"})
+    headers = {"access-token": token, "token-type": "bearer"}
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        login_queue = asyncio.Queue()
+        for _ in range(logins):
+            login_queue.put_nowait(None)
+
+        async def login_worker():
+            while not login_queue.empty():
+                login_queue.get_nowait()
+                await client.post("/auth/login", json={"login": "bench", "password": PASSWORD})
+
+        latencies = []
+        logins_done = asyncio.Event()
+
+        async def probe_once(scheduled: float):
+            response = await client.get("/users/me", headers=headers)
+            latencies.append((time.perf_counter() - scheduled) * 1000)
+            assert response.status_code == 200, response.text
+
+        async def probe():
+            # Open-loop probes timed from their scheduled start, so a stalled
+            # loop shows up as latency instead of as fewer samples
+            interval = 0.02
+            scheduled = time.perf_counter()
+            tasks = []
+            while len(tasks) < probes or not logins_done.is_set():
+                scheduled += interval
+                await asyncio.sleep(max(scheduled - time.perf_counter(), 0))
+                tasks.append(asyncio.create_task(probe_once(scheduled)))
+            await asyncio.gather(*tasks)
+
+        async def login_load():
+            await asyncio.gather(*(login_worker() for _ in range(concurrency)))
+            logins_done.set()
+
+        started = time.perf_counter()
+        await asyncio.gather(probe(), login_load())
+        elapsed = time.perf_counter() - started
+
+    app.dependency_overrides.pop(get_db, None)
+    return {
+        "mode": mode,
+        "logins": logins,
+        "probes": len(latencies),
+        "elapsed_s": round(elapsed, 3),
+        "users_me_p50_ms": round(statistics.median(latencies), 2),
+        "users_me_p99_ms": round(_percentile(latencies, 99), 2),
+        "users_me_max_ms": round(max(latencies), 2),
+    }
+
+
+async def main(logins: int, probes: int, concurrency: int) -> list[dict]:
+    results = []
+
+    async def inline_verify(plain_password, hashed_password):
+        return AuthUtil.VerifyPassword(plain_password, hashed_password)
+
+    with patch.object(AuthUtil, "VerifyPasswordAsync", staticmethod(inline_verify)):
+        results.append(await _run("inline", logins, probes, concurrency))
+    results.append(await _run("pool", logins, probes, concurrency))
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--logins", type=int, default=40)
+    parser.add_argument("--probes", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+    for row in asyncio.run(main(args.logins, args.probes, args.concurrency)):
+        print(json.dumps(row))
@@ -0,0 +1,115 @@
+"""
+Cost of the always-on metrics path per request.
+
+Measures three things:
+- the recording call alone (MetricsRegistry.observe_request)
+- the whole MetricsMiddleware around a trivial ASGI app, against the bare app
+- end-to-end GET / through the real app over ASGI, for scale
+
+It also checks, with tracemalloc, that steady-state recording does not grow memory.
+
+    python -m benchmarks.bench_metrics_overhead --requests 50000
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+import tracemalloc
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret")
+
+import httpx  # noqa: E402
+
+from src.main import app  # noqa: E402
+from src.monitoring.middleware import MetricsMiddleware  # noqa: E402
+from src.monitoring.utils.metrics import MetricsRegistry  # noqa: E402
+
+
+class _Route:
+    path = "/users/{user_id}"
+
+
+async def _trivial_app(scope, receive, send):
+    scope["route"] = _Route
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+async def _receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def _send(message):
+    pass
+
+
+def _bench_record(n: int) -> dict:
+    registry = MetricsRegistry()
+    registry.observe_request("GET", "/users/{user_id}", 200, 0.001)
+
+    started = time.perf_counter()
+    for _ in range(n):
+        registry.observe_request("GET", "/users/{user_id}", 200, 0.001)
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for _ in range(n):
+        registry.observe_request("GET", "/users/{user_id}", 200, 0.001)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    grown = sum(stat.size_diff for stat in after.compare_to(before, "filename")
+                if stat.traceback[0].filename.endswith("metrics.py") or "histogram" in stat.traceback[0].filename)
+
+    return {"case": "observe_request", "ns_per_op": round(elapsed / n * 1e9, 1), "bytes_retained": grown}
+
+
+async def _bench_middleware(n: int) -> list[dict]:
+    scope = {"type": "http", "method": "GET", "path": "/users/1"}
+    wrapped = MetricsMiddleware(_trivial_app, MetricsRegistry())
+    results = {}
+    for name, asgi in (("bare", _trivial_app), ("middleware", wrapped)):
+        for _ in range(1000):
+            await asgi(dict(scope), _receive, _send)
+        started = time.perf_counter()
+        for _ in range(n):
+            await asgi(dict(scope), _receive, _send)
+        results[name] = (time.perf_counter() - started) / n * 1e6
+
+    return [
+        {"case": "asgi_bare", "us_per_request": round(results["bare"], 3)},
+        {"case": "asgi_with_metrics", "us_per_request": round(results["middleware"], 3),
+         "overhead_us": round(results["middleware"] - results["bare"], 3)},
+    ]
+
+
+async def _bench_app(n: int) -> dict:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for _ in range(200):
+            await client.get("/")
+        started = time.perf_counter()
+        for _ in range(n):
+            await client.get("/")
+        elapsed = time.perf_counter() - started
+    return {"case": "app_get_root", "us_per_request": round(elapsed / n * 1e6, 1)}
+
+
+async def main(requests: int) -> list[dict]:
+    results = [_bench_record(requests)]
+    results += await _bench_middleware(requests)
+    results.append(await _bench_app(max(requests // 20, 500)))
+    overhead = results[2]["overhead_us"]
+    results.append({"case": "summary", "overhead_share_of_root_request_pct":
+                    round(overhead / results[3]["us_per_request"] * 100, 2)})
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=50000)
+    args = parser.parse_args()
+    for row in asyncio.run(main(args.requests)):
+        print(json.dumps(row))
@@ -0,0 +1,167 @@
+"""
+Response serialization for the conversation and search endpoints.
+
+Compares, per response of N rows:
+- legacy: model_validate(row.__dict__) per row in the service, then FastAPI's
+  response_model pass, which validates the list again and dumps it
+- trusted: src.serialization.trusted_list plus json_response
+
+then times GET /messages/conversation/{id} and POST /users/search end to end
+over ASGI against a seeded temporary SQLite database.
+
+    python -m benchmarks.bench_serialization --rows 50 200 --requests 300
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+_DB = os.path.join(tempfile.mkdtemp(prefix="bench-serialization-"), "bench.db")
+os.environ.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{_DB}")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret")
+
+import httpx  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from src.main import app  # noqa: E402
+from src.auth.utils.util import AuthUtil  # noqa: E402
+from src.database import get_db  # noqa: E402
+from src.dependencies import get_read_db  # noqa: E402
+from src.messages.models.message import Message  # noqa: E402
+from src.messages.schemas.message import MessageSchema  # noqa: E402
+from src.models import Base  # noqa: E402
+from src.serialization import json_response, trusted_list  # noqa: E402
+from src.user.models.user import User  # noqa: E402
+from src.user.models.user_photo import UserPhoto  # noqa: E402
+from src.user.schemas.user import UserSchema  # noqa: E402
+from src.user.schemas.user_photo import UserPhotoSchema  # noqa: E402
+
+
+def _messages(n: int) -> list[Message]:
+    start = datetime(2025, 1, 1)
+    return [Message(id=i, text=f"Message number {i} in a fairly ordinary conversation.", photo_url=None,
+                    timestamp=start + timedelta(minutes=i), sender_id=1 + i % 2, receiver_id=2 - i % 2)
+            for i in range(1, n + 1)]
+
+
+def _users(n: int) -> list[User]:
+    users = []
+    for i in range(1, n + 1):
+        user = User(id=i, login=f"user{i}", email=f"user{i}@example.com", password="x",
+                    phone_number="+48 123456789", first_name="First", last_name="Last", profile_photo_id=i)
+        user.profile_photo = UserPhoto(id=i, user_id=i, photo_url=f"https://example.com/{i}.jpg")
+        users.append(user)
+    return users
+
+
+# What FastAPI builds for response_model=List[...]
+_MESSAGES_RESPONSE = TypeAdapter(list[MessageSchema])
+_USERS_RESPONSE = TypeAdapter(list[UserSchema])
+
+
+def _legacy_messages(messages: list[Message]) -> bytes:
+    models = [MessageSchema.model_validate(dict(msg.__dict__)) for msg in messages]
+    return _MESSAGES_RESPONSE.dump_json(_MESSAGES_RESPONSE.validate_python(models))
+
+
+def _legacy_users(users: list[User]) -> bytes:
+    models = []
+    for user in users:
+        values = dict(user.__dict__)
+        values["profile_photo"] = UserPhotoSchema.model_validate(user.profile_photo.__dict__)
+        models.append(UserSchema.model_validate(values))
+    return _USERS_RESPONSE.dump_json(_USERS_RESPONSE.validate_python(models))
+
+
+def _time(fn, rows, repeat: int) -> float:
+    fn(rows)
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn(rows)
+    return (time.perf_counter() - started) / repeat * 1e6
+
+
+def _bench_serialization(sizes: list[int], repeat: int) -> list[dict]:
+    cases = (
+        ("conversation", _messages, _legacy_messages,
+         lambda rows: json_response(list[MessageSchema], trusted_list(MessageSchema, rows)).body),
+        ("search", _users, _legacy_users,
+         lambda rows: json_response(list[UserSchema], trusted_list(UserSchema, rows)).body),
+    )
+    results = []
+    for name, build, legacy, fast in cases:
+        for n in sizes:
+            rows = build(n)
+            assert json.loads(legacy(rows)) == json.loads(fast(rows))
+            before, after = _time(legacy, rows, repeat), _time(fast, rows, repeat)
+            results.append({"case": f"serialize_{name}", "rows": n, "legacy_us": round(before, 1),
+                            "trusted_us": round(after, 1), "speedup": round(before / after, 2)})
+    return results
+
+
+async def _bench_endpoints(rows: int, requests: int) -> list[dict]:
+    engine = create_async_engine(os.environ["DATABASE_URL"])
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with factory() as session:
+        users = _users(rows)
+        for user in users:
+            user.profile_photo_id, user.profile_photo = None, None
+        session.add_all(users)
+        await session.flush()
+        session.add_all(UserPhoto(id=user.id, user_id=user.id, photo_url=f"https://example.com/{user.id}.jpg")
+                        for user in users)
+        await session.flush()
+        for user in users:
+            user.profile_photo_id = user.id
+        session.add_all(_messages(rows))
+        await session.commit()
+
+    async def test_db():
+        async with factory() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = test_db
+    app.dependency_overrides[get_read_db] = test_db
+    headers = {"access-token": AuthUtil.GenerateAccessToken(1), "token-type": "bearer"}
+    calls = (
+        ("GET /messages/conversation/{user_id}", "GET", "/messages/conversation/2", {"params": {"limit": rows}}),
+        ("POST /users/search", "POST", "/users/search", {"json": {"login": "user"}}),
+    )
+    results = []
+    try:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+            for route, method, path, kwargs in calls:
+                for _ in range(20):
+                    assert (await client.request(method, path, headers=headers, **kwargs)).status_code == 200
+                started = time.perf_counter()
+                for _ in range(requests):
+                    await client.request(method, path, headers=headers, **kwargs)
+                elapsed = time.perf_counter() - started
+                results.append({"case": route, "rows": rows, "us_per_request": round(elapsed / requests * 1e6, 1)})
+    finally:
+        app.dependency_overrides.clear()
+        await engine.dispose()
+    return results
+
+
+async def main(sizes: list[int], requests: int) -> list[dict]:
+    results = _bench_serialization(sizes, repeat=max(requests, 100))
+    results += await _bench_endpoints(max(sizes), requests)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[50, 200])
+    parser.add_argument("--requests", type=int, default=300)
+    args = parser.parse_args()
+    for row in asyncio.run(main(args.rows, args.requests)):
+        print(json.dumps(row))
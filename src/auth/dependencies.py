@@ -1,16 +1,44 @@
-from fastapi import Depends, HTTPException, Header
+from fastapi import Depends, HTTPException, Header, status
 from src.auth.utils.util import AuthUtil
+from src.auth.utils.token_cache import CachingTokenVerifier, TokenVerifier
+from src.auth.utils.revocation import revocation_store
 from src.auth.schemas.token_data import TokenData
 from src.auth.schemas.token import TokenSchema
+from src.config import settings
+from src.database import current_user_id
 from typing import Optional
 
 
+token_verifier: TokenVerifier = (
+    CachingTokenVerifier(max_size=settings.TOKEN_CACHE_SIZE)
+    if settings.TOKEN_CACHE_SIZE > 0 else TokenVerifier()
+)
+
+
+def set_token_verifier(verifier: TokenVerifier) -> None:
+    global token_verifier
+    token_verifier = verifier
+
+
 async def get_token_data(token: TokenSchema = Header(..., alias="Authorization")) -> TokenData:
     if not token.access_token:
         raise HTTPException(status_code=401, detail="Invalid or missing token")
 
     try:
-        token_data = AuthUtil.TokenVerification(token.access_token)
-        return token_data
+        token_data = token_verifier.verify(token.access_token)
     except HTTPException as e:
         raise e
+
+    if token_data.type != "access":
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token type"
+        )
+    if token_data.jti and await revocation_store.is_revoked(token_data.jti):
+        token_verifier.invalidate(token.access_token)
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been revoked"
+        )
+    current_user_id.set(token_data.id)
+    return token_data
@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, File, HTTPException, Header, Request, UploadFile, status
+from typing import Optional
 from pydantic import EmailStr
 from src.auth.dependencies import get_token_data, TokenData
 from src.auth.schemas.register import RegisterResponse
@@ -8,6 +9,14 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from src.auth.schemas.login import LoginRequest
 from src.user.schemas.user import UserCreate
 from src.auth.schemas.password import PasswordBase, PasswordChange
+from src.auth.schemas.refresh import RefreshRequest
+from src.auth.schemas.token import TokenSchema
+from src.auth.utils.throttle import client_ip, login_throttle
+from src.auth.utils.bulk_import import detect_format, iter_rows, text_stream
+from src.auth.schemas.bulk import BulkRegisterResponse
+from src.auth.schemas.availability import AvailabilityResponse
+from src.config import settings
+from src.monitoring.dependencies import require_internal_token
 
 router = APIRouter(
     prefix="/auth",
@@ -16,11 +25,34 @@ router = APIRouter(
 
 
 @router.post("/login")
-async def login(user: LoginRequest, db: AsyncSession = Depends(get_db)):
+async def login(user: LoginRequest, request: Request, db: AsyncSession = Depends(get_db)):
     """
     Route for user login.
     """
-    return await AuthService.login(db, user.login, user.password)
+    ip = client_ip(request, settings.TRUSTED_PROXY_HOPS)
+    await login_throttle.check(ip, user.login)
+    token = await AuthService.login(db, user.login, user.password)
+    await login_throttle.reset_login(ip, user.login)
+    return token
+
+
+@router.post("/refresh", response_model=TokenSchema)
+async def refresh(request: RefreshRequest, db: AsyncSession = Depends(get_db)):
+    """
+    Exchange a refresh token for a new access/refresh token pair.
+    """
+    return await AuthService.refresh(db, request.refresh_token)
+
+
+@router.post("/logout", response_model=dict)
+async def logout(
+    token: TokenSchema = Header(..., alias="Authorization"),
+    token_data: TokenData = Depends(get_token_data)
+):
+    """
+    Revoke the current access token and, if sent, the refresh token.
+    """
+    return await AuthService.logout(token_data, token.refresh_token)
 
 
 @router.post("/register", response_model=RegisterResponse)
@@ -31,6 +63,27 @@ async def register(user: UserCreate, db: AsyncSession = Depends(get_db)):
     return await AuthService.register(db, user)
 
 
+@router.post("/register/bulk", response_model=BulkRegisterResponse,
+             dependencies=[Depends(require_internal_token)])
+async def bulk_register(
+    file: UploadFile = File(...),
+    format: Optional[str] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Register many users from an uploaded CSV or NDJSON file. Operators only:
+    requires the internal token, as the import hashes on every core.
+    """
+    fmt = format or detect_format(file.filename, file.content_type)
+    if fmt not in ("csv", "ndjson"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Format must be csv or ndjson"
+        )
+    return await AuthService.bulk_register(
+        db, iter_rows(text_stream(file.file), fmt), batch_size=settings.BULK_IMPORT_BATCH_SIZE)
+
+
 @router.put("/change-password", response_model=dict)
 async def change_password(
     password_change: PasswordChange,
@@ -55,6 +108,23 @@ async def forgot_password(
     return await AuthService.forgot_password(db, user_id, passwords)
 
 
+@router.get("/availability", response_model=AvailabilityResponse)
+async def availability(
+    email: Optional[EmailStr] = None,
+    login: Optional[str] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Report whether an email and/or login is still free to register.
+    """
+    if email is None and login is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Provide an email or a login"
+        )
+    return await AuthService.check_availability(db, email, login)
+
+
 @router.get("/check-email", response_model=int)
 async def check_email(
     email: EmailStr,
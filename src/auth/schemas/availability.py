@@ -0,0 +1,7 @@
+from typing import Optional
+from pydantic import BaseModel
+
+
+class AvailabilityResponse(BaseModel):
+    email: Optional[bool] = None
+    login: Optional[bool] = None
@@ -0,0 +1,20 @@
+from typing import List, Optional
+from pydantic import BaseModel
+
+
+class BulkRowResult(BaseModel):
+    row: int
+    status: str  # "created", "duplicate" or "invalid"
+    user_id: Optional[int] = None
+    login: Optional[str] = None
+    errors: List[str] = []
+
+
+class BulkRegisterResponse(BaseModel):
+    total: int
+    created: int
+    duplicates: int
+    invalid: int
+    elapsed_seconds: float
+    users_per_second: float
+    rows: List[BulkRowResult]
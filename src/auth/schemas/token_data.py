@@ -1,6 +1,9 @@
+from typing import Optional
 from pydantic import BaseModel
 
 
 class TokenData(BaseModel):
     id: int
     exp: int
+    jti: Optional[str] = None
+    type: str = "access"
@@ -5,24 +5,78 @@ from src.auth.schemas import password
 from src.auth.schemas.password import PasswordBase, PasswordChange
 from src.config import settings
 from src.auth.schemas.token import TokenSchema
+from src.auth.schemas.token_data import TokenData
 from src.user.schemas.user import UserCreate, UserSchema
 from src.user.models.user import User
-from passlib.context import CryptContext
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import Boolean, exc, select
+from sqlalchemy import Boolean, exc, or_, select
 from src.auth.schemas.register import RegisterResponse
 from src.auth.utils.util import AuthUtil
+from src.auth.utils.revocation import revocation_store
+from typing import Optional
+from src.auth.utils.rehash import schedule_rehash
+from src.auth.utils.bulk_import import MAX_BATCH_SIZE, hash_passwords, read_batches, validate_row
+from src.auth.schemas.bulk import BulkRegisterResponse, BulkRowResult
+from src.auth.schemas.availability import AvailabilityResponse
+from src.auth.utils.availability import availability_index
+from concurrent.futures import Executor
+from typing import Iterable
+import time
+from src.monitoring.utils.metrics import instrumented
+from src.dialects import insert_ignore
 
 
-pwd_context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=12)
-ALGORITHM = "HS256"
+@instrumented
+class AuthService:
+
+    @staticmethod
+    async def find_taken(
+        db: AsyncSession,
+        email: Optional[str] = None,
+        login: Optional[str] = None
+    ) -> tuple[Optional[int], Optional[int]]:
+        """
+        Return the ids of the users owning `email` and `login` using a single
+        id/login/email projection query.
+        """
+        conditions = []
+        if email is not None:
+            conditions.append(User.email == email)
+        if login is not None:
+            conditions.append(User.login == login)
+        if not conditions:
+            return None, None
 
+        result = await db.execute(
+            select(User.id, User.login, User.email).where(or_(*conditions)))
+        availability_index.record_database_check()
+        email_owner = login_owner = None
+        for row in result:
+            if email is not None and row.email == email:
+                email_owner = row.id
+            if login is not None and row.login == login:
+                login_owner = row.id
+        return email_owner, login_owner
 
-class AuthService:
+    @staticmethod
+    async def _ensure_available(db: AsyncSession, user: UserCreate) -> None:
+        email_owner, login_owner = await AuthService.find_taken(db, user.email, user.login)
+        if login_owner is not None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Login already exists"
+            )
+        if email_owner is not None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Email already exists"
+            )
 
     @staticmethod
     async def register(db: AsyncSession, user: UserCreate) -> RegisterResponse:
-        hashed_password = AuthUtil.HashPassword(user.password)
+        # Checked before hashing so duplicates never cost a bcrypt round
+        await AuthService._ensure_available(db, user)
+        hashed_password = await AuthUtil.HashPasswordAsync(user.password)
 
         new_user = User(
             login=user.login,
@@ -38,28 +92,21 @@ class AuthService:
             await db.flush()
             await db.commit()
             await db.refresh(new_user)
+            availability_index.mark_taken("login", new_user.login)
+            availability_index.mark_taken("email", new_user.email)
 
             response = RegisterResponse(
                 user_id=new_user.id, email=new_user.email)
 
             return RegisterResponse.model_validate(response)
-        except exc.IntegrityError as e:
+        except exc.IntegrityError:
+            # Lost a race with a concurrent registration; ask again to say which
             await db.rollback()
-            if "users_login_key" in str(e.orig):
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Login already exists"
-                )
-            elif "users_email_key" in str(e.orig):
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Email already exists"
-                )
-            else:
-                raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail="Failed to register user"
-                )
+            await AuthService._ensure_available(db, user)
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to register user"
+            )
         except exc.SQLAlchemyError as e:
             await db.rollback()
             raise HTTPException(
@@ -70,27 +117,185 @@ class AuthService:
             if db.in_transaction():
                 await db.rollback()
 
+    @staticmethod
+    async def check_availability(
+        db: AsyncSession,
+        email: Optional[str] = None,
+        login: Optional[str] = None
+    ) -> AvailabilityResponse:
+        response = AvailabilityResponse()
+        unknown = {}
+        for kind, value in (("email", email), ("login", login)):
+            if value is None:
+                continue
+            if availability_index.is_known_available(kind, value):
+                setattr(response, kind, True)
+            else:
+                unknown[kind] = value
+
+        if unknown:
+            email_owner, login_owner = await AuthService.find_taken(
+                db, unknown.get("email"), unknown.get("login"))
+            owners = {"email": email_owner, "login": login_owner}
+            for kind, value in unknown.items():
+                available = owners[kind] is None
+                if available:
+                    availability_index.remember_available(kind, value)
+                else:
+                    availability_index.mark_taken(kind, value)
+                setattr(response, kind, available)
+
+        return response
+
+    @staticmethod
+    async def bulk_register(
+        db: AsyncSession,
+        rows: Iterable[dict],
+        batch_size: int = 1000,
+        executor: Optional[Executor] = None
+    ) -> BulkRegisterResponse:
+        started = time.perf_counter()
+        report: list[BulkRowResult] = []
+        seen_logins: set[str] = set()
+        seen_emails: set[str] = set()
+        row_number = 0
+
+        async for batch in read_batches(rows, min(batch_size, MAX_BATCH_SIZE)):
+            pending: list[tuple[int, UserCreate]] = []
+            for raw in batch:
+                row_number += 1
+                user, errors = validate_row(raw)
+                if errors:
+                    report.append(BulkRowResult(row=row_number, status="invalid", errors=errors))
+                    continue
+                if user.login in seen_logins or user.email in seen_emails:
+                    report.append(BulkRowResult(
+                        row=row_number, status="duplicate", login=user.login,
+                        errors=["Login or email repeated earlier in the file"]))
+                    continue
+                seen_logins.add(user.login)
+                seen_emails.add(user.email)
+                pending.append((row_number, user))
+
+            if not pending:
+                continue
+
+            hashes = await hash_passwords([user.password for _, user in pending], executor)
+            values = [
+                {
+                    "login": user.login,
+                    "email": user.email,
+                    "password": hashed,
+                    "phone_number": user.phone_number,
+                    "first_name": user.first_name,
+                    "last_name": user.last_name,
+                }
+                for (_, user), hashed in zip(pending, hashes)
+            ]
+            try:
+                result = await db.execute(
+                    insert_ignore(db, User.__table__).values(values).returning(User.id, User.login))
+                created = {row.login: row.id for row in result}
+                await db.commit()
+            except exc.SQLAlchemyError as e:
+                await db.rollback()
+                raise HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail=f"Database error after {row_number} rows: {e}"
+                )
+
+            for number, user in pending:
+                if user.login in created:
+                    availability_index.mark_taken("login", user.login)
+                    availability_index.mark_taken("email", user.email)
+                    report.append(BulkRowResult(
+                        row=number, status="created", user_id=created[user.login], login=user.login))
+                else:
+                    report.append(BulkRowResult(
+                        row=number, status="duplicate", login=user.login,
+                        errors=["Login or email already exists"]))
+
+        report.sort(key=lambda item: item.row)
+        elapsed = time.perf_counter() - started
+        created_count = sum(item.status == "created" for item in report)
+        return BulkRegisterResponse(
+            total=row_number,
+            created=created_count,
+            duplicates=sum(item.status == "duplicate" for item in report),
+            invalid=sum(item.status == "invalid" for item in report),
+            elapsed_seconds=round(elapsed, 3),
+            users_per_second=round(created_count / elapsed, 1) if elapsed > 0 else 0.0,
+            rows=report,
+        )
+
     @staticmethod
     async def login(db: AsyncSession, login: str, password: str) -> TokenSchema:
         user_query = select(User).where(User.login == login)
         result = await db.execute(user_query)
         user = result.scalar_one_or_none()
 
-        if not user or not AuthUtil.VerifyPassword(password, user.password):
+        if not user or not await AuthUtil.VerifyPasswordAsync(password, user.password):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid credentials"
             )
 
-        token = AuthUtil.GenerateToken({"id": str(user.id)})
+        if AuthUtil.NeedsRehash(user.password):
+            schedule_rehash(user.id, password, user.password)
 
         result = TokenSchema(
-            access_token=token,
-            token_type="bearer"
+            access_token=AuthUtil.GenerateAccessToken(user.id),
+            token_type="bearer",
+            refresh_token=AuthUtil.GenerateRefreshToken(user.id)
         )
 
         return result
 
+    @staticmethod
+    async def refresh(db: AsyncSession, refresh_token: str) -> TokenSchema:
+        token_data = AuthUtil.TokenVerification(refresh_token)
+
+        if token_data.type != "refresh" or not token_data.jti:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid refresh token"
+            )
+        # Rotation: every refresh token can be exchanged exactly once. Revoking
+        # is the check, so of two concurrent refreshes only one gets tokens
+        if not await revocation_store.revoke(token_data.jti, token_data.exp):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Refresh token has been revoked"
+            )
+        user_query = select(User.id).where(User.id == token_data.id)
+        if (await db.execute(user_query)).scalar_one_or_none() is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="User no longer exists"
+            )
+
+        return TokenSchema(
+            access_token=AuthUtil.GenerateAccessToken(token_data.id),
+            token_type="bearer",
+            refresh_token=AuthUtil.GenerateRefreshToken(token_data.id)
+        )
+
+    @staticmethod
+    async def logout(token_data: TokenData, refresh_token: Optional[str] = None) -> dict:
+        if token_data.jti:
+            await revocation_store.revoke(token_data.jti, token_data.exp)
+
+        if refresh_token:
+            try:
+                refresh_data = AuthUtil.TokenVerification(refresh_token)
+            except HTTPException:
+                refresh_data = None
+            if refresh_data and refresh_data.type == "refresh" and refresh_data.jti \
+                    and refresh_data.id == token_data.id:
+                await revocation_store.revoke(refresh_data.jti, refresh_data.exp)
+
+        return {"message": "Logged out successfully"}
+
     @staticmethod
     async def change_password(db: AsyncSession, user_id: int, password_change: PasswordChange) -> dict:
         user_query = select(User).where(User.id == user_id)
@@ -102,19 +307,19 @@ class AuthService:
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="User not found"
             )
-        if not AuthUtil.VerifyPassword(password_change.current_password, user.password):
+        if not await AuthUtil.VerifyPasswordAsync(password_change.current_password, user.password):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Current password is incorrect"
             )
 
-        elif AuthUtil.VerifyPassword(password_change.password, user.password):
+        elif await AuthUtil.VerifyPasswordAsync(password_change.password, user.password):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="New password can't be the same as the old password"
             )
 
-        user.password = AuthUtil.HashPassword(password_change.password)
+        user.password = await AuthUtil.HashPasswordAsync(password_change.password)
         try:
             await db.flush()
             await db.commit()
@@ -129,17 +334,22 @@ class AuthService:
 
     @staticmethod
     async def check_email(db: AsyncSession, email: EmailStr) -> int:
-        query = select(User).where(User.email == email)
-        result = await db.execute(query)
-        user = result.scalar_one_or_none()
+        not_found = HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User with provided email does not exists"
+        )
+        if availability_index.is_known_available("email", email):
+            raise not_found
 
-        if not user:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="User with provided email does not exists"
-            )
+        result = await db.execute(select(User.id).where(User.email == email))
+        availability_index.record_database_check()
+        user_id = result.scalar_one_or_none()
+
+        if user_id is None:
+            availability_index.remember_available("email", email)
+            raise not_found
 
-        return user.id
+        return user_id
 
     @staticmethod
     async def forgot_password(db: AsyncSession, user_id: int, passwords: PasswordBase):
@@ -152,13 +362,13 @@ class AuthService:
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="User not found"
             )
-        elif AuthUtil.VerifyPassword(passwords.password, user.password):
+        elif await AuthUtil.VerifyPasswordAsync(passwords.password, user.password):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="New password can't be the same as the old password"
             )
 
-        user.password = AuthUtil.HashPassword(passwords.password)
+        user.password = await AuthUtil.HashPasswordAsync(passwords.password)
         try:
             await db.flush()
             await db.commit()
@@ -173,5 +383,3 @@ class AuthService:
 
         # TODO: Forgot password
         # TODO: Change password
-        # TODO: Refresh token
-        # TODO: Logout
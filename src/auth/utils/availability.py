@@ -0,0 +1,141 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from sqlalchemy import select
+
+from src.auth.utils.revocation import BloomFilter
+from src.config import settings
+from src.database import async_session
+from src.user.models.user import User
+
+
+class AvailabilityIndex:
+    """
+    Answers "is this login/email free?" without a query where it safely can.
+
+    Values the database recently reported as free are cached for `ttl_seconds`.
+    With `filter_enabled`, a Bloom filter over every taken login and email
+    answers "definitely available" for values it has never seen; it is rebuilt
+    from the users table every `sync_seconds` in the background, which also
+    picks up registrations made by other workers. Both layers are advisory:
+    registration always asks the database.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = 5.0,
+        max_entries: int = 10000,
+        filter_enabled: bool = False,
+        filter_capacity: int = 1000000,
+        sync_seconds: float = 300.0,
+        session_factory=async_session,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.filter_enabled = filter_enabled
+        self.filter_capacity = filter_capacity
+        self.sync_seconds = sync_seconds
+        self.session_factory = session_factory
+        self._clock = clock
+        self._available: OrderedDict[str, float] = OrderedDict()
+        self._filter: Optional[BloomFilter] = None
+        self._last_sync: Optional[float] = None
+        self._sync_task: Optional[asyncio.Task] = None
+        self._taken_since_sync: list[str] = []
+        self.cache_hits = 0
+        self.filter_negatives = 0
+        self.database_checks = 0
+
+    @staticmethod
+    def _key(kind: str, value: str) -> str:
+        return f"{kind}:{value}"
+
+    def is_known_available(self, kind: str, value: str) -> bool:
+        key = self._key(kind, value)
+        expires_at = self._available.get(key)
+        if expires_at is not None:
+            if expires_at > self._clock():
+                self.cache_hits += 1
+                return True
+            del self._available[key]
+
+        self._maybe_sync()
+        if self._filter is not None and key not in self._filter:
+            self.filter_negatives += 1
+            return True
+        return False
+
+    def remember_available(self, kind: str, value: str) -> None:
+        key = self._key(kind, value)
+        self._available[key] = self._clock() + self.ttl_seconds
+        self._available.move_to_end(key)
+        while len(self._available) > self.max_entries:
+            self._available.popitem(last=False)
+
+    def record_database_check(self) -> None:
+        self.database_checks += 1
+
+    def mark_taken(self, kind: str, value: str) -> None:
+        key = self._key(kind, value)
+        self._available.pop(key, None)
+        if self._filter is not None:
+            self._filter.add(key)
+        self._taken_since_sync.append(key)
+
+    async def _rebuild(self) -> None:
+        marker = len(self._taken_since_sync)
+        keys = []
+        async with self.session_factory() as session:
+            result = await session.stream(select(User.login, User.email))
+            async for login, email in result:
+                keys.append(self._key("login", login))
+                keys.append(self._key("email", email))
+
+        bloom = BloomFilter(max(self.filter_capacity, len(keys) * 2))
+        for key in keys:
+            bloom.add(key)
+        # Registrations made while the table was being read may be missing from `keys`
+        for key in self._taken_since_sync[marker:]:
+            bloom.add(key)
+        self._filter = bloom
+        self._taken_since_sync = []
+        self._last_sync = self._clock()
+
+    async def sync(self) -> None:
+        if self.filter_enabled:
+            await self._rebuild()
+
+    def _maybe_sync(self) -> None:
+        # Requests never wait for a rebuild; until the first one finishes every
+        # lookup that misses the cache goes to the database
+        if not self.filter_enabled or (self._sync_task is not None and not self._sync_task.done()):
+            return
+        if self._last_sync is None or self._clock() - self._last_sync >= self.sync_seconds:
+            self._sync_task = asyncio.get_running_loop().create_task(self._rebuild())
+
+    def clear(self) -> None:
+        self._available.clear()
+        self._filter = None
+        self._last_sync = None
+        self._taken_since_sync = []
+
+    def stats(self) -> dict:
+        return {
+            "cached_available": len(self._available),
+            "filter_entries": self._filter.count if self._filter is not None else None,
+            "cache_hits": self.cache_hits,
+            "filter_negatives": self.filter_negatives,
+            "database_checks": self.database_checks,
+        }
+
+
+availability_index = AvailabilityIndex(
+    ttl_seconds=settings.AVAILABILITY_CACHE_TTL_SECONDS,
+    max_entries=settings.AVAILABILITY_CACHE_SIZE,
+    filter_enabled=settings.AVAILABILITY_FILTER_ENABLED,
+    filter_capacity=settings.AVAILABILITY_FILTER_CAPACITY,
+    sync_seconds=settings.AVAILABILITY_FILTER_SYNC_SECONDS,
+)
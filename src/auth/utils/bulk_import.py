@@ -0,0 +1,158 @@
+"""
+Bulk user import from CSV or NDJSON.
+
+    python -m src.auth.utils.bulk_import users.csv --report report.json
+"""
+import argparse
+import asyncio
+import csv
+import io
+import json
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from itertools import islice
+from typing import IO, AsyncIterator, Iterable, Iterator, Optional
+
+from pydantic import ValidationError
+
+from src.auth.utils.util import AuthUtil
+from src.config import settings
+from src.user.schemas.user import UserCreate
+
+USER_FIELDS = ("login", "email", "password", "phone_number", "first_name", "last_name")
+# asyncpg binds at most 32767 parameters per statement, one per column of each row inserted
+MAX_BATCH_SIZE = 32767 // len(USER_FIELDS)
+
+_executor: Optional[Executor] = None
+
+
+def get_bulk_executor() -> Executor:
+    # Separate from the login hash pool so an import never starves logins
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=settings.BULK_IMPORT_WORKERS or os.cpu_count())
+    return _executor
+
+
+def shutdown_bulk_executor() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def detect_format(filename: Optional[str], content_type: Optional[str] = None) -> str:
+    name = (filename or "").lower()
+    if name.endswith((".ndjson", ".jsonl")) or content_type in ("application/x-ndjson", "application/jsonl"):
+        return "ndjson"
+    return "csv"
+
+
+def iter_rows(stream: IO[str], fmt: str) -> Iterator[dict]:
+    """
+    Yield raw row dicts one at a time; malformed NDJSON lines yield an
+    `{"__error__": ...}` marker so they are reported rather than aborting.
+    """
+    if fmt == "ndjson":
+        for line in stream:
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield {"__error__": f"Invalid JSON: {e.msg}"}
+                continue
+            yield row if isinstance(row, dict) else {"__error__": "Row must be a JSON object"}
+    else:
+        for row in csv.DictReader(stream):
+            yield {key: (value if value != "" else None) for key, value in row.items() if key}
+
+
+def text_stream(binary: IO[bytes]) -> IO[str]:
+    return io.TextIOWrapper(binary, encoding="utf-8", newline="")
+
+
+def validate_row(raw: dict) -> tuple[Optional[UserCreate], list[str]]:
+    if "__error__" in raw:
+        return None, [raw["__error__"]]
+    data = {field: raw.get(field) for field in USER_FIELDS}
+    data["password_confirmation"] = raw.get("password_confirmation") or raw.get("password")
+    try:
+        return UserCreate.model_validate(data), []
+    except ValidationError as e:
+        return None, [f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in e.errors()]
+
+
+def _hash_chunk(passwords: list[str]) -> list[str]:
+    return [AuthUtil.HashPassword(password) for password in passwords]
+
+
+async def hash_passwords(passwords: list[str], executor: Optional[Executor] = None, chunks: Optional[int] = None) -> list[str]:
+    """
+    Hash passwords in parallel, one chunk per worker, preserving order.
+    """
+    if not passwords:
+        return []
+    executor = executor or get_bulk_executor()
+    chunks = chunks or settings.BULK_IMPORT_WORKERS or os.cpu_count() or 1
+    size = -(-len(passwords) // chunks)
+    loop = asyncio.get_running_loop()
+    results = await asyncio.gather(*(
+        loop.run_in_executor(executor, _hash_chunk, passwords[i:i + size])
+        for i in range(0, len(passwords), size)
+    ))
+    return [hashed for chunk in results for hashed in chunk]
+
+
+def batched(rows: Iterable[dict], size: int) -> Iterator[list[dict]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def read_batches(rows: Iterable[dict], size: int) -> AsyncIterator[list[dict]]:
+    """
+    batched(), reading each batch in a worker thread: rows parsed from a file
+    (or an upload spooled to disk) would block the event loop while it is read.
+    """
+    rows = iter(rows)
+    while batch := await asyncio.to_thread(lambda: list(islice(rows, size))):
+        yield batch
+
+
+async def _main(path: str, fmt: Optional[str], batch_size: int, report_path: Optional[str]) -> None:
+    from src.auth.service import AuthService
+    from src.database import async_session
+
+    fmt = fmt or detect_format(path)
+    try:
+        with open(path, encoding="utf-8", newline="") as stream:
+            async with async_session() as db:
+                report = await AuthService.bulk_register(db, iter_rows(stream, fmt), batch_size=batch_size)
+    finally:
+        shutdown_bulk_executor()
+
+    summary = report.model_dump(exclude={"rows"})
+    print(json.dumps(summary))
+    if report_path:
+        with open(report_path, "w", encoding="utf-8") as out:
+            out.write(report.model_dump_json(indent=2))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Bulk-register users from a CSV or NDJSON file.")
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=("csv", "ndjson"))
+    parser.add_argument("--batch-size", type=int, default=settings.BULK_IMPORT_BATCH_SIZE)
+    parser.add_argument("--report", help="write the per-row report as JSON to this file")
+    args = parser.parse_args()
+    asyncio.run(_main(args.path, args.format, args.batch_size, args.report))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Measure bcrypt cost on this machine and recommend BCRYPT_ROUNDS.
+
+    python -m src.auth.utils.calibrate --target-ms 250
+"""
+import argparse
+import statistics
+import time
+
+from passlib.hash import bcrypt
+
+MIN_ROUNDS = 4
+MAX_ROUNDS = 31
+
+
+def measure_hash_ms(rounds: int, samples: int = 3) -> float:
+    hasher = bcrypt.using(rounds=rounds)
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        hasher.hash("Calibration123#")
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def recommend_rounds(
+    target_ms: float,
+    start_rounds: int = 8,
+    max_rounds: int = 16,
+    samples: int = 3,
+    measure=measure_hash_ms,
+) -> tuple[int, dict[int, float]]:
+    """
+    Walk up from `start_rounds` until one hash exceeds `target_ms`.
+
+    Each extra round doubles the cost, so the walk stops quickly. Returns the
+    highest round count within budget (never below `start_rounds`) and the
+    measured timings.
+    """
+    timings: dict[int, float] = {}
+    recommended = start_rounds
+    for rounds in range(max(start_rounds, MIN_ROUNDS), min(max_rounds, MAX_ROUNDS) + 1):
+        timings[rounds] = measure(rounds, samples)
+        if timings[rounds] > target_ms:
+            break
+        recommended = rounds
+    return recommended, timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Recommend BCRYPT_ROUNDS for a login latency budget.")
+    parser.add_argument("--target-ms", type=float, default=250.0,
+                        help="CPU time one password hash may take")
+    parser.add_argument("--start-rounds", type=int, default=8)
+    parser.add_argument("--max-rounds", type=int, default=16)
+    parser.add_argument("--samples", type=int, default=3)
+    args = parser.parse_args()
+
+    recommended, timings = recommend_rounds(
+        args.target_ms, args.start_rounds, args.max_rounds, args.samples)
+    for rounds, ms in timings.items():
+        marker = "  <- recommended" if rounds == recommended else ""
+        print(f"rounds={rounds:2d}  {ms:9.1f} ms{marker}")
+    print(f"BCRYPT_ROUNDS={recommended}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable
+
+from fastapi import HTTPException, status
+
+
+def _timed_call(fn: Callable, *args) -> tuple[Any, float, float]:
+    # Runs inside the worker; monotonic clock is shared between processes on the same host
+    started_at = time.monotonic()
+    result = fn(*args)
+    return result, started_at, time.monotonic()
+
+
+class PasswordHashPool:
+    """
+    Bounded executor for bcrypt work so hashing never runs on the event loop.
+
+    At most `max_pending` jobs may be queued or running at once; anything above
+    that is rejected with 503 instead of growing an invisible backlog.
+    """
+
+    def __init__(self, workers: int, max_pending: int, executor: str = "thread"):
+        if executor not in ("thread", "process"):
+            raise ValueError(f"Unsupported password hash executor: {executor}")
+        self.workers = workers
+        self.max_pending = max_pending
+        self.executor_kind = executor
+        self._executor: Executor | None = None
+
+        self._pending = 0
+        self._max_pending_seen = 0
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._wait_seconds = 0.0
+        self._run_seconds = 0.0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor_kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="password-hash")
+        return self._executor
+
+    async def run(self, fn: Callable, *args) -> Any:
+        if self._pending >= self.max_pending:
+            self._rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server is busy, try again later",
+                headers={"Retry-After": "1"}
+            )
+
+        self._pending += 1
+        self._submitted += 1
+        self._max_pending_seen = max(self._max_pending_seen, self._pending)
+        queued_at = time.monotonic()
+        loop = asyncio.get_running_loop()
+        try:
+            result, started_at, finished_at = await loop.run_in_executor(
+                self._get_executor(), _timed_call, fn, *args)
+        except Exception:
+            self._failed += 1
+            raise
+        finally:
+            self._pending -= 1
+
+        self._completed += 1
+        self._wait_seconds += max(started_at - queued_at, 0.0)
+        self._run_seconds += finished_at - started_at
+        return result
+
+    def stats(self) -> dict:
+        completed = self._completed or 1
+        return {
+            "executor": self.executor_kind,
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "pending": self._pending,
+            # Each worker runs one job at a time; the rest of `pending` waits in the queue
+            "in_flight": min(self._pending, self.workers),
+            "max_pending_seen": self._max_pending_seen,
+            "submitted": self._submitted,
+            "completed": self._completed,
+            "failed": self._failed,
+            "rejected": self._rejected,
+            "avg_wait_ms": self._wait_seconds / completed * 1000,
+            "avg_run_ms": self._run_seconds / completed * 1000,
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
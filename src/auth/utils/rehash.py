@@ -0,0 +1,45 @@
+import asyncio
+import logging
+
+from sqlalchemy import update
+
+from src.auth.utils.util import AuthUtil
+from src.database import async_session
+from src.user.models.user import User
+
+logger = logging.getLogger(__name__)
+
+# Strong references so running tasks are not garbage collected
+pending_rehashes: set[asyncio.Task] = set()
+
+
+async def rehash_password(user_id: int, password: str, old_hash: str, session_factory=async_session) -> bool:
+    new_hash = await AuthUtil.HashPasswordAsync(password)
+    async with session_factory() as session:
+        # Compare-and-swap so a concurrent password change is never overwritten
+        result = await session.execute(
+            update(User)
+            .where(User.id == user_id, User.password == old_hash)
+            .values(password=new_hash)
+        )
+        await session.commit()
+        return result.rowcount == 1
+
+
+async def _run_rehash(user_id: int, password: str, old_hash: str) -> None:
+    try:
+        await rehash_password(user_id, password, old_hash)
+    except Exception:
+        logger.exception("Background password rehash failed for user %s", user_id)
+
+
+def schedule_rehash(user_id: int, password: str, old_hash: str) -> asyncio.Task:
+    task = asyncio.create_task(_run_rehash(user_id, password, old_hash))
+    pending_rehashes.add(task)
+    task.add_done_callback(pending_rehashes.discard)
+    return task
+
+
+async def drain_rehashes() -> None:
+    if pending_rehashes:
+        await asyncio.gather(*pending_rehashes, return_exceptions=True)
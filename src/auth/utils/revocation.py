@@ -0,0 +1,226 @@
+import asyncio
+import hashlib
+import math
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+
+from sqlalchemy import delete, select
+
+from src.auth.models.token import RevokedToken
+from src.config import settings
+from src.database import async_session
+from src.dialects import insert_ignore
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings. No false negatives; the false positive
+    rate stays near `error_rate` while at most `capacity` keys are added.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        capacity = max(capacity, 1)
+        self.capacity = capacity
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.num_hashes):
+            yield (first + i * second) % self.num_bits
+
+    def add(self, key: str) -> None:
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+class RevocationBackend(ABC):
+    @abstractmethod
+    async def revoke(self, jti: str, expires_at: datetime) -> bool:
+        """
+        Revoke `jti`; True only for the one call that actually revoked it.
+        """
+
+    @abstractmethod
+    async def is_revoked(self, jti: str) -> bool:
+        ...
+
+    @abstractmethod
+    async def active_jtis(self) -> list[str]:
+        ...
+
+    @abstractmethod
+    async def purge_expired(self) -> int:
+        ...
+
+
+class InMemoryRevocationBackend(RevocationBackend):
+    def __init__(self):
+        self._revoked: dict[str, datetime] = {}
+
+    async def revoke(self, jti: str, expires_at: datetime) -> bool:
+        if jti in self._revoked:
+            return False
+        self._revoked[jti] = expires_at
+        return True
+
+    async def is_revoked(self, jti: str) -> bool:
+        return jti in self._revoked
+
+    async def active_jtis(self) -> list[str]:
+        now = datetime.now(timezone.utc)
+        return [jti for jti, expires_at in self._revoked.items() if expires_at > now]
+
+    async def purge_expired(self) -> int:
+        now = datetime.now(timezone.utc)
+        expired = [jti for jti, expires_at in self._revoked.items() if expires_at <= now]
+        for jti in expired:
+            del self._revoked[jti]
+        return len(expired)
+
+
+class DatabaseRevocationBackend(RevocationBackend):
+    def __init__(self, session_factory=async_session):
+        self.session_factory = session_factory
+
+    async def revoke(self, jti: str, expires_at: datetime) -> bool:
+        async with self.session_factory() as session:
+            # ON CONFLICT DO NOTHING: of two concurrent revocations only one inserts the row
+            result = await session.execute(
+                insert_ignore(session, RevokedToken.__table__).values(jti=jti, expires_at=expires_at))
+            await session.commit()
+            return result.rowcount == 1
+
+    async def is_revoked(self, jti: str) -> bool:
+        async with self.session_factory() as session:
+            result = await session.execute(
+                select(RevokedToken.jti).where(RevokedToken.jti == jti))
+            return result.scalar_one_or_none() is not None
+
+    async def active_jtis(self) -> list[str]:
+        async with self.session_factory() as session:
+            result = await session.execute(
+                select(RevokedToken.jti).where(RevokedToken.expires_at > datetime.now(timezone.utc)))
+            return list(result.scalars().all())
+
+    async def purge_expired(self) -> int:
+        async with self.session_factory() as session:
+            result = await session.execute(
+                delete(RevokedToken).where(RevokedToken.expires_at <= datetime.now(timezone.utc)))
+            await session.commit()
+            return result.rowcount
+
+
+class RevocationStore:
+    """
+    Revoked-token lookups with a Bloom filter in front of the backend.
+
+    A token whose jti is not in the filter is definitely not revoked, so the
+    common case never leaves the process. Filter hits are confirmed against the
+    backend. The filter is rebuilt from the backend every `sync_seconds`, which
+    also picks up revocations made by other workers and purges expired jtis
+    from the backend, so it holds only tokens that could still be presented.
+    """
+
+    def __init__(
+        self,
+        backend: RevocationBackend,
+        capacity: int = 100000,
+        error_rate: float = 0.001,
+        sync_seconds: float = 30.0,
+    ):
+        self.backend = backend
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.sync_seconds = sync_seconds
+        self._filter = BloomFilter(capacity, error_rate)
+        self._last_sync: float | None = None
+        self._sync_lock = asyncio.Lock()
+        self._revoked_since_sync: list[str] = []
+        self.filter_negatives = 0
+        self.backend_checks = 0
+
+    def _is_fresh(self) -> bool:
+        return self._last_sync is not None and time.monotonic() - self._last_sync < self.sync_seconds
+
+    async def _rebuild(self) -> None:
+        marker = len(self._revoked_since_sync)
+        await self.backend.purge_expired()
+        jtis = await self.backend.active_jtis()
+        bloom = BloomFilter(max(self.capacity, len(jtis) * 2), self.error_rate)
+        for jti in jtis:
+            bloom.add(jti)
+        # Revocations made while the backend was being read may be missing from `jtis`
+        for jti in self._revoked_since_sync[marker:]:
+            bloom.add(jti)
+        self._filter = bloom
+        self._revoked_since_sync = []
+        self._last_sync = time.monotonic()
+
+    async def sync(self) -> None:
+        async with self._sync_lock:
+            await self._rebuild()
+
+    async def _maybe_sync(self) -> None:
+        if self._is_fresh():
+            return
+        # A stale filter is still safe for local revocations; only the very
+        # first load has to be waited for
+        if self._sync_lock.locked() and self._last_sync is not None:
+            return
+        async with self._sync_lock:
+            if not self._is_fresh():
+                await self._rebuild()
+
+    async def revoke(self, jti: str, exp: int) -> bool:
+        """
+        Revoke `jti`; False when it was already revoked, here or on another worker.
+        """
+        expires_at = datetime.fromtimestamp(exp, tz=timezone.utc)
+        revoked = await self.backend.revoke(jti, expires_at)
+        self._filter.add(jti)
+        self._revoked_since_sync.append(jti)
+        return revoked
+
+    async def is_revoked(self, jti: str) -> bool:
+        await self._maybe_sync()
+        if jti not in self._filter:
+            self.filter_negatives += 1
+            return False
+        self.backend_checks += 1
+        return await self.backend.is_revoked(jti)
+
+    def use_backend(self, backend: RevocationBackend) -> None:
+        self.backend = backend
+        self._filter = BloomFilter(self.capacity, self.error_rate)
+        self._revoked_since_sync = []
+        self._last_sync = None
+
+    def stats(self) -> dict:
+        return {
+            "filter_entries": self._filter.count,
+            "filter_negatives": self.filter_negatives,
+            "backend_checks": self.backend_checks,
+        }
+
+
+def _build_backend() -> RevocationBackend:
+    if settings.REVOCATION_BACKEND == "memory":
+        return InMemoryRevocationBackend()
+    return DatabaseRevocationBackend(async_session)
+
+
+revocation_store = RevocationStore(
+    _build_backend(),
+    capacity=settings.REVOCATION_FILTER_CAPACITY,
+    sync_seconds=settings.REVOCATION_SYNC_SECONDS,
+)
@@ -0,0 +1,187 @@
+import time
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from fastapi import HTTPException, Request, status
+
+from src.config import settings
+
+
+class ThrottleBackend(ABC):
+    """
+    Sliding-window counters. `hit` records one attempt for `key` and returns the
+    weighted attempt count over the last `window` seconds.
+    """
+
+    @abstractmethod
+    async def hit(self, key: str, window: float, now: float) -> float:
+        ...
+
+    @abstractmethod
+    async def reset(self, key: str, window: float, now: float) -> None:
+        ...
+
+
+def _estimate(previous: int, current: int, window: float, now: float) -> float:
+    # Sliding window counter: the previous fixed window is weighted by how much
+    # of it still overlaps the trailing `window` seconds
+    elapsed = (now % window) / window
+    return previous * (1 - elapsed) + current
+
+
+class InMemoryThrottleBackend(ThrottleBackend):
+    """
+    Per-process counters. Each key holds two integers; keys whose windows have
+    fully passed are swept once the table grows past `max_keys`, and the oldest
+    keys are dropped if that is not enough.
+    """
+
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        # key -> [window_index, current_count, previous_count]
+        self._counters: dict[str, list[int]] = {}
+
+    def _sweep(self, window_index: int) -> None:
+        stale = [key for key, (index, _, _) in self._counters.items() if index < window_index - 1]
+        for key in stale:
+            del self._counters[key]
+        overflow = len(self._counters) - self.max_keys
+        if overflow > 0:
+            for key in list(self._counters)[:overflow]:
+                del self._counters[key]
+
+    async def hit(self, key: str, window: float, now: float) -> float:
+        window_index = int(now // window)
+        counter = self._counters.get(key)
+        if counter is None:
+            if len(self._counters) >= self.max_keys:
+                self._sweep(window_index)
+            counter = self._counters[key] = [window_index, 0, 0]
+        elif counter[0] != window_index:
+            counter[2] = counter[1] if counter[0] == window_index - 1 else 0
+            counter[1] = 0
+            counter[0] = window_index
+        counter[1] += 1
+        return _estimate(counter[2], counter[1], window, now)
+
+    async def reset(self, key: str, window: float, now: float) -> None:
+        self._counters.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._counters)
+
+
+class RedisThrottleBackend(ThrottleBackend):
+    """
+    Shared counters so every worker sees the same attempt counts. Requires the
+    optional `redis` package.
+    """
+
+    def __init__(self, url: str, prefix: str = "throttle"):
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:
+            raise RuntimeError("THROTTLE_REDIS_URL is set but the 'redis' package is not installed") from e
+        self._redis = redis.from_url(url)
+        self.prefix = prefix
+
+    def _key(self, key: str, window_index: int) -> str:
+        return f"{self.prefix}:{key}:{window_index}"
+
+    async def hit(self, key: str, window: float, now: float) -> float:
+        window_index = int(now // window)
+        current_key = self._key(key, window_index)
+        pipe = self._redis.pipeline()
+        pipe.incr(current_key)
+        pipe.expire(current_key, int(window * 2) + 1)
+        pipe.get(self._key(key, window_index - 1))
+        current, _, previous = await pipe.execute()
+        return _estimate(int(previous or 0), int(current), window, now)
+
+    async def reset(self, key: str, window: float, now: float) -> None:
+        window_index = int(now // window)
+        await self._redis.delete(self._key(key, window_index), self._key(key, window_index - 1))
+
+
+def client_ip(request: Request, trusted_hops: int) -> Optional[str]:
+    """
+    The client's address as seen by the outermost of `trusted_hops` proxies in
+    front of the app. Each proxy appends the address it got the request from to
+    X-Forwarded-For, so entries further left are whatever the client sent and
+    are never trusted. With no proxies, or no header, the peer address is used.
+    """
+    peer = request.client.host if request.client else None
+    if trusted_hops <= 0:
+        return peer
+    forwarded = [hop.strip() for hop in request.headers.get("x-forwarded-for", "").split(",") if hop.strip()]
+    if not forwarded:
+        return peer
+    return forwarded[-min(trusted_hops, len(forwarded))]
+
+
+class LoginThrottle:
+    """
+    Rejects login attempts with 429 once a client IP, a login attempted from
+    that IP, or a login attempted from any IP exceeds its attempt budget
+    within the sliding window. Runs before any DB or bcrypt work. The
+    per-login budget of one IP is small; the budget of a login across all IPs
+    is larger, so it stops guessing spread over many addresses without
+    letting a few addresses lock the owner out.
+    """
+
+    def __init__(self, backend: ThrottleBackend, per_ip: int, per_login: int,
+                 window_seconds: float, enabled: bool = True, per_account: Optional[int] = None):
+        self.backend = backend
+        self.per_ip = per_ip
+        self.per_login = per_login
+        self.per_account = per_account
+        self.window_seconds = window_seconds
+        self.enabled = enabled
+        self.rejected = 0
+
+    @staticmethod
+    def _login_key(client_ip: Optional[str], login: str) -> str:
+        return f"login:{client_ip or 'unknown'}:{login.strip().lower()}"
+
+    @staticmethod
+    def _account_key(login: str) -> str:
+        return f"account:{login.strip().lower()}"
+
+    async def check(self, client_ip: Optional[str], login: str) -> None:
+        if not self.enabled:
+            return
+        now = time.time()
+        ip_attempts = await self.backend.hit(f"ip:{client_ip or 'unknown'}", self.window_seconds, now)
+        login_attempts = await self.backend.hit(self._login_key(client_ip, login), self.window_seconds, now)
+        account_attempts = 0.0
+        if self.per_account is not None:
+            account_attempts = await self.backend.hit(self._account_key(login), self.window_seconds, now)
+
+        if (ip_attempts > self.per_ip or login_attempts > self.per_login
+                or (self.per_account is not None and account_attempts > self.per_account)):
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many login attempts, try again later",
+                headers={"Retry-After": str(int(self.window_seconds))}
+            )
+
+    async def reset_login(self, client_ip: Optional[str], login: str) -> None:
+        if self.enabled:
+            await self.backend.reset(self._login_key(client_ip, login), self.window_seconds, time.time())
+
+
+def _build_backend() -> ThrottleBackend:
+    if settings.THROTTLE_REDIS_URL:
+        return RedisThrottleBackend(settings.THROTTLE_REDIS_URL)
+    return InMemoryThrottleBackend(max_keys=settings.LOGIN_THROTTLE_MAX_KEYS)
+
+
+login_throttle = LoginThrottle(
+    _build_backend(),
+    per_ip=settings.LOGIN_THROTTLE_PER_IP,
+    per_login=settings.LOGIN_THROTTLE_PER_LOGIN,
+    per_account=settings.LOGIN_THROTTLE_PER_ACCOUNT,
+    window_seconds=settings.LOGIN_THROTTLE_WINDOW_SECONDS,
+    enabled=settings.LOGIN_THROTTLE_ENABLED,
+)
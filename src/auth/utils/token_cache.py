@@ -0,0 +1,96 @@
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from fastapi import HTTPException, status
+
+from src.auth.schemas.token_data import TokenData
+from src.auth.utils.util import AuthUtil
+
+
+class TokenVerifier:
+    """
+    Turns a raw access token into TokenData. Subclasses may cache or add checks.
+    """
+
+    def verify(self, token: str) -> TokenData:
+        return AuthUtil.TokenVerification(token)
+
+    def invalidate(self, token: str) -> None:
+        pass
+
+    def stats(self) -> dict:
+        return {}
+
+
+class CachingTokenVerifier(TokenVerifier):
+    """
+    Bounded LRU of verified tokens keyed by a SHA-256 digest of the token.
+
+    Entries live until the token's own `exp`, so a cached token is rejected at
+    exactly the same moment python-jose would reject it. `is_revoked` is called
+    on hits and misses alike; returning True evicts the entry and fails with 401.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 10000,
+        is_revoked: Optional[Callable[[TokenData], bool]] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.max_size = max_size
+        self.is_revoked = is_revoked
+        self._clock = clock
+        self._entries: OrderedDict[bytes, TokenData] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def verify(self, token: str) -> TokenData:
+        key = self._key(token)
+        token_data = self._entries.get(key)
+
+        if token_data is not None:
+            if token_data.exp < self._clock():
+                del self._entries[key]
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="Token has expired"
+                )
+            self._entries.move_to_end(key)
+            self.hits += 1
+        else:
+            self.misses += 1
+            token_data = AuthUtil.TokenVerification(token)
+            self._entries[key] = token_data
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+        if self.is_revoked is not None and self.is_revoked(token_data):
+            self._entries.pop(key, None)
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Token has been revoked"
+            )
+
+        return token_data
+
+    def invalidate(self, token: str) -> None:
+        self._entries.pop(self._key(token), None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
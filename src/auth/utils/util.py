@@ -1,13 +1,30 @@
+import uuid
 from passlib.context import CryptContext
 from datetime import datetime, timedelta, timezone
 from jose import jwt
 from src.config import settings
 from fastapi import HTTPException, status
 from src.auth.schemas.token_data import TokenData
+from src.auth.utils.hash_pool import PasswordHashPool
+from src.monitoring.utils.metrics import metrics
 
-pwd_context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=12)
+# Hashes outside [min_rounds, max_rounds] report needs_update, so changing
+# BCRYPT_ROUNDS migrates users up or down as they log in
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+)
 ALGORITHM = "HS256"
 
+password_hash_pool = PasswordHashPool(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+    executor=settings.PASSWORD_HASH_EXECUTOR,
+)
+metrics.register_executor("password_hash", password_hash_pool.stats)
+
 
 class AuthUtil:
     @staticmethod
@@ -18,14 +35,41 @@ class AuthUtil:
     def VerifyPassword(plain_password, hashed_password):
         return pwd_context.verify(plain_password, hashed_password)
 
+    @staticmethod
+    def NeedsRehash(hashed_password: str) -> bool:
+        return pwd_context.needs_update(hashed_password)
+
+    @staticmethod
+    async def HashPasswordAsync(password: str) -> str:
+        return await password_hash_pool.run(AuthUtil.HashPassword, password)
+
+    @staticmethod
+    async def VerifyPasswordAsync(plain_password, hashed_password) -> bool:
+        return await password_hash_pool.run(AuthUtil.VerifyPassword, plain_password, hashed_password)
+
     @staticmethod
     def GenerateToken(data: dict, expires_delta: timedelta = timedelta(minutes=60)):
         to_encode = data.copy()
         expire = datetime.now(timezone.utc) + expires_delta
         to_encode.update({"exp": expire})
+        to_encode.setdefault("jti", uuid.uuid4().hex)
         token = jwt.encode(to_encode, settings.JWT_SECRET_KEY, ALGORITHM)
         return token
 
+    @staticmethod
+    def GenerateAccessToken(user_id: int) -> str:
+        return AuthUtil.GenerateToken(
+            {"id": str(user_id), "type": "access"},
+            timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+        )
+
+    @staticmethod
+    def GenerateRefreshToken(user_id: int) -> str:
+        return AuthUtil.GenerateToken(
+            {"id": str(user_id), "type": "refresh"},
+            timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+        )
+
     @staticmethod
     def TokenVerification(token: str) -> TokenData:
         try:
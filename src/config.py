@@ -1,3 +1,4 @@
+from typing import Optional
 from pydantic_settings import BaseSettings
 
 
@@ -5,6 +6,116 @@ class Settings(BaseSettings):
     DATABASE_URL: str
     JWT_SECRET_KEY: str
 
+    # Database bootstrap on startup: "reset" (drop, create, dummy data), "create" (missing tables only), "verify" or "skip"
+    STARTUP_MODE: str = "verify"
+
+    # bcrypt cost; existing hashes with a different cost are re-hashed on login
+    BCRYPT_ROUNDS: int = 12
+
+    # Password hashing pool ("thread" or "process")
+    PASSWORD_HASH_EXECUTOR: str = "thread"
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_PENDING: int = 64
+
+    # Verified access tokens kept in memory (0 disables the cache)
+    TOKEN_CACHE_SIZE: int = 10000
+
+    # Access / refresh token lifetimes
+    ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+
+    # Token revocation ("database" or "memory"). Every worker rebuilds its filter
+    # of revoked tokens every REVOCATION_SYNC_SECONDS, so a logout on one worker
+    # may take that long to be seen by the others; refresh tokens are exchanged
+    # exactly once regardless, the backend decides
+    REVOCATION_BACKEND: str = "database"
+    REVOCATION_FILTER_CAPACITY: int = 100000
+    REVOCATION_SYNC_SECONDS: float = 30.0
+
+    # Login throttling (sliding window, per client IP, per login from that IP and
+    # per login from anywhere; the last is higher so guessing cannot easily lock an account)
+    LOGIN_THROTTLE_ENABLED: bool = True
+    LOGIN_THROTTLE_WINDOW_SECONDS: float = 60.0
+    LOGIN_THROTTLE_PER_IP: int = 30
+    LOGIN_THROTTLE_PER_LOGIN: int = 10
+    LOGIN_THROTTLE_PER_ACCOUNT: int = 100
+    LOGIN_THROTTLE_MAX_KEYS: int = 100000
+    THROTTLE_REDIS_URL: Optional[str] = None
+    # Reverse proxies in front of the app (1 on Render); the client IP is the
+    # X-Forwarded-For entry the outermost one appended. Keep 0 when the app is
+    # reached directly, as with docker-compose, or every client could pick its own IP
+    TRUSTED_PROXY_HOPS: int = 0
+
+    # Bulk user import (0 workers = one per CPU)
+    BULK_IMPORT_WORKERS: int = 0
+    BULK_IMPORT_BATCH_SIZE: int = 1000
+
+    # Optional read replica; reads go to the primary for a while after a user writes
+    DATABASE_REPLICA_URL: Optional[str] = None
+    READ_YOUR_WRITES_SECONDS: float = 5.0
+
+    # Database connection pool (per worker process; ignored for SQLite)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = False
+    DB_STATEMENT_CACHE_SIZE: int = 100
+
+    # Route and service metrics served at /metrics
+    METRICS_ENABLED: bool = True
+
+    # On-demand request profiling: requests sent with "X-Profile: 1" plus the
+    # internal token (ignored while none is set) or a random sample are run under cProfile
+    PROFILING_ENABLED: bool = False
+    PROFILE_SAMPLE_RATE: float = 0.0
+    PROFILE_DIR: str = "tmp/profiles"
+    PROFILE_MAX_FILES: int = 50
+
+    # Per-request SQL statistics
+    QUERY_STATS_HEADERS: bool = False
+    QUERY_N_PLUS_ONE_THRESHOLD: int = 5
+
+    # POST /users/search pages through results by cursor; the limit query parameter is capped
+    USER_SEARCH_PAGE_SIZE: int = 50
+    USER_SEARCH_MAX_PAGE_SIZE: int = 200
+    # GET /users/search?q= ranks at most this many matches on PostgreSQL
+    USER_SEARCH_RANK_WINDOW: int = 2000
+    # GET /users/autocomplete suggestions per prefix
+    USER_AUTOCOMPLETE_LIMIT: int = 10
+    # User cards (GET /users/me, /users/{id}) cached as JSON in process (0
+    # disables) and, with a Redis URL, in a tier shared by every worker. A
+    # worker keeps its own copy for USER_CARD_CACHE_LOCAL_SECONDS, so a card may
+    # be that stale after a write on another worker (0 keeps no copy, and with
+    # a shared tier no read is stale then)
+    USER_CARD_CACHE_SIZE: int = 10000
+    USER_CARD_CACHE_REDIS_URL: Optional[str] = None
+    USER_CARD_CACHE_TTL_SECONDS: int = 3600
+    USER_CARD_CACHE_LOCAL_SECONDS: float = 5.0
+
+    # Hot reads on SQLAlchemy Core instead of the ORM (src/reads.py): "*", a
+    # comma-separated list of "Service.method" names, or "" for none
+    CORE_READS: str = "*"
+
+    # Slow-query log: statement latency per fingerprint, slow statements logged as they run.
+    # Capturing parameters keeps the slowest run's, with passwords, emails and message text redacted
+    SLOW_QUERY_LOG_ENABLED: bool = True
+    SLOW_QUERY_THRESHOLD_MS: float = 200.0
+    SLOW_QUERY_MAX_FINGERPRINTS: int = 1000
+    SLOW_QUERY_SAMPLES: int = 200
+    SLOW_QUERY_CAPTURE_PARAMETERS: bool = False
+
+    # Internal endpoints (/internal/*, /metrics, bulk import) need this token in
+    # X-Internal-Token; without one configured they answer 404
+    INTERNAL_API_TOKEN: Optional[str] = None
+
+    # Login/email availability checks
+    AVAILABILITY_CACHE_TTL_SECONDS: float = 5.0
+    AVAILABILITY_CACHE_SIZE: int = 10000
+    AVAILABILITY_FILTER_ENABLED: bool = False
+    AVAILABILITY_FILTER_CAPACITY: int = 1000000
+    AVAILABILITY_FILTER_SYNC_SECONDS: float = 300.0
+
     class Config:
         env_file = ".env"
 
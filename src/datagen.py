@@ -0,0 +1,278 @@
+"""
+Generate a deterministic synthetic dataset at production scale.
+
+    python -m src.datagen --users 1000000 --messages 10000000 --seed 42 --reset
+
+Rows are generated in chunks across a process pool and streamed into the
+database as they are ready: COPY on PostgreSQL (over several connections),
+executemany INSERTs on SQLite. Every row comes from a random generator seeded
+with (seed, table, chunk), so the same arguments always give the same data,
+however many workers run. Ids are assigned up front, which lets likes,
+photos and messages reference users without reading anything back.
+
+Every user shares the password "Password123#", hashed once. The target
+tables must be empty; --reset drops and recreates the schema first.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Iterator, Optional
+
+from pydantic import BaseModel
+
+PASSWORD = "Password123#"
+
+COLUMNS = {
+    "categories": ("id", "name"),
+    "hobbies": ("id", "name", "category_id"),
+    "users": ("id", "login", "password", "email", "phone_number", "first_name", "last_name"),
+    "user_photos": ("id", "user_id", "photo_url"),
+    "user_hobby": ("user_id", "hobby_id"),
+    "user_likes": ("liker_id", "liked_id"),
+    "messages": ("id", "text", "photo_url", "timestamp", "sender_id", "receiver_id"),
+}
+
+# Messages go to a handful of partners per sender, so conversations get long
+_CONVERSATION_OFFSETS = (1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+_MESSAGES_START = datetime(2025, 1, 1)
+_MESSAGES_SPAN_SECONDS = 365 * 24 * 3600
+
+
+class DatasetSpec(BaseModel):
+    seed: int = 42
+    users: int = 10000
+    categories: int = 20
+    hobbies: int = 200
+    hobbies_per_user: int = 3
+    likes_per_user: int = 10
+    photos_per_user: int = 2
+    messages: int = 100000
+    chunk_size: int = 50000
+
+
+@lru_cache(maxsize=4)
+def _vocabulary(seed: int) -> tuple[list[str], list[str], list[str]]:
+    from faker import Faker
+
+    fake = Faker()
+    fake.seed_instance(seed)
+    # Sorted, since set order depends on the per-process hash seed
+    first_names = sorted({fake.first_name() for _ in range(2000)})
+    last_names = sorted({fake.last_name() for _ in range(2000)})
+    words = sorted({fake.word() for _ in range(3000)})
+    return first_names, last_names, words
+
+
+def _per_user(table: str, spec: DatasetSpec) -> Optional[int]:
+    """
+    Rows per user for tables generated user by user, None for the others.
+    """
+    return {
+        "users": 1,
+        "user_photos": spec.photos_per_user,
+        "user_hobby": min(spec.hobbies_per_user, spec.hobbies),
+        "user_likes": min(spec.likes_per_user, spec.users - 1),
+    }.get(table)
+
+
+def chunk_ranges(table: str, spec: DatasetSpec) -> Iterator[tuple[int, int]]:
+    """
+    [start, stop) id ranges of about `chunk_size` rows each. For per-user
+    tables the range is of user ids.
+    """
+    per_user = _per_user(table, spec)
+    if per_user is not None:
+        total, step = (spec.users if per_user else 0), max(1, spec.chunk_size // max(1, per_user))
+    else:
+        total, step = getattr(spec, table), spec.chunk_size
+    for start in range(1, total + 1, step):
+        yield start, min(start + step, total + 1)
+
+
+def generate_chunk(table: str, start: int, stop: int, spec: DatasetSpec, password_hash: str) -> list[tuple]:
+    """
+    Rows for one chunk, in COLUMNS order. Runs in worker processes.
+    """
+    rng = random.Random(f"{spec.seed}:{table}:{start}")
+    first_names, last_names, words = _vocabulary(spec.seed)
+
+    if table == "categories":
+        return [(i, f"{rng.choice(words).capitalize()} {i}") for i in range(start, stop)]
+
+    if table == "hobbies":
+        return [(i, f"{rng.choice(words).capitalize()} {i}", rng.randint(1, spec.categories))
+                for i in range(start, stop)]
+
+    if table == "users":
+        rows = []
+        for i in range(start, stop):
+            first, last = rng.choice(first_names), rng.choice(last_names)
+            login = f"{first}.{last}{i}".lower().replace("'", "")
+            phone = f"+48 {rng.randrange(100_000_000, 1_000_000_000)}"
+            rows.append((i, login, password_hash, f"{login}@example.com", phone, first, last))
+        return rows
+
+    if table == "user_photos":
+        per_user = spec.photos_per_user
+        return [((user_id - 1) * per_user + n + 1, user_id,
+                 f"https://picsum.photos/seed/{(user_id - 1) * per_user + n + 1}/400/400")
+                for user_id in range(start, stop) for n in range(per_user)]
+
+    if table == "user_hobby":
+        per_user = _per_user(table, spec)
+        return [(user_id, hobby_id) for user_id in range(start, stop)
+                for hobby_id in rng.sample(range(1, spec.hobbies + 1), per_user)]
+
+    if table == "user_likes":
+        per_user = _per_user(table, spec)
+        rows = []
+        for liker in range(start, stop):
+            # Sample from the other users-1 ids, skipping over the liker's own
+            for liked in rng.sample(range(1, spec.users), per_user):
+                rows.append((liker, liked + 1 if liked >= liker else liked))
+        return rows
+
+    if table == "messages":
+        offsets = [offset for offset in _CONVERSATION_OFFSETS if offset % spec.users]
+        rows = []
+        for i in range(start, stop):
+            sender = rng.randint(1, spec.users)
+            receiver = (sender - 1 + rng.choice(offsets)) % spec.users + 1
+            # Timestamps grow with the id, as they do in production
+            sent_at = _MESSAGES_START + timedelta(seconds=i * _MESSAGES_SPAN_SECONDS // spec.messages)
+            text = " ".join(rng.choices(words, k=rng.randint(3, 15))).capitalize() + "."
+            photo_url = f"https://picsum.photos/seed/m{i}/800/600" if rng.random() < 0.05 else None
+            rows.append((i, text, photo_url, sent_at, sender, receiver))
+        return rows
+
+    raise ValueError(f"Unknown table {table!r}")
+
+
+async def _load_table(engine, executor: Executor, table_name: str, spec: DatasetSpec,
+                      password_hash: str, connections: int, in_flight: int) -> int:
+    from src.dialects import bulk_load, deferred_foreign_keys
+    from src.models import Base
+
+    table = Base.metadata.tables[table_name]
+    columns = COLUMNS[table_name]
+    loop = asyncio.get_running_loop()
+    ready: asyncio.Queue = asyncio.Queue(maxsize=connections * 2)
+    loaded = 0
+
+    async def produce():
+        pending = deque()
+        for start, stop in chunk_ranges(table_name, spec):
+            pending.append(loop.run_in_executor(
+                executor, generate_chunk, table_name, start, stop, spec, password_hash))
+            if len(pending) >= in_flight:
+                await ready.put(await pending.popleft())
+        while pending:
+            await ready.put(await pending.popleft())
+        for _ in range(connections):
+            await ready.put(None)
+
+    async def consume():
+        nonlocal loaded
+        async with engine.connect() as conn, deferred_foreign_keys(conn):
+            while (rows := await ready.get()) is not None:
+                if not rows:
+                    continue
+                await bulk_load(conn, table, columns, rows)
+                await conn.commit()
+                loaded += len(rows)
+
+    await asyncio.gather(produce(), *(consume() for _ in range(connections)))
+    return loaded
+
+
+async def load_dataset(engine, spec: DatasetSpec, executor: Executor, connections: int = 4,
+                       in_flight: int = 4) -> dict:
+    """
+    Generate and load every table in foreign-key order; returns rows and
+    seconds per table. SQLite is always loaded over one connection.
+    """
+    from sqlalchemy import func, select, text
+
+    from src.auth.utils.util import AuthUtil
+    from src.dialects import sync_id_sequence
+    from src.models import Base
+
+    if engine.dialect.name == "sqlite":
+        connections = 1
+    if spec.users < 2:
+        raise ValueError("At least two users are needed for likes and messages")
+
+    async with engine.connect() as conn:
+        users = Base.metadata.tables["users"]
+        if (await conn.execute(select(func.count()).select_from(users))).scalar():
+            raise ValueError("Target database already has users; load into an empty schema (--reset)")
+
+    password_hash = AuthUtil.HashPassword(PASSWORD)
+    report = {}
+    for table_name in COLUMNS:
+        started = time.perf_counter()
+        rows = await _load_table(engine, executor, table_name, spec, password_hash, connections, in_flight)
+        elapsed = time.perf_counter() - started
+        report[table_name] = {"rows": rows, "seconds": round(elapsed, 3),
+                              "rows_per_second": round(rows / elapsed) if elapsed else None}
+
+    started = time.perf_counter()
+    async with engine.begin() as conn:
+        if spec.photos_per_user:
+            # Profile photos point into user_photos, which needs the users first
+            await conn.execute(
+                text("UPDATE users SET profile_photo_id = (id - 1) * :per_user + 1"),
+                {"per_user": spec.photos_per_user})
+        for table_name in ("categories", "hobbies", "users", "user_photos", "messages"):
+            await sync_id_sequence(conn, Base.metadata.tables[table_name])
+        await conn.execute(text("ANALYZE"))
+    report["finalize"] = {"seconds": round(time.perf_counter() - started, 3)}
+    return report
+
+
+async def _main(spec: DatasetSpec, reset: bool, workers: int, connections: int) -> None:
+    from src.database import engine
+    from src.dbTest import init_models  # also registers every mapped table
+    from src.startup import verify_schema
+
+    if reset:
+        await init_models(engine)
+    else:
+        await verify_schema(engine)
+
+    started = time.perf_counter()
+    workers = workers or os.cpu_count()
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            report = await load_dataset(engine, spec, executor, connections, in_flight=workers * 2)
+    finally:
+        await engine.dispose()
+
+    for table, row in report.items():
+        print(json.dumps({"table": table, **row}))
+    print(json.dumps({"total_seconds": round(time.perf_counter() - started, 3)}))
+
+
+def main() -> None:
+    defaults = DatasetSpec()
+    parser = argparse.ArgumentParser(description="Generate a deterministic synthetic dataset.")
+    for field in DatasetSpec.model_fields:
+        parser.add_argument(f"--{field.replace('_', '-')}", type=int, default=getattr(defaults, field))
+    parser.add_argument("--reset", action="store_true", help="drop and recreate every table first")
+    parser.add_argument("--workers", type=int, default=0, help="generator processes (0 = one per CPU)")
+    parser.add_argument("--connections", type=int, default=4, help="loading connections (PostgreSQL only)")
+    args = parser.parse_args()
+
+    spec = DatasetSpec(**{field: getattr(args, field) for field in DatasetSpec.model_fields})
+    asyncio.run(_main(spec, args.reset, args.workers, args.connections))
+
+
+if __name__ == "__main__":
+    main()
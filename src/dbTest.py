@@ -1,4 +1,4 @@
-from src.auth.service import AuthService
+from src.auth.utils.util import AuthUtil
 from src.database import engine, async_session
 from src.models import Base
 from src.user.models.user import User
@@ -7,6 +7,7 @@ from src.hobby.models.hobby import Hobby
 from src.hobby.models.category import Category
 from src.match.models.userLiked import UserLiked
 from src.messages.models.message import Message
+from src.auth.models.token import RevokedToken
 from sqlalchemy.sql import text
 from sqlalchemy.future import select
 from sqlalchemy.orm import joinedload
@@ -25,7 +26,7 @@ from sqlalchemy import select
 fake = Faker()
 
 
-async def init_models():
+async def init_models(engine=engine):
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.drop_all)
         await conn.run_sync(Base.metadata.create_all)
@@ -33,6 +34,7 @@ async def init_models():
 
 
 async def insert_dummy_data(
+    session_factory=async_session,
     num_users: int = 10,
     num_categories: int = 3,
     hobbies_per_category: int = 5,
@@ -41,7 +43,7 @@ async def insert_dummy_data(
     num_likes: int = 10,
     photos_per_user: int = 2,
 ):
-    async with async_session() as session:
+    async with session_factory() as session:
         # Categories
         categories = []
         for _ in range(num_categories):
@@ -62,19 +64,17 @@ async def insert_dummy_data(
                 hobbies.append(hobby)
         await session.flush()
 
-        # Users (use AuthService.register for hashing)
-        users = []
+        # Users (every dummy user shares one password, so it is hashed once)
+        hashed_password = await AuthUtil.HashPasswordAsync("Password123#")
         for _ in range(num_users):
-            user_data = UserCreate(
+            session.add(User(
                 login=fake.unique.user_name(),
                 email=fake.unique.email(),
-                password="Password123#",
-                password_confirmation="Password123#",
+                password=hashed_password,
                 phone_number=fake.phone_number()[:20],
                 first_name=fake.first_name(),
                 last_name=fake.last_name(),
-            )
-            await AuthService.register(session, user_data)
+            ))
         await session.flush()
         users = (await session.execute(select(User))).scalars().all()
 
@@ -0,0 +1,16 @@
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.auth.dependencies import get_token_data
+from src.auth.schemas.token_data import TokenData
+from src.database import async_session, read_session, read_your_writes
+
+
+async def get_read_db(token_data: TokenData = Depends(get_token_data)) -> AsyncSession:
+    """
+    Session for read-only endpoints: the replica when one is configured, unless
+    the caller wrote recently and might not see their own change there yet.
+    """
+    factory = async_session if read_your_writes.wrote_recently(token_data.id) else read_session
+    async with factory() as session:
+        yield session
@@ -0,0 +1,244 @@
+import json
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Sequence
+from weakref import WeakKeyDictionary
+
+from sqlalchemy import Table, bindparam, event, func, select, text
+from sqlalchemy.engine import URL, Engine
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.sql import Select
+from sqlalchemy.sql.dml import Insert
+
+logger = logging.getLogger(__name__)
+
+
+def is_memory_sqlite(url: URL) -> bool:
+    return url.get_backend_name() == "sqlite" and (
+        url.database in (None, "", ":memory:") or url.query.get("mode") == "memory")
+
+
+def sqlite_engine_options(url: URL) -> dict:
+    # Every connection to :memory: opens its own empty database, so share one
+    return {"poolclass": StaticPool} if is_memory_sqlite(url) else {}
+
+
+def _sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    # Off by default in SQLite; the ON DELETE CASCADE / SET NULL rules depend on it
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.close()
+
+
+def install_sqlite_pragmas(engine: Engine) -> None:
+    if engine.dialect.name == "sqlite" and not event.contains(engine, "connect", _sqlite_pragmas):
+        event.listen(engine, "connect", _sqlite_pragmas)
+
+
+def insert_ignore(db: AsyncSession, table: Table) -> Insert:
+    """
+    INSERT ... ON CONFLICT DO NOTHING for the session's dialect.
+    """
+    if db.get_bind().dialect.name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        from sqlalchemy.dialects.postgresql import insert
+    return insert(table).on_conflict_do_nothing()
+
+
+def random_order():
+    """
+    ORDER BY expression for a random row order; random() on PostgreSQL and SQLite alike.
+    """
+    return func.random()
+
+
+_extensions: "WeakKeyDictionary[Engine, frozenset[str]]" = WeakKeyDictionary()
+
+
+async def has_extension(conn: AsyncConnection, name: str) -> bool:
+    """
+    Whether the PostgreSQL extension `name` is installed, looked up once per engine.
+    """
+    if conn.dialect.name != "postgresql":
+        return False
+    installed = _extensions.get(conn.sync_engine)
+    if installed is None:
+        installed = frozenset((await conn.execute(text("SELECT extname FROM pg_extension"))).scalars())
+        _extensions[conn.sync_engine] = installed
+    return name in installed
+
+
+async def estimated_count(db: AsyncSession, query: Select) -> int:
+    """
+    How many rows `query` returns: the planner's estimate on PostgreSQL,
+    which reads no rows, and an exact count elsewhere.
+    """
+    connection = await db.connection()
+    query = query.order_by(None).limit(None).offset(None)
+    if connection.dialect.name != "postgresql":
+        return (await connection.execute(select(func.count()).select_from(query.subquery()))).scalar_one()
+    compiled = query.compile(dialect=connection.dialect)
+    parameters = tuple(compiled.params[name] for name in compiled.positiontup)
+    plan = (await connection.exec_driver_sql("EXPLAIN (FORMAT JSON) " + str(compiled), parameters)).scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+async def bulk_load(conn: AsyncConnection, table: Table, columns: Sequence[str], rows: list[tuple]) -> None:
+    """
+    Load rows as fast as the driver allows: COPY on asyncpg (committed by the
+    server as it completes), an executemany INSERT elsewhere (commit it yourself).
+    """
+    if conn.dialect.driver == "asyncpg":
+        raw = await conn.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(table.name, records=rows, columns=list(columns))
+    else:
+        await conn.execute(table.insert(), [dict(zip(columns, row)) for row in rows])
+
+
+@asynccontextmanager
+async def deferred_foreign_keys(conn: AsyncConnection) -> AsyncIterator[None]:
+    """
+    Skip per-row foreign key triggers on PostgreSQL for bulk loads whose
+    references are known to be valid. Needs superuser; without it, or on other
+    databases, the keys are simply checked as usual.
+    """
+    if conn.dialect.driver != "asyncpg":
+        yield
+        return
+    raw = (await conn.get_raw_connection()).driver_connection
+    try:
+        await raw.execute("SET session_replication_role = replica")
+    except Exception as e:
+        logger.info("Foreign key checks stay on during the load: %s", e)
+        yield
+        return
+    try:
+        yield
+    finally:
+        await raw.execute("RESET session_replication_role")
+
+
+async def sync_id_sequence(conn: AsyncConnection, table: Table) -> None:
+    """
+    Move a PostgreSQL serial past rows inserted with explicit ids. SQLite
+    continues from max(id) by itself.
+    """
+    if conn.dialect.name != "postgresql":
+        return
+    max_id = (await conn.execute(select(func.max(table.c.id)))).scalar()
+    if max_id is not None:
+        await conn.execute(
+            text("SELECT setval(pg_get_serial_sequence(:table, 'id'), :max_id)"),
+            {"table": table.name, "max_id": max_id})
+
+
+async def truncate_tables(conn: AsyncConnection, tables: Sequence[Table]) -> None:
+    """
+    Empty `tables` (which must include every table referencing them) in the
+    caller's transaction.
+    """
+    if conn.dialect.name == "postgresql":
+        quote = conn.dialect.identifier_preparer.quote
+        await conn.execute(text(f"TRUNCATE {', '.join(quote(table.name) for table in tables)} RESTART IDENTITY"))
+    else:
+        for table in reversed(tables):
+            await conn.execute(table.delete())
+
+
+_PG_CONSTRAINTS = text("""
+    SELECT c.conrelid::regclass::text AS table_name, c.conname AS name, c.contype::text AS kind,
+           pg_get_constraintdef(c.oid) AS definition
+    FROM pg_constraint c
+    WHERE c.contype IN ('p', 'u', 'f')
+      AND (c.conrelid::regclass::text = ANY(:tables) OR c.confrelid::regclass::text = ANY(:tables))
+""")
+
+_PG_INDEXES = text("""
+    SELECT indexname AS name, indexdef AS definition
+    FROM pg_indexes
+    WHERE schemaname = current_schema() AND tablename = ANY(:tables)
+""")
+
+_SQLITE_INDEXES = text(
+    "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL AND tbl_name IN :tables"
+).bindparams(bindparam("tables", expanding=True))
+
+
+@asynccontextmanager
+async def deferred_constraints(conn: AsyncConnection, tables: Sequence[Table]) -> AsyncIterator[None]:
+    """
+    Bulk-load `tables` without maintaining indexes or checking keys row by row.
+
+    On PostgreSQL the primary keys, unique and foreign key constraints and
+    secondary indexes are dropped and rebuilt from their catalog definitions
+    on exit, all in the caller's transaction. On SQLite secondary indexes are
+    dropped and rebuilt and foreign keys are checked once at the end; since
+    they can only be switched off outside a transaction, the context opens
+    its own and commits it on success. Either way a failed load leaves the
+    schema and data as they were.
+    """
+    names = [table.name for table in tables]
+    if conn.dialect.name == "postgresql":
+        quote = conn.dialect.identifier_preparer.quote
+        constraints = (await conn.execute(_PG_CONSTRAINTS, {"tables": names})).all()
+        constraint_names = {row.name for row in constraints}
+        indexes = [row for row in (await conn.execute(_PG_INDEXES, {"tables": names}))
+                   if row.name not in constraint_names]
+
+        # Foreign keys depend on the referenced keys, so they go first and come back last
+        for kind in ("f", "u", "p"):
+            for row in constraints:
+                if row.kind == kind:
+                    await conn.exec_driver_sql(
+                        f"ALTER TABLE {quote(row.table_name)} DROP CONSTRAINT {quote(row.name)}")
+        for row in indexes:
+            await conn.exec_driver_sql(f"DROP INDEX {quote(row.name)}")
+
+        yield
+
+        for kind in ("p", "u"):
+            for row in constraints:
+                if row.kind == kind:
+                    await conn.exec_driver_sql(
+                        f"ALTER TABLE {quote(row.table_name)} ADD CONSTRAINT {quote(row.name)} {row.definition}")
+        for row in indexes:
+            await conn.exec_driver_sql(row.definition)
+        for row in constraints:
+            if row.kind == "f":
+                await conn.exec_driver_sql(
+                    f"ALTER TABLE {quote(row.table_name)} ADD CONSTRAINT {quote(row.name)} {row.definition}")
+
+    elif conn.dialect.name == "sqlite":
+        if (await conn.get_raw_connection()).driver_connection.in_transaction:
+            raise RuntimeError("deferred_constraints must open the SQLite transaction itself")
+        # The switch only works outside a transaction; keys are checked in one pass instead
+        await conn.exec_driver_sql("PRAGMA foreign_keys = OFF")
+        try:
+            # pysqlite would otherwise run the DDL below outside the transaction
+            await conn.exec_driver_sql("BEGIN")
+            indexes = (await conn.execute(_SQLITE_INDEXES, {"tables": names})).all()
+            for row in indexes:
+                await conn.exec_driver_sql(f'DROP INDEX "{row.name}"')
+
+            yield
+
+            for row in indexes:
+                await conn.exec_driver_sql(row.sql)
+            violations = (await conn.exec_driver_sql("PRAGMA foreign_key_check")).all()
+            if violations:
+                raise ValueError(f"{len(violations)} foreign key violations, e.g. {tuple(violations[0])}")
+            await conn.commit()
+        except BaseException:
+            await conn.rollback()
+            raise
+        finally:
+            await conn.exec_driver_sql("PRAGMA foreign_keys = ON")
+
+    else:
+        yield
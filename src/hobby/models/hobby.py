@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING
-from sqlalchemy import Integer, String, Table, ForeignKey, Column
-from src.models import Base
+from sqlalchemy import Integer, String, Table, ForeignKey, Column, Index
+from src.models import Base, has_pg_trgm
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 if TYPE_CHECKING:
@@ -10,11 +10,16 @@ user_hobby_association = Table(
     "user_hobby",
     Base.metadata,
     Column("user_id", ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
-    Column("hobby_id", ForeignKey("hobbies.id", ondelete="CASCADE"), primary_key=True)
+    Column("hobby_id", ForeignKey("hobbies.id", ondelete="CASCADE"), primary_key=True),
+    Index("ix_user_hobby_hobby_user", "hobby_id", "user_id")
 )
 
 class Hobby(Base):
     __tablename__ = "hobbies"
+    __table_args__ = (
+        Index("ix_hobbies_name_trgm", "name", postgresql_using="gin",
+              postgresql_ops={"name": "gin_trgm_ops"}).ddl_if(callable_=has_pg_trgm),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     name: Mapped[str] = mapped_column(String, nullable=False, unique=True)
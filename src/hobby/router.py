@@ -4,8 +4,10 @@ from typing import List, Optional
 
 from src.hobby.schemas.category import CategorySchema, CategoryCreate
 from src.database import get_db
+from src.dependencies import get_read_db
 from src.hobby.schemas.hobby import HobbySchema, HobbyCreate, HobbyUpdate
 from src.hobby.service import HobbyService
+from src.serialization import json_response
 from src.auth.schemas.token_data import TokenData
 from src.auth.dependencies import get_token_data
 
@@ -64,12 +66,12 @@ async def delete_existing_hobby(
 @router.get("/", response_model=List[HobbySchema])
 async def search_all_hobbies(
     query: Optional[str] = None,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     token: TokenData = Depends(get_token_data)
 ):
     service = HobbyService(db)
     if query:  # Simplified logic, assuming search_hobbies is the primary way to list/filter
-        return await service.search_hobbies(query=query)
+        return json_response(List[HobbySchema], await service.search_hobbies(query=query))
     raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
                         detail="Query parameter is required for searching hobbies, or provide a general listing endpoint.")
 
@@ -80,7 +82,7 @@ async def get_my_hobbies(
     db: AsyncSession = Depends(get_db)
 ):
     service = HobbyService(db)
-    return await service.get_user_hobbies(user_id=token.id)
+    return json_response(List[HobbySchema], await service.get_user_hobbies(user_id=token.id))
 
 
 @router.post("/my/", response_model=dict)  # Or a more specific response schema
@@ -121,16 +123,17 @@ async def create_new_category(
     token: TokenData = Depends(get_token_data)
 ):
     service = HobbyService(db)
-    return await service.create_category(name=category.name)
+    return json_response(CategorySchema, await service.create_category(name=category.name),
+                         status_code=status.HTTP_201_CREATED)
 
 
 @router.get("/categories/", response_model=List[CategorySchema])
 async def get_all_categories(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     token: TokenData = Depends(get_token_data)
 ):
     service = HobbyService(db)
-    return await service.get_all_categories()
+    return json_response(List[CategorySchema], await service.get_all_categories())
 
 
 @router.get("/categories/{category_id}", response_model=CategorySchema)
@@ -140,7 +143,7 @@ async def get_category_by_id(
     token: TokenData = Depends(get_token_data)
 ):
     service = HobbyService(db)
-    return await service.get_category(category_id=category_id)
+    return json_response(CategorySchema, await service.get_category(category_id=category_id))
 
 
 @router.put("/categories/{category_id}", response_model=CategorySchema)
@@ -151,7 +154,7 @@ async def update_category(
     token: TokenData = Depends(get_token_data)
 ):
     service = HobbyService(db)
-    return await service.update_category(category_id=category_id, name=category.name)
+    return json_response(CategorySchema, await service.update_category(category_id=category_id, name=category.name))
 
 
 @router.delete("/categories/{category_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -9,8 +9,11 @@ from src.hobby.schemas.category import CategorySchema, CategoryCreate
 from src.hobby.models.hobby import Hobby
 from src.hobby.schemas.hobby import HobbySchema, HobbyCreate, HobbyUpdate
 from src.hobby.models.hobby import user_hobby_association
+from src.monitoring.utils.metrics import instrumented
+from src.serialization import trusted, trusted_list
 
 
+@instrumented
 class HobbyService:
     def __init__(self, db: AsyncSession):
         self.db = db
@@ -78,7 +81,7 @@ class HobbyService:
             raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                                 detail="Could not delete hobby.") from e
 
-    async def get_user_hobbies(self, user_id: int) -> list[HobbySchema]:
+    async def get_user_hobbies(self, user_id: int) -> list[dict]:
         try:
             if user_id <= 0:
                 raise HTTPException(status_code=400, detail="Invalid user ID")
@@ -88,7 +91,7 @@ class HobbyService:
                 .where(user_hobby_association.c.user_id == user_id)
             )
             hobbies = result.scalars().all()
-            return [HobbySchema.model_validate(hobby.__dict__) for hobby in hobbies]
+            return trusted_list(HobbySchema, hobbies)
         except SQLAlchemyError as e:
             raise HTTPException(status_code=500, detail=f"Database error: {e}")
 
@@ -167,24 +170,24 @@ class HobbyService:
             await self.db.rollback()
             raise HTTPException(status_code=500, detail=f"Database error: {e}")
 
-    async def search_hobbies(self, query: str) -> list[HobbySchema]:
+    async def search_hobbies(self, query: str) -> list[dict]:
         try:
             result = await self.db.execute(
                 select(Hobby)
                 .where(Hobby.name.ilike(f"%{query}%"))
             )
             hobbies = result.scalars().all()
-            return [HobbySchema.model_validate(hobby.__dict__) for hobby in hobbies]
+            return trusted_list(HobbySchema, hobbies)
         except SQLAlchemyError as e:
             raise HTTPException(status_code=500, detail=f"Database error: {e}")
 
-    async def create_category(self, name: str) -> CategorySchema:
+    async def create_category(self, name: str) -> dict:
         try:
             category = Category(name=name)
             self.db.add(category)
             await self.db.commit()
             await self.db.refresh(category)
-            return CategorySchema.model_validate(category.__dict__)
+            return trusted(CategorySchema, category)
         except IntegrityError as e:
             await self.db.rollback()
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
@@ -193,21 +196,15 @@ class HobbyService:
             await self.db.rollback()
             raise HTTPException(status_code=500, detail=f"Database error: {e}")
 
-    async def get_all_categories(self) -> list[CategorySchema]:
+    async def get_all_categories(self) -> list[dict]:
         try:
             result = await self.db.execute(select(Category).options(joinedload(Category.hobbies)))
             categories = result.unique().scalars().all()
-            return [
-                CategorySchema.model_validate({
-                    **cat.__dict__,
-                    "hobbies": [HobbySchema.model_validate(hobby.__dict__) for hobby in cat.hobbies]
-                })
-                for cat in categories
-            ]
+            return trusted_list(CategorySchema, categories)
         except SQLAlchemyError as e:
             raise HTTPException(status_code=500, detail=f"Database error: {e}")
 
-    async def get_category(self, category_id: int) -> CategorySchema:
+    async def get_category(self, category_id: int) -> dict:
         result = await self.db.execute(
             select(Category).options(joinedload(Category.hobbies)).where(
                 Category.id == category_id)
@@ -216,12 +213,9 @@ class HobbyService:
         if not category:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Category not found")
-        return CategorySchema.model_validate({
-            **category.__dict__,
-            "hobbies": [HobbySchema.model_validate(hobby.__dict__) for hobby in category.hobbies]
-        })
+        return trusted(CategorySchema, category)
 
-    async def update_category(self, category_id: int, name: str) -> CategorySchema:
+    async def update_category(self, category_id: int, name: str) -> dict:
         result = await self.db.execute(select(Category).where(Category.id == category_id))
         category = result.scalar_one_or_none()
         if not category:
@@ -231,7 +225,7 @@ class HobbyService:
         try:
             await self.db.commit()
             await self.db.refresh(category)
-            return CategorySchema.model_validate(category.__dict__)
+            return trusted(CategorySchema, category)
         except IntegrityError as e:
             await self.db.rollback()
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
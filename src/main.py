@@ -1,13 +1,26 @@
+import logging
+
 from fastapi import FastAPI
 from src.auth.router import router as auth_router
 from src.user.router import router as user_router
 from src.hobby.router import router as hobby_router
 from src.messages.router import router as messages_router
 from src.match.router import router as match_router
+from src.monitoring.router import metrics_router, router as monitoring_router
+from src.monitoring.middleware import MetricsMiddleware, ProfilingMiddleware, QueryStatsMiddleware
 from src.exceptions import sqlalchemy_exception_handler, generic_exception_handler
 from sqlalchemy.exc import SQLAlchemyError
+from src.auth.utils.util import password_hash_pool
+from src.auth.utils.revocation import revocation_store
+from src.auth.utils.availability import availability_index
+from src.auth.utils.rehash import drain_rehashes
+from src.auth.utils.bulk_import import shutdown_bulk_executor
+
+from src.config import settings
+from src.database import async_session, engine
+from src.startup import bootstrap
 
-from src.dbTest import init_models, insert_dummy_data
+logger = logging.getLogger(__name__)
 
 app = FastAPI()
 
@@ -17,6 +30,14 @@ app.include_router(user_router)
 app.include_router(hobby_router)
 app.include_router(messages_router)
 app.include_router(match_router)
+app.include_router(monitoring_router)
+app.include_router(metrics_router)
+
+app.add_middleware(QueryStatsMiddleware)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+if settings.PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware, sample_rate=settings.PROFILE_SAMPLE_RATE)
 
 app.add_exception_handler(SQLAlchemyError, sqlalchemy_exception_handler)
 app.add_exception_handler(Exception, generic_exception_handler)
@@ -24,10 +45,17 @@ app.add_exception_handler(Exception, generic_exception_handler)
 
 @app.on_event("startup")
 async def on_startup():
+    elapsed = await bootstrap(settings.STARTUP_MODE, engine, async_session)
+    logger.info("Startup mode %s finished in %.1f ms", settings.STARTUP_MODE, elapsed * 1000)
+    await revocation_store.sync()
+    await availability_index.sync()
+
 
-    await init_models()
-    await insert_dummy_data()
-    print("Done")
+@app.on_event("shutdown")
+async def on_shutdown():
+    await drain_rehashes()
+    password_hash_pool.shutdown()
+    shutdown_bulk_executor()
 
 
 @app.get("/")
@@ -1,7 +1,7 @@
 from typing import TYPE_CHECKING
 from src.models import Base
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, Index
 
 if TYPE_CHECKING:
     from src.user.models.user import User
@@ -9,6 +9,10 @@ if TYPE_CHECKING:
 
 class UserLiked(Base):
     __tablename__ = "user_likes"
+    __table_args__ = (
+        # The primary key starts with liker_id; incoming likes are looked up by liked_id
+        Index("ix_user_likes_liked_liker", "liked_id", "liker_id"),
+    )
 
     liker_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
     liked_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
@@ -0,0 +1,58 @@
+from sqlalchemy import bindparam, exists, select
+from sqlalchemy.orm import aliased
+
+from src.dialects import random_order
+from src.hobby.models.hobby import user_hobby_association
+from src.match.models.userLiked import UserLiked
+from src.reads import ReadQuery
+from src.user.models.user import User
+from src.user.utils.util import UserUtils
+
+_liked_by_me = select(UserLiked.liked_id).where(UserLiked.liker_id == bindparam("user_id"))
+_liking_me = select(UserLiked.liker_id).where(UserLiked.liked_id == bindparam("user_id"))
+
+HAS_HOBBIES = ReadQuery(
+    select(exists().where(user_hobby_association.c.user_id == bindparam("user_id")))
+)
+
+
+def _browse(shared_hobbies: bool) -> ReadQuery:
+    # Same shape as MatchService.browse_users: a random page of ids, then their cards
+    candidate = aliased(User)
+    candidates = select(candidate.id).where(
+        (candidate.id != bindparam("user_id")) &
+        (~candidate.id.in_(_liked_by_me))
+    )
+    if shared_hobbies:
+        mine = select(user_hobby_association.c.hobby_id).where(
+            user_hobby_association.c.user_id == bindparam("user_id"))
+        candidates = candidates.where(
+            exists().where(
+                (user_hobby_association.c.user_id == candidate.id) &
+                (user_hobby_association.c.hobby_id.in_(mine))
+            )
+        )
+    candidates = candidates.order_by(random_order()).limit(bindparam("limit"))
+    return ReadQuery(UserUtils.card_query().where(User.id.in_(candidates)))
+
+
+BROWSE = _browse(shared_hobbies=False)
+BROWSE_SHARED_HOBBIES = _browse(shared_hobbies=True)
+
+MATCHES = ReadQuery(
+    UserUtils.card_query()
+    .where(User.id.in_(_liked_by_me), User.id.in_(_liking_me))
+    .limit(bindparam("limit"))
+)
+
+PENDING_INCOMING = ReadQuery(
+    UserUtils.card_query()
+    .where(User.id.in_(_liking_me), User.id.not_in(_liked_by_me))
+    .limit(bindparam("limit"))
+)
+
+PENDING_OUTGOING = ReadQuery(
+    UserUtils.card_query()
+    .where(User.id.in_(_liked_by_me), User.id.not_in(_liking_me))
+    .limit(bindparam("limit"))
+)
@@ -3,10 +3,12 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
 from src.database import get_db
+from src.dependencies import get_read_db
 from src.auth.schemas.token_data import TokenData
 from src.auth.dependencies import get_token_data
 from src.user.schemas.user import UserSchema
 from src.match.service import MatchService
+from src.serialization import json_response
 
 router = APIRouter(
     prefix="/match",
@@ -37,45 +39,45 @@ async def refuse_user(
 @router.get("/browse", response_model=List[UserSchema])
 async def browse_users(
     limit: int = 10,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     token: TokenData = Depends(get_token_data)
 ):
     service = MatchService(db)
     users = await service.browse_users(current_user_id=token.id, limit=limit)
-    return [UserSchema.model_validate(user) for user in users]
+    return json_response(List[UserSchema], users)
 
 
 @router.get("/pending-incoming", response_model=List[UserSchema])
 async def get_pending_likes_incoming(
     limit: int = 10,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     token: TokenData = Depends(get_token_data)
 ):
     service = MatchService(db)
     users = await service.get_pending_likes(user_id=token.id, limit=limit, isIncoming=True)
-    return [UserSchema.model_validate(user) for user in users]
+    return json_response(List[UserSchema], users)
 
 
 @router.get("/pending-outgoing", response_model=List[UserSchema])
 async def get_pending_likes_outgoing(
     limit: int = 10,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     token: TokenData = Depends(get_token_data)
 ):
     service = MatchService(db)
     users = await service.get_pending_likes(user_id=token.id, limit=limit)
-    return [UserSchema.model_validate(user) for user in users]
+    return json_response(List[UserSchema], users)
 
 
 @router.get("/mutual", response_model=List[UserSchema])
 async def get_matches(
     limit: int = 10,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     token: TokenData = Depends(get_token_data)
 ):
     service = MatchService(db)
     users = await service.get_matches(user_id=token.id, limit=limit)
-    return [UserSchema.model_validate(user) for user in users]
+    return json_response(List[UserSchema], users)
 
 
 @router.delete("/undo/{user_id}", status_code=status.HTTP_200_OK)
@@ -1,13 +1,20 @@
 from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import func, and_, not_, exists
+from sqlalchemy import and_, not_, exists
+from sqlalchemy.orm import aliased
 from src.user.models.user import User
+from src.user.utils.util import UserUtils
 from src.match.models.userLiked import UserLiked
 from src.hobby.models.hobby import user_hobby_association
 import random
+from src.monitoring.utils.metrics import instrumented
+from src.dialects import random_order
+from src.reads import core_reads
+from src.match import reads
 
 
+@instrumented
 class MatchService:
     def __init__(self, db: AsyncSession):
         self.db = db
@@ -35,6 +42,13 @@ class MatchService:
         return {"detail": "User refused"}
 
     async def browse_users(self, current_user_id: int, limit: int = 10):
+        if core_reads.enabled("MatchService.browse_users"):
+            shared = (await reads.HAS_HOBBIES.first(self.db, user_id=current_user_id))[0]
+            query = reads.BROWSE_SHARED_HOBBIES if shared else reads.BROWSE
+            users = [UserUtils.card(row) for row in await query.rows(self.db, user_id=current_user_id, limit=limit)]
+            random.shuffle(users)
+            return users
+
         hobbies_result = await self.db.execute(
             select(user_hobby_association.c.hobby_id).where(
                 user_hobby_association.c.user_id == current_user_id
@@ -44,50 +58,62 @@ class MatchService:
 
         liked_subq = select(UserLiked.liked_id).where(
             UserLiked.liker_id == current_user_id)
-        user_query = (
-            select(User)
+        # Draw the random page by id alone, then fetch those cards; ordering the
+        # card query itself at random would join the photo of every candidate
+        candidate = aliased(User)
+        candidates = (
+            select(candidate.id)
             .where(
-                (User.id != current_user_id) &
-                (~User.id.in_(liked_subq))
+                (candidate.id != current_user_id) &
+                (~candidate.id.in_(liked_subq))
             )
         )
         if user_hobby_ids:
-            user_query = user_query.where(
+            candidates = candidates.where(
                 exists().where(
-                    (user_hobby_association.c.user_id == User.id) &
+                    (user_hobby_association.c.user_id == candidate.id) &
                     (user_hobby_association.c.hobby_id.in_(user_hobby_ids))
                 )
             )
-        user_query = user_query.order_by(func.random()).limit(limit)
+        candidates = candidates.order_by(random_order()).limit(limit)
+        user_query = UserUtils.card_query().where(User.id.in_(candidates))
         result = await self.db.execute(user_query)
-        users = result.scalars().all()
+        users = [UserUtils.card(row) for row in result]
         random.shuffle(users)
         return users
 
     async def get_pending_likes(self, user_id: int, limit: int = 10, isIncoming = False):
+        if core_reads.enabled("MatchService.get_pending_likes"):
+            query = reads.PENDING_INCOMING if isIncoming else reads.PENDING_OUTGOING
+            return [UserUtils.card(row) for row in await query.rows(self.db, user_id=user_id, limit=limit)]
+
         liked_subq = select(UserLiked.liker_id).where(
             UserLiked.liked_id == user_id) if isIncoming else select(UserLiked.liked_id).where(
             UserLiked.liker_id == user_id)
-        
+        # Likes returned the other way are matches, not pending
+        reverse_subq = select(UserLiked.liked_id).where(
+            UserLiked.liker_id == user_id) if isIncoming else select(UserLiked.liker_id).where(
+            UserLiked.liked_id == user_id)
+
         user_query = (
-            select(User)
-            .where(User.id.in_(liked_subq))
+            UserUtils.card_query()
+            .where(User.id.in_(liked_subq), User.id.not_in(reverse_subq))
             .limit(limit)
         )
 
         result = await self.db.execute(user_query)
-        users = result.scalars().all()
-        matches = await self.get_matches(user_id)
-        
-        return [user for user in users if user not in matches]
+        return [UserUtils.card(row) for row in result]
 
     async def get_matches(self, user_id: int, limit: int = 10):
+        if core_reads.enabled("MatchService.get_matches"):
+            return [UserUtils.card(row) for row in await reads.MATCHES.rows(self.db, user_id=user_id, limit=limit)]
+
         liked_subq = select(UserLiked.liked_id).where(
             UserLiked.liker_id == user_id)
         liked_by_subq = select(UserLiked.liker_id).where(
             UserLiked.liked_id == user_id)
         user_query = (
-            select(User)
+            UserUtils.card_query()
             .where(
                 User.id.in_(liked_subq),
                 User.id.in_(liked_by_subq)
@@ -95,8 +121,7 @@ class MatchService:
             .limit(limit)
         )
         result = await self.db.execute(user_query)
-        users = result.scalars().all()
-        return users
+        return [UserUtils.card(row) for row in result]
 
     async def undo_like(self, liker_id: int, liked_id: int):
         result = await self.db.execute(
@@ -2,7 +2,7 @@ from datetime import datetime
 from typing import TYPE_CHECKING
 from src.models import Base
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import func, ForeignKey
+from sqlalchemy import func, ForeignKey, Index
 
 if TYPE_CHECKING:
     from src.user.models.user import User
@@ -10,6 +10,10 @@ if TYPE_CHECKING:
 
 class Message(Base):
     __tablename__ = "messages"
+    __table_args__ = (
+        # Each direction of a conversation is one range scan, already in timestamp order
+        Index("ix_messages_sender_receiver_timestamp", "sender_id", "receiver_id", "timestamp"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     text: Mapped[str] = mapped_column(nullable=False)
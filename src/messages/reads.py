@@ -0,0 +1,21 @@
+from sqlalchemy import and_, bindparam, or_, select
+
+from src.messages.models.message import Message
+from src.reads import ReadQuery
+
+_messages = Message.__table__
+
+# MessageSchema columns, newest first
+CONVERSATION = ReadQuery(
+    select(
+        _messages.c.id, _messages.c.text, _messages.c.photo_url, _messages.c.timestamp,
+        _messages.c.sender_id, _messages.c.receiver_id
+    )
+    .where(or_(
+        and_(_messages.c.sender_id == bindparam("user1_id"), _messages.c.receiver_id == bindparam("user2_id")),
+        and_(_messages.c.sender_id == bindparam("user2_id"), _messages.c.receiver_id == bindparam("user1_id")),
+    ))
+    .order_by(_messages.c.timestamp.desc())
+    .offset(bindparam("skip"))
+    .limit(bindparam("limit"))
+)
@@ -3,8 +3,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 
 from src.database import get_db  # Changed from get_db_session to get_db
+from src.dependencies import get_read_db
 from src.messages.schemas.message import MessageSchema, MessageCreate, MessageUpdate
 from src.messages.service import MessageService
+from src.serialization import json_response, trusted
 from src.auth.schemas.token_data import TokenData  # Added
 from src.auth.dependencies import get_token_data  # Added
 # For type hint if needed, though token.id is primary
@@ -27,7 +29,8 @@ async def send_new_message(
     if token.id == message_data.receiver_id:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
                             detail="Cannot send message to yourself.")
-    return await service.create_message(message_data=message_data, sender_id=token.id)
+    message = await service.create_message(message_data=message_data, sender_id=token.id)
+    return json_response(MessageSchema, trusted(MessageSchema, message), status_code=status.HTTP_201_CREATED)
 
 
 @router.get("/{message_id}", response_model=MessageSchema)
@@ -42,7 +45,7 @@ async def get_message_by_id(
     if not message:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
                             detail="Message not found or not authorized")
-    return MessageSchema.model_validate(message.__dict__)
+    return json_response(MessageSchema, trusted(MessageSchema, message))
 
 
 @router.put("/{message_id}", response_model=MessageSchema)
@@ -54,7 +57,8 @@ async def update_sent_message(
     token: TokenData = Depends(get_token_data)
 ):
     service = MessageService(db)
-    return await service.update_message(message_id=message_id, message_data=message_data, current_user_id=token.id)
+    message = await service.update_message(message_id=message_id, message_data=message_data, current_user_id=token.id)
+    return json_response(MessageSchema, trusted(MessageSchema, message))
 
 
 @router.delete("/{message_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -74,7 +78,7 @@ async def get_user_conversation(
     user_id: int,
     skip: int = 0,
     limit: int = 50,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     # Changed from current_user to token
     token: TokenData = Depends(get_token_data)
 ):
@@ -82,4 +86,5 @@ async def get_user_conversation(
     if token.id == user_id:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
                             detail="Cannot get conversation with yourself using this endpoint.")
-    return await service.get_conversation(user1_id=token.id, user2_id=user_id, skip=skip, limit=limit)
+    messages = await service.get_conversation(user1_id=token.id, user2_id=user_id, skip=skip, limit=limit)
+    return json_response(List[MessageSchema], messages)
@@ -7,8 +7,13 @@ from typing import List, Optional
 from src.messages.models.message import Message
 from src.messages.schemas.message import MessageSchema, MessageCreate, MessageUpdate
 from src.user.models.user import User as UserModel  # For sender_id context
+from src.monitoring.utils.metrics import instrumented
+from src.serialization import trusted_list
+from src.reads import core_reads
+from src.messages import reads
 
 
+@instrumented
 class MessageService:
     def __init__(self, db: AsyncSession):
         self.db = db
@@ -96,7 +101,10 @@ class MessageService:
             raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                                 detail="Could not delete message.") from e
 
-    async def get_conversation(self, user1_id: int, user2_id: int, skip: int = 0, limit: int = 100) -> List[MessageSchema]:
+    async def get_conversation(self, user1_id: int, user2_id: int, skip: int = 0, limit: int = 100) -> list[dict]:
+        if core_reads.enabled("MessageService.get_conversation"):
+            return await reads.CONVERSATION.dicts(self.db, user1_id=user1_id, user2_id=user2_id,
+                                                  skip=skip, limit=limit)
         messages = await self.db.execute(
             select(Message)
             .where(
@@ -108,4 +116,4 @@ class MessageService:
             .offset(skip)
             .limit(limit)
         )
-        return [MessageSchema.model_validate(msg.__dict__) for msg in messages.scalars().all()]
+        return trusted_list(MessageSchema, messages.scalars().all())
@@ -1,4 +1,40 @@
+import logging
+
+from sqlalchemy import event, text
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.orm import DeclarativeBase
 
+logger = logging.getLogger(__name__)
+
+
 class Base(DeclarativeBase):
-    pass
\ No newline at end of file
+    pass
+
+
+def has_pg_trgm(ddl, target, bind, **kw) -> bool:
+    """
+    DDL condition for trigram indexes, which back the ILIKE '%...%' searches.
+    Servers where pg_trgm is not installed simply go without them.
+    """
+    if bind is None or bind.dialect.name != "postgresql":
+        return False
+    query = text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+    return bind.execute(query).first() is not None
+
+
+@event.listens_for(Base.metadata, "before_create")
+def create_pg_trgm(target, connection, **kw) -> None:
+    """
+    Install pg_trgm where the server ships it. A role that may not create
+    extensions gets the tables without the trigram indexes.
+    """
+    if connection.dialect.name != "postgresql":
+        return
+    query = text("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+    if connection.execute(query).first() is None:
+        return
+    try:
+        with connection.begin_nested():
+            connection.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    except DBAPIError as e:
+        logger.warning("pg_trgm could not be installed, trigram indexes are skipped: %s", e.orig)
@@ -0,0 +1,23 @@
+import secrets
+from typing import Optional
+
+from fastapi import Header, HTTPException, status
+
+from src.config import settings
+
+
+async def require_internal_token(x_internal_token: Optional[str] = Header(None)) -> None:
+    """
+    Guard for operator-only routes. Without INTERNAL_API_TOKEN configured they
+    do not exist as far as any client can tell.
+    """
+    if settings.INTERNAL_API_TOKEN is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Not Found"
+        )
+    if x_internal_token is None or not secrets.compare_digest(x_internal_token, settings.INTERNAL_API_TOKEN):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid or missing internal token"
+        )
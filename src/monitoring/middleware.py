@@ -0,0 +1,152 @@
+import asyncio
+import cProfile
+import logging
+import random
+import secrets
+import time
+
+from src.config import settings
+from src.monitoring.utils.metrics import MetricsRegistry, metrics
+from src.monitoring.utils.profiling import ProfileStore, profile_store
+from src.monitoring.utils.queries import QueryStats, track_queries
+
+logger = logging.getLogger(__name__)
+
+
+class QueryStatsMiddleware:
+    """
+    Counts the SQL statements, database time and rows of every HTTP request.
+    Totals are logged per request, suspected N+1 shapes as warnings, and with
+    QUERY_STATS_HEADERS on they are also returned as X-DB-* response headers.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats(settings.QUERY_N_PLUS_ONE_THRESHOLD)
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start" and settings.QUERY_STATS_HEADERS:
+                message = {**message, "headers": list(message.get("headers", [])) + stats.headers()}
+            await send(message)
+
+        with track_queries(stats):
+            try:
+                await self.app(scope, receive, send_with_headers)
+            finally:
+                self._log(scope, stats)
+
+    @staticmethod
+    def _log(scope, stats: QueryStats) -> None:
+        if not stats.statements:
+            return
+        logger.info(
+            "%s %s: %d statements, %.2f ms, %d rows",
+            scope["method"], scope["path"], stats.statements, stats.db_seconds * 1000, stats.rows)
+        for shape, count in stats.suspected_n_plus_one():
+            logger.warning("Suspected N+1 in %s %s: %d x %s", scope["method"], scope["path"], count, shape)
+
+
+class MetricsMiddleware:
+    """
+    Records latency and status per route template (e.g. /users/{user_id}) and
+    the number of requests in flight. Requests that match no route are
+    grouped under "unmatched" so random paths cannot grow the label set.
+    """
+
+    def __init__(self, app, registry: MetricsRegistry = metrics):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        registry = self.registry
+        registry.in_flight += 1
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            registry.in_flight -= 1
+            route = scope.get("route")
+            path = route.path if route is not None else "unmatched"
+            registry.observe_request(scope["method"], path, status, elapsed)
+
+
+class ProfilingMiddleware:
+    """
+    Runs selected requests under cProfile and stores the result in a
+    ProfileStore; the profile name is returned in the X-Profile-Id header.
+
+    A request is selected when it sends "X-Profile: 1" with a valid
+    X-Internal-Token, checked against `token` or else INTERNAL_API_TOKEN,
+    or by sampling `sample_rate` of requests. With no token configured the
+    header is ignored. The middleware is only installed with
+    PROFILING_ENABLED, so it costs nothing when profiling is off.
+
+    cProfile follows the event-loop thread, so anything else the loop runs
+    while the request is in flight shows up too, and time spent waiting on
+    the database appears under the loop's selector. Plain `def` handlers run
+    in the threadpool and are not captured. Only one request is profiled at
+    a time.
+    """
+
+    def __init__(self, app, store: ProfileStore = profile_store, sample_rate: float = 0.0,
+                 token: str | None = None):
+        self.app = app
+        self.store = store
+        self.sample_rate = sample_rate
+        self.token = token
+        self._profiling = False
+
+    def _selected(self, scope) -> bool:
+        headers = dict(scope["headers"])
+        if headers.get(b"x-profile") == b"1":
+            token = self.token if self.token is not None else settings.INTERNAL_API_TOKEN
+            if token is None:
+                return False
+            supplied = headers.get(b"x-internal-token", b"")
+            return secrets.compare_digest(supplied, token.encode())
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self._profiling or not self._selected(scope):
+            await self.app(scope, receive, send)
+            return
+
+        name = self.store.new_name(scope["method"], scope["path"])
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", [])) + [(b"x-profile-id", name.encode())]
+                message = {**message, "headers": headers}
+            await send(message)
+
+        profiler = cProfile.Profile()
+        self._profiling = True
+        profiler.enable()
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            profiler.disable()
+            self._profiling = False
+            try:
+                await asyncio.to_thread(self.store.save, name, profiler)
+            except OSError:
+                logger.exception("Could not store profile %s", name)
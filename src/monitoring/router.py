@@ -0,0 +1,96 @@
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import FileResponse, PlainTextResponse
+
+from src.config import settings
+from src.database import engine, read_engine
+from src.monitoring.dependencies import require_internal_token
+from src.monitoring.utils.metrics import metrics
+from src.monitoring.utils.pool import pool_stats
+from src.monitoring.utils.profiling import profile_store
+from src.monitoring.utils.slow_queries import slow_query_log
+
+router = APIRouter(
+    prefix="/internal",
+    tags=["internal"],
+    dependencies=[Depends(require_internal_token)],
+    include_in_schema=False
+)
+
+# Served at the conventional scrape path rather than under /internal
+metrics_router = APIRouter(
+    tags=["internal"],
+    dependencies=[Depends(require_internal_token)],
+    include_in_schema=False
+)
+
+
+@router.get("/pool", response_model=dict)
+async def get_pool_stats():
+    """
+    Live connection pool state plus checkout counters and acquire-time histogram.
+    Replica pool stats are nested under "replica" when one is configured.
+    """
+    stats = pool_stats(engine.sync_engine.pool, settings.DB_MAX_OVERFLOW)
+    stats["replica"] = (pool_stats(read_engine.sync_engine.pool, settings.DB_MAX_OVERFLOW)
+                        if read_engine is not engine else None)
+    return stats
+
+
+@router.get("/caches", response_model=dict)
+async def get_cache_stats():
+    """
+    Size, hits, misses and hit ratio of every cache registered with the metrics.
+    """
+    return {name: stats() for name, stats in metrics.caches.items()}
+
+
+@router.get("/queries", response_model=list[dict])
+async def get_query_fingerprints(
+    limit: int = Query(20, ge=1, le=500),
+    sort: Literal["total", "p50", "p95", "max", "count"] = "total"
+):
+    """
+    Heaviest SQL fingerprints since startup (or the last reset), with latency
+    percentiles, the issuing service methods and a sample of parameters.
+    """
+    return slow_query_log.top(limit, sort)
+
+
+@router.delete("/queries", status_code=status.HTTP_204_NO_CONTENT)
+async def reset_query_fingerprints():
+    slow_query_log.clear()
+
+
+@router.get("/profiles", response_model=list[dict])
+async def list_profiles():
+    """
+    Stored request profiles, newest first.
+    """
+    return profile_store.list()
+
+
+@router.get("/profiles/{name}")
+async def get_profile(name: str, format: str = "pstats"):
+    """
+    Download a profile as a pstats file (for pstats, snakeviz, ...) or, with
+    ?format=text, the top functions by cumulative time.
+    """
+    if format == "text":
+        summary = profile_store.summary(name)
+        if summary is not None:
+            return PlainTextResponse(summary)
+    else:
+        path = profile_store.path(name)
+        if path is not None:
+            return FileResponse(path, media_type="application/octet-stream", filename=name)
+    raise HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail="Profile not found"
+    )
+
+
+@metrics_router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
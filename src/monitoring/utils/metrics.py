@@ -0,0 +1,179 @@
+import functools
+import inspect
+import time
+from contextvars import ContextVar
+from typing import Callable, Optional
+
+from src.monitoring.utils.histogram import Histogram
+
+
+class RouteMetrics:
+    __slots__ = ("latency", "statuses")
+
+    def __init__(self):
+        self.latency = Histogram()
+        self.statuses: dict[int, int] = {}
+
+
+class MetricsRegistry:
+    """
+    In-process metrics for requests and service calls.
+
+    Recording never takes a lock: everything is recorded from the event-loop
+    thread. Per-route and per-method metrics are created on first use and
+    reused, so the steady-state cost is one dict lookup and a few integer
+    increments.
+    """
+
+    def __init__(self):
+        self.routes: dict[tuple[str, str], RouteMetrics] = {}
+        self.services: dict[tuple[str, str], Histogram] = {}
+        # cache name -> its stats(); read when rendering
+        self.caches: dict[str, Callable[[], dict]] = {}
+        # executor name -> its stats(); read when rendering
+        self.executors: dict[str, Callable[[], dict]] = {}
+        self.in_flight = 0
+
+    def route(self, method: str, path: str) -> RouteMetrics:
+        key = (method, path)
+        route_metrics = self.routes.get(key)
+        if route_metrics is None:
+            route_metrics = self.routes[key] = RouteMetrics()
+        return route_metrics
+
+    def observe_request(self, method: str, path: str, status: int, seconds: float) -> None:
+        route_metrics = self.route(method, path)
+        route_metrics.latency.observe(seconds)
+        route_metrics.statuses[status] = route_metrics.statuses.get(status, 0) + 1
+
+    def service(self, service: str, method: str) -> Histogram:
+        key = (service, method)
+        histogram = self.services.get(key)
+        if histogram is None:
+            histogram = self.services[key] = Histogram()
+        return histogram
+
+    def register_cache(self, name: str, stats: Callable[[], dict]) -> None:
+        """
+        Render a cache's hits, misses, size and hit_ratio, as its stats() reports them.
+        """
+        self.caches[name] = stats
+
+    def register_executor(self, name: str, stats: Callable[[], dict]) -> None:
+        """
+        Render a bounded executor's pending, in_flight and rejected counts, as its stats() reports them.
+        """
+        self.executors[name] = stats
+
+    def reset(self) -> None:
+        self.routes.clear()
+        # Service histograms are held by the instrumented methods, so keep them
+        for histogram in self.services.values():
+            histogram.reset()
+        self.in_flight = 0
+
+    def render(self) -> str:
+        """
+        Prometheus text exposition format, version 0.0.4.
+        """
+        lines = [
+            "# HELP http_requests_in_flight Requests currently being handled.",
+            "# TYPE http_requests_in_flight gauge",
+            f"http_requests_in_flight {self.in_flight}",
+            "# HELP http_request_duration_seconds Request latency by route.",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        for (method, path), route_metrics in sorted(self.routes.items()):
+            labels = f'method="{_escape(method)}",route="{_escape(path)}"'
+            lines.extend(_histogram_lines("http_request_duration_seconds", labels, route_metrics.latency))
+
+        lines += [
+            "# HELP http_requests_total Responses by route and status code.",
+            "# TYPE http_requests_total counter",
+        ]
+        for (method, path), route_metrics in sorted(self.routes.items()):
+            labels = f'method="{_escape(method)}",route="{_escape(path)}"'
+            for status, count in sorted(route_metrics.statuses.items()):
+                lines.append(f'http_requests_total{{{labels},status="{status}"}} {count}')
+
+        lines += [
+            "# HELP service_call_duration_seconds Service method latency.",
+            "# TYPE service_call_duration_seconds histogram",
+        ]
+        for (service, method), histogram in sorted(self.services.items()):
+            labels = f'service="{service}",method="{method}"'
+            lines.extend(_histogram_lines("service_call_duration_seconds", labels, histogram))
+
+        caches = {name: stats() for name, stats in sorted(self.caches.items())}
+        for name, kind, key, help_text in (
+            ("cache_hits_total", "counter", "hits", "Cache lookups answered from the cache."),
+            ("cache_misses_total", "counter", "misses", "Cache lookups that missed."),
+            ("cache_entries", "gauge", "size", "Entries held in process."),
+            ("cache_hit_ratio", "gauge", "hit_ratio", "Hits over lookups since startup."),
+        ):
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+            for cache, stats in caches.items():
+                lines.append(f'{name}{{cache="{_escape(cache)}"}} {stats[key]}')
+
+        executors = {name: stats() for name, stats in sorted(self.executors.items())}
+        for name, kind, key, help_text in (
+            ("executor_pending", "gauge", "pending", "Jobs queued or running."),
+            ("executor_in_flight", "gauge", "in_flight", "Jobs running on a worker."),
+            ("executor_rejected_total", "counter", "rejected", "Jobs turned away with the queue full."),
+        ):
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+            for executor, stats in executors.items():
+                lines.append(f'{name}{{executor="{_escape(executor)}"}} {stats[key]}')
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _histogram_lines(name: str, labels: str, histogram: Histogram) -> list[str]:
+    lines = []
+    for bound, count in histogram.cumulative():
+        le = "+Inf" if bound == float("inf") else repr(bound)
+        lines.append(f'{name}_bucket{{{labels},le="{le}"}} {count}')
+    lines.append(f"{name}_sum{{{labels}}} {histogram.sum}")
+    lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+    return lines
+
+
+metrics = MetricsRegistry()
+
+
+# "<Service>.<method>" of the innermost instrumented call, for attributing SQL statements
+current_service_method: ContextVar[Optional[str]] = ContextVar("current_service_method", default=None)
+
+
+def _timed(histogram: Histogram, fn, qualified_name: str):
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        token = current_service_method.set(qualified_name)
+        started = time.perf_counter()
+        try:
+            return await fn(*args, **kwargs)
+        finally:
+            histogram.observe(time.perf_counter() - started)
+            current_service_method.reset(token)
+    return wrapper
+
+
+def instrumented(cls):
+    """
+    Class decorator timing every public async method, static or not, under
+    service_call_duration_seconds{service=<class>, method=<name>}. The
+    method is also exposed through `current_service_method` while it runs.
+    """
+    for name, attribute in list(vars(cls).items()):
+        if name.startswith("_"):
+            continue
+        if isinstance(attribute, staticmethod) and inspect.iscoroutinefunction(attribute.__func__):
+            histogram = metrics.service(cls.__name__, name)
+            setattr(cls, name, staticmethod(_timed(histogram, attribute.__func__, f"{cls.__name__}.{name}")))
+        elif inspect.iscoroutinefunction(attribute):
+            histogram = metrics.service(cls.__name__, name)
+            setattr(cls, name, _timed(histogram, attribute, f"{cls.__name__}.{name}"))
+    return cls
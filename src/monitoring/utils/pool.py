@@ -0,0 +1,74 @@
+import time
+from typing import Optional
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool
+
+from src.monitoring.utils.histogram import Histogram
+
+
+class PoolTelemetry:
+    """
+    Counters shared by every pool of one pool class, so they survive the pool
+    being recreated after a dispose or invalidation.
+    """
+
+    def __init__(self):
+        self.acquire_seconds = Histogram()
+        self.checkouts = 0
+        self.timeouts = 0
+
+    def reset(self) -> None:
+        self.acquire_seconds.reset()
+        self.checkouts = 0
+        self.timeouts = 0
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """
+    AsyncAdaptedQueuePool that times every checkout. Acquire time covers waiting
+    for a free slot, opening a new connection and any pre-ping, which is the
+    whole delay a request sees before its first query.
+    """
+
+    telemetry = PoolTelemetry()
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.telemetry.timeouts += 1
+            raise
+        finally:
+            self.telemetry.acquire_seconds.observe(time.perf_counter() - started)
+        self.telemetry.checkouts += 1
+        return connection
+
+
+class InstrumentedReplicaQueuePool(InstrumentedAsyncQueuePool):
+    telemetry = PoolTelemetry()
+
+
+def pool_stats(pool: Pool, max_overflow: Optional[int] = None) -> dict:
+    """
+    `max_overflow` is the configured limit; the pool has no public accessor for it.
+    """
+    stats = {"pool_class": type(pool).__name__}
+    if hasattr(pool, "checkedout"):
+        stats.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+            max_overflow=max_overflow,
+            timeout=pool.timeout(),
+        )
+    telemetry = getattr(pool, "telemetry", None)
+    if telemetry is not None:
+        stats.update(
+            checkouts=telemetry.checkouts,
+            timeouts=telemetry.timeouts,
+            acquire_seconds=telemetry.acquire_seconds.snapshot(),
+        )
+    return stats
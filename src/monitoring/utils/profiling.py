@@ -0,0 +1,77 @@
+import cProfile
+import io
+import os
+import pstats
+import re
+import time
+import uuid
+from typing import Optional
+
+from src.config import settings
+
+_UNSAFE = re.compile(r"[^A-Za-z0-9]+")
+_NAME = re.compile(r"^[A-Za-z0-9_-]+\.prof$")
+
+
+class ProfileStore:
+    """
+    Bounded on-disk ring of request profiles in pstats format. Once more than
+    `max_files` are stored the oldest are deleted.
+    """
+
+    def __init__(self, directory: str, max_files: int = 20):
+        self.directory = directory
+        self.max_files = max_files
+
+    @staticmethod
+    def new_name(method: str, path: str) -> str:
+        slug = _UNSAFE.sub("-", path).strip("-")[:60] or "root"
+        return f"{time.strftime('%Y%m%dT%H%M%S')}_{method}_{slug}_{uuid.uuid4().hex[:8]}.prof"
+
+    def save(self, name: str, profiler: cProfile.Profile) -> str:
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, name)
+        profiler.dump_stats(path)
+        self._trim()
+        return path
+
+    def _trim(self) -> None:
+        entries = self.list()
+        for entry in entries[self.max_files:]:
+            try:
+                os.remove(os.path.join(self.directory, entry["name"]))
+            except FileNotFoundError:
+                pass
+
+    def list(self) -> list[dict]:
+        """
+        Stored profiles, newest first.
+        """
+        if not os.path.isdir(self.directory):
+            return []
+        entries = []
+        for name in os.listdir(self.directory):
+            if not _NAME.match(name):
+                continue
+            stat = os.stat(os.path.join(self.directory, name))
+            entries.append({"name": name, "size": stat.st_size, "created": stat.st_mtime})
+        entries.sort(key=lambda entry: (entry["created"], entry["name"]), reverse=True)
+        return entries
+
+    def path(self, name: str) -> Optional[str]:
+        # Only names produced by new_name are served; anything else could escape the directory
+        if not _NAME.match(name):
+            return None
+        path = os.path.join(self.directory, name)
+        return path if os.path.isfile(path) else None
+
+    def summary(self, name: str, limit: int = 40, sort: str = "cumulative") -> Optional[str]:
+        path = self.path(name)
+        if path is None:
+            return None
+        out = io.StringIO()
+        pstats.Stats(path, stream=out).sort_stats(sort).print_stats(limit)
+        return out.getvalue()
+
+
+profile_store = ProfileStore(settings.PROFILE_DIR, settings.PROFILE_MAX_FILES)
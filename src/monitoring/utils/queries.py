@@ -0,0 +1,121 @@
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from src.config import settings
+
+_PARAMETER_LIST = re.compile(r"\((?:\s*(?:\$\d+|\?|%\(\w+\)s|:\w+)\s*,?)+\)")
+_PARAMETER = re.compile(r"\$\d+|%\(\w+\)s|:\w+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """
+    Normalise a statement so executions that differ only in parameters (or in
+    the length of an expanded IN list) share one shape.
+    """
+    shape = _WHITESPACE.sub(" ", statement).strip()
+    shape = _PARAMETER_LIST.sub("(?)", shape)
+    return _PARAMETER.sub("?", shape)
+
+
+class QueryStats:
+    """
+    Statements, database time and rows for one unit of work, usually a request.
+    """
+
+    def __init__(self, n_plus_one_threshold: int = 5):
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.statements = 0
+        self.db_seconds = 0.0
+        self.rows = 0
+        self.shapes: Counter[str] = Counter()
+
+    def record(self, statement: str, seconds: float, rows: int) -> None:
+        self.statements += 1
+        self.db_seconds += seconds
+        self.rows += rows
+        self.shapes[statement_shape(statement)] += 1
+
+    def suspected_n_plus_one(self) -> list[tuple[str, int]]:
+        return [(shape, count) for shape, count in self.shapes.most_common()
+                if count >= self.n_plus_one_threshold]
+
+    def headers(self) -> list[tuple[bytes, bytes]]:
+        return [
+            (b"x-db-statements", str(self.statements).encode()),
+            (b"x-db-time-ms", f"{self.db_seconds * 1000:.2f}".encode()),
+            (b"x-db-rows", str(self.rows).encode()),
+            (b"x-db-n-plus-one", str(len(self.suspected_n_plus_one())).encode()),
+        ]
+
+
+# Every tracker active in the current context; nested trackers all see each statement
+_active: ContextVar[tuple[QueryStats, ...]] = ContextVar("active_query_stats", default=())
+
+
+@contextmanager
+def track_queries(stats: QueryStats | None = None) -> Iterator[QueryStats]:
+    stats = stats or QueryStats(settings.QUERY_N_PLUS_ONE_THRESHOLD)
+    token = _active.set(_active.get() + (stats,))
+    try:
+        yield stats
+    finally:
+        _active.reset(token)
+
+
+@contextmanager
+def assert_max_queries(max_statements: int) -> Iterator[QueryStats]:
+    """
+    Test helper: fail if the block runs more than `max_statements` statements.
+
+        with assert_max_queries(3):
+            await client.get("/users/me", headers=headers)
+    """
+    with track_queries() as stats:
+        yield stats
+    if stats.statements > max_statements:
+        shapes = "\n".join(f"  {count} x {shape}" for shape, count in stats.shapes.most_common())
+        raise AssertionError(
+            f"Expected at most {max_statements} statements, ran {stats.statements}:\n{shapes}")
+
+
+def _row_count(cursor) -> int:
+    if cursor.rowcount is not None and cursor.rowcount >= 0:
+        return cursor.rowcount
+    # The async adapters buffer SELECT results before returning; rowcount stays -1
+    return len(getattr(cursor, "_rows", None) or ())
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_started"].pop()
+    trackers = _active.get()
+    if trackers:
+        elapsed = time.perf_counter() - started
+        rows = _row_count(cursor)
+        for stats in trackers:
+            stats.record(statement, elapsed, rows)
+
+
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("query_started"):
+        connection.info["query_started"].pop()
+
+
+def install_query_hooks(engine: Engine) -> None:
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine, "handle_error", _handle_error)
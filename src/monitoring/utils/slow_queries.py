@@ -0,0 +1,178 @@
+import functools
+import logging
+import re
+import time
+from collections import Counter, OrderedDict, deque
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from src.config import settings
+from src.monitoring.utils.metrics import current_service_method
+from src.monitoring.utils.queries import statement_shape
+
+logger = logging.getLogger(__name__)
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"(?<![\w$.])-?\d+(?:\.\d+)?(?![\w.])")
+_PARAMETERS_LIMIT = 500
+# Bound columns whose values never leave the process: password hashes, emails, message bodies
+_SENSITIVE_COLUMNS = frozenset({"password", "email", "text"})
+_BIND_SUFFIX = re.compile(r"_\d+$")
+_EMAIL = re.compile(r"[^@\s]+@[^@\s]+")
+_REDACTED = "<redacted>"
+
+
+@functools.lru_cache(maxsize=2048)
+def fingerprint(statement: str) -> str:
+    """
+    statement_shape with inline string and numeric literals also replaced, so
+    hand-written SQL groups the same way as bound statements. Cached: the
+    statement strings come from SQLAlchemy's compiled cache and repeat.
+    """
+    return statement_shape(_NUMBER.sub("?", _STRING.sub("?", statement)))
+
+
+def _redact_value(name: Optional[str], value):
+    if name is not None and _BIND_SUFFIX.sub("", name) in _SENSITIVE_COLUMNS:
+        return _REDACTED
+    if isinstance(value, str) and (name is None or _EMAIL.search(value)):
+        return _REDACTED
+    return value
+
+
+def redact_parameters(parameters, context=None):
+    """
+    The bound parameters of a statement with sensitive values replaced.
+    Statements compiled by SQLAlchemy are redacted by bind name (the column
+    the value is compared with or written to) and email-shaped strings; raw
+    driver SQL has no names to go by, so every string in it is redacted.
+    """
+    rows = getattr(context, "compiled_parameters", None) if getattr(context, "compiled", None) else None
+    if rows:
+        redacted = [{name: _redact_value(name, value) for name, value in row.items()} for row in rows]
+        return redacted[0] if len(redacted) == 1 else redacted
+    if isinstance(parameters, dict):
+        return {name: _redact_value(None, value) for name, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return type(parameters)(redact_parameters(value) if isinstance(value, (dict, list, tuple))
+                                else _redact_value(None, value) for value in parameters)
+    return _redact_value(None, parameters)
+
+
+def _percentile(ordered: list[float], fraction: float) -> float:
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class FingerprintStats:
+    __slots__ = ("count", "total_seconds", "max_seconds", "recent", "callers", "parameters")
+
+    def __init__(self, samples: int):
+        self.count = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        # Percentiles are taken over the most recent executions only
+        self.recent: deque[float] = deque(maxlen=samples)
+        self.callers: Counter[str] = Counter()
+        # Parameters of the slowest execution seen
+        self.parameters: Optional[str] = None
+
+
+class SlowQueryLog:
+    """
+    Per-fingerprint statement latency: count, total, p50/p95 over recent
+    executions, max, the service methods that issued it and, with
+    `capture_parameters`, the redacted parameters of the slowest run.
+    Statements slower than `threshold_seconds` are also
+    logged as they happen. At most `max_fingerprints` are kept, least recently
+    seen first out.
+    """
+
+    def __init__(self, threshold_seconds: float = 0.2, max_fingerprints: int = 1000,
+                 samples: int = 200, capture_parameters: bool = False):
+        self.threshold_seconds = threshold_seconds
+        self.max_fingerprints = max_fingerprints
+        self.samples = samples
+        self.capture_parameters = capture_parameters
+        self.fingerprints: OrderedDict[str, FingerprintStats] = OrderedDict()
+
+    def record(self, statement: str, seconds: float, parameters=None, context=None) -> None:
+        key = fingerprint(statement)
+        stats = self.fingerprints.get(key)
+        if stats is None:
+            stats = self.fingerprints[key] = FingerprintStats(self.samples)
+            if len(self.fingerprints) > self.max_fingerprints:
+                self.fingerprints.popitem(last=False)
+        else:
+            self.fingerprints.move_to_end(key)
+
+        caller = current_service_method.get()
+        stats.count += 1
+        stats.total_seconds += seconds
+        stats.recent.append(seconds)
+        stats.callers[caller or "unknown"] += 1
+        if seconds >= stats.max_seconds:
+            stats.max_seconds = seconds
+            if self.capture_parameters and parameters:
+                stats.parameters = repr(redact_parameters(parameters, context))[:_PARAMETERS_LIMIT]
+
+        if seconds >= self.threshold_seconds:
+            logger.warning("Slow query (%.1f ms) from %s: %s",
+                           seconds * 1000, caller or "unknown", key)
+
+    def top(self, limit: int = 20, sort: str = "total") -> list[dict]:
+        """
+        The `limit` heaviest fingerprints by "total", "p50", "p95", "max" or "count".
+        """
+        column = "count" if sort == "count" else f"{sort}_ms"
+        rows = [self._row(key, stats) for key, stats in self.fingerprints.items()]
+        rows.sort(key=lambda row: row[column], reverse=True)
+        return rows[:limit]
+
+    @staticmethod
+    def _row(key: str, stats: FingerprintStats) -> dict:
+        ordered = sorted(stats.recent)
+        return {
+            "fingerprint": key,
+            "count": stats.count,
+            "total_ms": round(stats.total_seconds * 1000, 3),
+            "p50_ms": round(_percentile(ordered, 0.50) * 1000, 3),
+            "p95_ms": round(_percentile(ordered, 0.95) * 1000, 3),
+            "max_ms": round(stats.max_seconds * 1000, 3),
+            "callers": dict(stats.callers.most_common()),
+            "parameters": stats.parameters,
+        }
+
+    def clear(self) -> None:
+        self.fingerprints.clear()
+
+
+slow_query_log = SlowQueryLog(
+    threshold_seconds=settings.SLOW_QUERY_THRESHOLD_MS / 1000,
+    max_fingerprints=settings.SLOW_QUERY_MAX_FINGERPRINTS,
+    samples=settings.SLOW_QUERY_SAMPLES,
+    capture_parameters=settings.SLOW_QUERY_CAPTURE_PARAMETERS,
+)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("slow_query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["slow_query_started"].pop()
+    slow_query_log.record(statement, time.perf_counter() - started, parameters, context)
+
+
+def _handle_error(exception_context):
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("slow_query_started"):
+        connection.info["slow_query_started"].pop()
+
+
+def install_slow_query_log(engine: Engine) -> None:
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine, "handle_error", _handle_error)
@@ -0,0 +1,32 @@
+"""
+Opaque cursors for keyset pagination.
+
+A cursor carries the sort key of the last row a client received, so the next
+page starts with `WHERE key > :last ORDER BY key LIMIT :n` and costs the same
+however deep the client pages, unlike OFFSET, which reads and discards every
+row before the page. Clients get the cursor as an opaque URL-safe string and
+send it back unchanged.
+"""
+import base64
+import json
+
+from fastapi import HTTPException, status
+
+
+def encode_cursor(*values) -> str:
+    raw = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str, *types: type) -> tuple:
+    """
+    The values of a cursor from encode_cursor, checked against `types`.
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except ValueError:
+        values = None
+    if (not isinstance(values, list) or len(values) != len(types)
+            or not all(type(value) is expected for value, expected in zip(values, types))):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    return tuple(values)
@@ -0,0 +1,62 @@
+"""
+Read-only queries on SQLAlchemy Core for the hottest endpoints.
+
+A ReadQuery wraps one statement built at import time with bindparam()
+placeholders, so SQLAlchemy computes its cache key once and compiles it once
+per dialect, and asyncpg prepares it once per connection. It runs on the
+session's connection, which skips the ORM compile step, entity loading and the
+identity map, and returns plain tuples or dicts ready for src.serialization.
+Statements still go through the engine, so query stats and the slow-query log
+see them as usual.
+
+Services keep their ORM query next to the Core one and pick per method with
+settings.CORE_READS: "*" for every method, a comma-separated list such as
+"MessageService.get_conversation,MatchService.browse_users", or "" for none.
+"""
+from typing import Optional, Sequence
+
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Executable
+
+from src.config import settings
+
+
+class CoreReads:
+    """
+    Which service methods read through their ReadQuery instead of the ORM.
+    """
+
+    def __init__(self, methods: str = "*"):
+        self.configure(methods)
+
+    def configure(self, methods: str) -> None:
+        names = {name.strip() for name in methods.split(",") if name.strip()}
+        self.everything = "*" in names
+        self.methods = frozenset(names - {"*"})
+
+    def enabled(self, method: str) -> bool:
+        return self.everything or method in self.methods
+
+
+core_reads = CoreReads(settings.CORE_READS)
+
+
+class ReadQuery:
+    def __init__(self, statement: Executable):
+        self.statement = statement
+
+    async def rows(self, db: AsyncSession, **params) -> Sequence[Row]:
+        connection = await db.connection()
+        return (await connection.execute(self.statement, params)).all()
+
+    async def first(self, db: AsyncSession, **params) -> Optional[Row]:
+        connection = await db.connection()
+        return (await connection.execute(self.statement, params)).first()
+
+    async def dicts(self, db: AsyncSession, **params) -> list[dict]:
+        connection = await db.connection()
+        result = await connection.execute(self.statement, params)
+        # Row._asdict goes through the mapping view for every row; zip is several times cheaper
+        keys = tuple(result.keys())
+        return [dict(zip(keys, row)) for row in result]
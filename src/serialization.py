@@ -0,0 +1,134 @@
+"""
+Serialize database rows straight to JSON bytes.
+
+Rows read from our own tables are trusted: the schema already guarantees what
+the response models would check. `trusted` copies a row's fields into a plain
+payload dict shaped like the response model, without building or validating
+the model, and `json_response` dumps payloads in pydantic-core through a
+cached TypeAdapter over a TypedDict mirror of the model, so the bytes are the
+same ones the model would produce. Returning that Response from an endpoint
+also skips FastAPI's response_model pass, which would validate every row
+again; keep response_model on the route for the OpenAPI schema.
+"""
+import types
+import typing
+from collections.abc import Mapping
+from functools import lru_cache
+from typing import Any, Iterable, Optional
+
+from fastapi import Response, status
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy.engine import Row
+from typing_extensions import TypedDict
+
+
+class JSONBytesResponse(Response):
+    """
+    A Response around JSON that is already encoded.
+    """
+    media_type = "application/json"
+
+
+def _nested_model(annotation: Any) -> tuple[Optional[type[BaseModel]], bool]:
+    """
+    (model, is_list) for fields typed Model, Optional[Model] or List[Model].
+    """
+    origin = typing.get_origin(annotation)
+    if origin is list:
+        model, _ = _nested_model(typing.get_args(annotation)[0])
+        return model, model is not None
+    if origin in (typing.Union, types.UnionType):
+        for arg in typing.get_args(annotation):
+            if arg is not type(None):
+                return _nested_model(arg)
+        return None, False
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation, False
+    return None, False
+
+
+def _payload_annotation(annotation: Any) -> Any:
+    origin = typing.get_origin(annotation)
+    if origin is list:
+        return list[_payload_annotation(typing.get_args(annotation)[0])]
+    if origin in (typing.Union, types.UnionType):
+        return typing.Union[tuple(_payload_annotation(arg) for arg in typing.get_args(annotation))]
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return payload_type(annotation)
+    return annotation
+
+
+@lru_cache(maxsize=None)
+def payload_type(model: type[BaseModel]) -> type:
+    """
+    A TypedDict with the fields of `model`, nested models included.
+    """
+    return TypedDict(f"{model.__name__}Payload", {
+        name: _payload_annotation(field.annotation) for name, field in model.model_fields.items()
+    })
+
+
+@lru_cache(maxsize=None)
+def adapter(response_type: Any) -> TypeAdapter:
+    """
+    The compiled TypeAdapter for payloads of a response type such as list[MessageSchema].
+    """
+    return TypeAdapter(_payload_annotation(response_type))
+
+
+@lru_cache(maxsize=None)
+def _plan(model: type[BaseModel]) -> tuple[tuple[str, ...], tuple[tuple[str, type[BaseModel], bool], ...]]:
+    """
+    (every field name, the fields holding nested models) for `model`.
+    """
+    nested = []
+    for name, field in model.model_fields.items():
+        nested_model, is_list = _nested_model(field.annotation)
+        if nested_model is not None:
+            nested.append((name, nested_model, is_list))
+    return tuple(model.model_fields), tuple(nested)
+
+
+def _values(source: Any) -> Mapping:
+    if hasattr(source, "_sa_instance_state"):
+        # Only the attributes already loaded on an ORM instance, so nothing lazy-loads
+        return source.__dict__
+    if isinstance(source, Row):
+        return source._mapping
+    if isinstance(source, BaseModel):
+        return source.__dict__
+    return source
+
+
+def trusted(model: type[BaseModel], source: Any) -> Optional[dict]:
+    """
+    The payload of `model` for a trusted ORM instance, Core row, mapping or
+    model, without validation. Fields missing from the row, such as
+    relationships that were not loaded, take the model's defaults.
+    """
+    if source is None:
+        return None
+    values = _values(source)
+    names, nested = _plan(model)
+    try:
+        payload = {name: values[name] for name in names}
+    except KeyError:
+        payload = {name: values[name] if name in values else field.get_default(call_default_factory=True)
+                   for name, field in model.model_fields.items()}
+    for name, nested_model, is_list in nested:
+        value = payload[name]
+        if value is not None:
+            payload[name] = ([trusted(nested_model, item) for item in value] if is_list
+                             else trusted(nested_model, value))
+    return payload
+
+
+def trusted_list(model: type[BaseModel], sources: Iterable[Any]) -> list[dict]:
+    return [trusted(model, source) for source in sources]
+
+
+def json_response(response_type: Any, content: Any, status_code: int = status.HTTP_200_OK) -> JSONBytesResponse:
+    """
+    Dump payloads of `response_type` to JSON without validating them again.
+    """
+    return JSONBytesResponse(adapter(response_type).dump_json(content), status_code=status_code)
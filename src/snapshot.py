@@ -0,0 +1,259 @@
+"""
+Export the dataset tables to a snapshot directory and restore them quickly.
+
+    python -m src.snapshot export ./tmp/snapshot
+    python -m src.snapshot restore ./tmp/snapshot
+
+A snapshot is a manifest.json plus one gzip-compressed CSV per table, with
+NULL written as an unquoted \\N and a text equal to \\N quoted, as COPY
+writes them. PostgreSQL exports and restores with COPY. A restore
+replaces the tables' contents in a single transaction: indexes and key
+constraints are dropped for the load and rebuilt afterwards (see
+dialects.deferred_constraints), then id sequences are moved past the data and
+statistics refreshed. Snapshots move between PostgreSQL and SQLite.
+"""
+import argparse
+import asyncio
+import csv
+import gzip
+import json
+import os
+import time
+from datetime import datetime, timezone
+from itertools import repeat
+
+from sqlalchemy import Table, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from src.dialects import deferred_constraints, sync_id_sequence, truncate_tables
+from src.models import Base
+
+# Parents before children
+TABLES = ("users", "user_photos", "categories", "hobbies", "user_hobby", "user_likes", "messages")
+NULL = "\\N"
+FORMAT_VERSION = 1
+_BATCH_SIZE = 10000
+
+
+def _tables() -> list[Table]:
+    return [Base.metadata.tables[name] for name in TABLES]
+
+
+def _file_name(table: Table) -> str:
+    return f"{table.name}.csv.gz"
+
+
+def _format(value) -> str:
+    if value is None:
+        return NULL
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ")
+    return str(value)
+
+
+def _quoted_row(row) -> str:
+    # csv quotes only where it must; a literal \N has to be quoted to stay apart from NULL
+    return ",".join(NULL if value is None else '"' + _format(value).replace('"', '""') + '"'
+                    for value in row) + "\r\n"
+
+
+def _quoted_fields(record: str) -> list[bool]:
+    """
+    Whether each field of the raw CSV `record` was quoted.
+    """
+    quoted, in_quotes, was_quoted = [], False, False
+    for char in record.rstrip("\r\n"):
+        if in_quotes:
+            in_quotes = char != '"'
+        elif char == '"':
+            in_quotes = was_quoted = True
+        elif char == ",":
+            quoted.append(was_quoted)
+            was_quoted = False
+    quoted.append(was_quoted)
+    return quoted
+
+
+def _records(source):
+    """
+    csv.reader over `source`, yielding each record with its raw text, which
+    tells a NULL from a quoted \\N.
+    """
+    consumed = []
+
+    def lines():
+        for line in source:
+            consumed.append(line)
+            yield line
+
+    for row in csv.reader(lines()):
+        yield row, "".join(consumed)
+        consumed.clear()
+
+
+def _parsers(table: Table, columns: list[str]) -> list:
+    parsers = []
+    for name in columns:
+        python_type = table.c[name].type.python_type
+        if python_type is datetime:
+            parsers.append(datetime.fromisoformat)
+        elif python_type is int:
+            parsers.append(int)
+        else:
+            parsers.append(str)
+    return parsers
+
+
+async def _export_table(conn: AsyncConnection, table: Table, path: str) -> int:
+    columns = [column.name for column in table.columns]
+    if conn.dialect.driver == "asyncpg":
+        raw = (await conn.get_raw_connection()).driver_connection
+        with gzip.open(path, "wb", compresslevel=1) as out:
+            status = await raw.copy_from_table(
+                table.name, columns=columns, output=out, format="csv", null=NULL, header=True)
+        return int(status.split()[-1])
+
+    with gzip.open(path, "wt", compresslevel=1, encoding="utf-8", newline="") as out:
+        writer = csv.writer(out)
+        writer.writerow(columns)
+        rows = 0
+        result = await conn.stream(select(table).order_by(*table.primary_key.columns))
+        async for partition in result.partitions(_BATCH_SIZE):
+            if any(NULL in row for row in partition):
+                for row in partition:
+                    if NULL in row:
+                        out.write(_quoted_row(row))
+                    else:
+                        writer.writerow([_format(value) for value in row])
+            else:
+                writer.writerows([_format(value) for value in row] for row in partition)
+            rows += len(partition)
+        return rows
+
+
+async def export_snapshot(engine: AsyncEngine, directory: str) -> dict:
+    """
+    Write every table in TABLES to `directory` and return the manifest.
+    """
+    os.makedirs(directory, exist_ok=True)
+    manifest = {
+        "format": FORMAT_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(),
+        "dialect": engine.dialect.name,
+        "tables": {},
+    }
+    async with engine.connect() as conn:
+        if conn.dialect.name == "postgresql":
+            # One snapshot for every table, so they stay consistent with each other
+            await conn.execution_options(isolation_level="REPEATABLE READ")
+        await conn.execute(text("SELECT 1"))
+        for table in _tables():
+            rows = await _export_table(conn, table, os.path.join(directory, _file_name(table)))
+            manifest["tables"][table.name] = {
+                "file": _file_name(table),
+                "columns": [column.name for column in table.columns],
+                "rows": rows,
+            }
+        await conn.rollback()
+
+    with open(os.path.join(directory, "manifest.json"), "w", encoding="utf-8") as out:
+        json.dump(manifest, out, indent=2)
+    return manifest
+
+
+def read_manifest(directory: str) -> dict:
+    with open(os.path.join(directory, "manifest.json"), encoding="utf-8") as source:
+        manifest = json.load(source)
+    if manifest.get("format") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported snapshot format {manifest.get('format')!r}")
+    for table in _tables():
+        entry = manifest["tables"].get(table.name)
+        if entry is None:
+            raise ValueError(f"Snapshot has no {table.name} table")
+        missing = {column.name for column in table.columns} - set(entry["columns"])
+        if missing:
+            raise ValueError(f"Snapshot {table.name} lacks columns {', '.join(sorted(missing))}")
+    return manifest
+
+
+async def _restore_table(conn: AsyncConnection, table: Table, path: str, columns: list[str]) -> None:
+    if conn.dialect.driver == "asyncpg":
+        raw = (await conn.get_raw_connection()).driver_connection
+        with gzip.open(path, "rb") as source:
+            await raw.copy_to_table(
+                table.name, source=source, columns=columns, format="csv", null=NULL, header=True)
+        return
+
+    parsers = _parsers(table, columns)
+    quoted_null = f'"{NULL}"'
+    with gzip.open(path, "rt", encoding="utf-8", newline="") as source:
+        records = _records(source)
+        next(records)
+        batch = []
+        for row, record in records:
+            quoted = _quoted_fields(record) if quoted_null in record else repeat(False)
+            batch.append({
+                name: None if value == NULL and not is_quoted else parse(value)
+                for name, parse, value, is_quoted in zip(columns, parsers, row, quoted)
+            })
+            if len(batch) >= _BATCH_SIZE:
+                await conn.execute(table.insert(), batch)
+                batch = []
+        if batch:
+            await conn.execute(table.insert(), batch)
+
+
+async def restore_snapshot(engine: AsyncEngine, directory: str) -> dict:
+    """
+    Replace the contents of every table in TABLES with the snapshot in
+    `directory`. Returns rows per table and the seconds taken.
+    """
+    manifest = read_manifest(directory)
+    tables = _tables()
+    started = time.perf_counter()
+    async with engine.connect() as conn:
+        async with deferred_constraints(conn, tables):
+            await truncate_tables(conn, tables)
+            for table in tables:
+                entry = manifest["tables"][table.name]
+                await _restore_table(conn, table, os.path.join(directory, entry["file"]), entry["columns"])
+        for table in tables:
+            if "id" in table.c:
+                await sync_id_sequence(conn, table)
+        await conn.commit()
+    loaded = time.perf_counter() - started
+
+    async with engine.connect() as conn:
+        await conn.execute(text("ANALYZE"))
+        await conn.commit()
+    return {
+        "rows": {name: entry["rows"] for name, entry in manifest["tables"].items()},
+        "load_seconds": round(loaded, 3),
+        "total_seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+async def _main(command: str, directory: str) -> None:
+    from src.database import engine
+    from src.main import app  # noqa: F401  registers every mapped table
+
+    try:
+        if command == "export":
+            manifest = await export_snapshot(engine, directory)
+            print(json.dumps({name: entry["rows"] for name, entry in manifest["tables"].items()}))
+        else:
+            print(json.dumps(await restore_snapshot(engine, directory)))
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Export or restore a dataset snapshot.")
+    parser.add_argument("command", choices=("export", "restore"))
+    parser.add_argument("directory")
+    args = parser.parse_args()
+    asyncio.run(_main(args.command, args.directory))
+
+
+if __name__ == "__main__":
+    main()
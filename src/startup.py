@@ -0,0 +1,68 @@
+import time
+
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.models import Base
+
+STARTUP_MODES = ("reset", "create", "verify", "skip")
+
+
+class SchemaMismatchError(RuntimeError):
+    pass
+
+
+def _missing_schema(connection) -> list[str]:
+    inspector = inspect(connection)
+    existing = set(inspector.get_table_names())
+    expected = Base.metadata.tables
+    missing = [table for table in expected if table not in existing]
+    present = [table for table in expected if table in existing]
+    if present:
+        # One reflection round trip for all tables on PostgreSQL
+        columns = inspector.get_multi_columns(filter_names=present)
+        for (_, table), reflected in columns.items():
+            names = {column["name"] for column in reflected}
+            missing.extend(
+                f"{table}.{column.name}" for column in expected[table].columns if column.name not in names)
+    return missing
+
+
+async def verify_schema(engine: AsyncEngine) -> None:
+    """
+    Check that every mapped table and column exists. Reads the catalog only;
+    nothing is created or altered.
+    """
+    async with engine.connect() as conn:
+        missing = await conn.run_sync(_missing_schema)
+    if missing:
+        raise SchemaMismatchError(
+            f"Database schema is missing: {', '.join(missing)}. "
+            "Start once with STARTUP_MODE=create to create the missing tables."
+        )
+
+
+async def bootstrap(mode: str, engine: AsyncEngine, session_factory) -> float:
+    """
+    Prepare the database for `mode` and return how long it took in seconds.
+
+    reset  - drop and recreate every table and insert dummy data (development only)
+    create - create the tables that do not exist yet; existing tables and rows are left alone
+    verify - check the schema matches the models, fail fast otherwise
+    skip   - do nothing
+    """
+    if mode not in STARTUP_MODES:
+        raise ValueError(f"STARTUP_MODE must be one of {', '.join(STARTUP_MODES)}, got {mode!r}")
+
+    started = time.perf_counter()
+    if mode == "reset":
+        # Imported here so Faker is only loaded when dummy data is wanted
+        from src.dbTest import init_models, insert_dummy_data
+        await init_models(engine)
+        await insert_dummy_data(session_factory)
+    elif mode == "create":
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+    elif mode == "verify":
+        await verify_schema(engine)
+    return time.perf_counter() - started
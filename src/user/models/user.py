@@ -1,10 +1,10 @@
 from typing import List, Optional
 from typing import TYPE_CHECKING
-from sqlalchemy import Integer, String, ForeignKey
+from sqlalchemy import Integer, String, ForeignKey, Index, func, text
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from src.hobby.models.hobby import user_hobby_association
 
-from src.models import Base
+from src.models import Base, has_pg_trgm
 
 if TYPE_CHECKING:
     from src.user.models.user_photo import UserPhoto
@@ -15,6 +15,12 @@ if TYPE_CHECKING:
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = tuple(
+        # UserService.search_user matches every text field with ILIKE '%...%'
+        Index(f"ix_users_{column}_trgm", column, postgresql_using="gin",
+              postgresql_ops={column: "gin_trgm_ops"}).ddl_if(callable_=has_pg_trgm)
+        for column in ("login", "email", "phone_number", "first_name", "last_name")
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     login: Mapped[str] = mapped_column(String(50), unique=True, nullable=False)
@@ -71,3 +77,35 @@ class User(Base):
 
     def __repr__(self):
         return f"<User(id={self.id}, login={self.login}, email={self.email})>"
+
+
+# Fields of the ranked search and autocomplete (src/user/utils/search.py), heaviest first
+SEARCH_FIELDS = ("login", "first_name", "last_name", "email")
+
+
+def search_document():
+    """
+    The weighted tsvector ranked search matches: login weighs most, then the
+    names, then the email split at "@" and ".". Constants are inlined rather
+    than bound so that queries repeat the indexed expression exactly.
+    """
+    simple = text("'simple'::regconfig")
+
+    def weighted(value, weight: str):
+        return func.setweight(func.to_tsvector(simple, value), text(f"'{weight}'"))
+
+    email_words = func.translate(User.email, text("'@.'"), text("'  '"))
+    return (weighted(User.login, "A").op("||")(weighted(User.first_name, "B"))
+            .op("||")(weighted(User.last_name, "B")).op("||")(weighted(email_words, "C")))
+
+
+def search_key(column):
+    """
+    Autocomplete sort key: byte order, so a prefix is one range of its index.
+    """
+    return func.lower(column).collate("C")
+
+
+Index("ix_users_search_document", search_document(), postgresql_using="gin").ddl_if(dialect="postgresql")
+for _field in SEARCH_FIELDS:
+    Index(f"ix_users_{_field}_prefix", search_key(getattr(User, _field))).ddl_if(dialect="postgresql")
@@ -1,8 +1,10 @@
 from urllib import response
 from xml.sax import default_parser_list
-from fastapi import APIRouter, Depends, HTTPException, status, Response, Body
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status, Response, Body
 
 from src.database import get_db
+from src.dependencies import get_read_db
 from src.auth.schemas.token_data import TokenData
 from src.auth.dependencies import get_token_data
 from src.user.schemas.user import UserSchema, UserSearch, UserUpdate
@@ -10,6 +12,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.user.service import UserService
 from src.user.schemas.user_photo import UserPhotoSchema
+from src.serialization import JSONBytesResponse, json_response
+from src.pagination import decode_cursor, encode_cursor
+from src.config import settings
 
 # Changed prefix to plural for consistency
 router = APIRouter(
@@ -31,7 +36,7 @@ async def get_current_user(
     """
     try:
         async with db:
-            return await UserService.get_user(db, token.id)
+            return JSONBytesResponse(await UserService.get_user_card(db, token.id))
     except HTTPException as e:
         raise e
 
@@ -47,7 +52,7 @@ async def edit_current_user(
     """
     Endpoint to edit the authenticated user's details.
     """
-    return await UserService.edit_user(db, user_id=token.id, user_data=user_data)
+    return json_response(UserSchema, await UserService.edit_user(db, user_id=token.id, user_data=user_data))
 
 # DELETE /users/me
 
@@ -69,13 +74,67 @@ async def delete_current_user(
 @router.post("/search", response_model=list[UserSchema])
 async def search_users(
     user_data: UserSearch,
-    db: AsyncSession = Depends(get_db),
+    limit: int = Query(settings.USER_SEARCH_PAGE_SIZE, ge=1, le=settings.USER_SEARCH_MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    count: bool = False,
+    db: AsyncSession = Depends(get_read_db),
+    token: TokenData = Depends(get_token_data)
+):
+    """
+    Endpoint to search for users by email or login, a page at a time in id order.
+
+    A full page carries an X-Next-Cursor header; pass it back as `cursor` for
+    the next page. With `count=true` the X-Total-Count header estimates how
+    many users match in all.
+    """
+    after_id = decode_cursor(cursor, int)[0] if cursor else None
+    users = await UserService.search_user(db, user_data, limit, after_id)
+    response = json_response(list[UserSchema], users)
+    if len(users) == limit:
+        response.headers["X-Next-Cursor"] = encode_cursor(users[-1]["id"])
+    if count:
+        response.headers["X-Total-Count"] = str(await UserService.estimate_search_total(db, user_data))
+    return response
+
+# GET /users/search?q=...
+
+
+@router.get("/search", response_model=list[UserSchema])
+async def rank_users(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(settings.USER_SEARCH_PAGE_SIZE, ge=1, le=settings.USER_SEARCH_MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
+    token: TokenData = Depends(get_token_data)
+):
+    """
+    Endpoint to find users by login, name or email, best matches first.
+    Words match as prefixes, and close misspellings match too where the
+    database supports it. Pages continue through X-Next-Cursor like POST
+    /users/search.
+    """
+    after = decode_cursor(cursor, float, int) if cursor else None
+    ranked = await UserService.rank_users(db, q, limit, after)
+    response = json_response(list[UserSchema], [card for _, card in ranked])
+    if len(ranked) == limit:
+        rank, card = ranked[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor(rank, card["id"])
+    return response
+
+# GET /users/autocomplete?q=...
+
+
+@router.get("/autocomplete", response_model=list[UserSchema])
+async def autocomplete_users(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(settings.USER_AUTOCOMPLETE_LIMIT, ge=1, le=settings.USER_SEARCH_MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_read_db),
     token: TokenData = Depends(get_token_data)
 ):
     """
-    Endpoint to search for users by email or login.
+    Endpoint to suggest users whose login, name or email starts with `q`, logins first.
     """
-    return await UserService.search_user(db, user_data)
+    return json_response(list[UserSchema], await UserService.autocomplete_users(db, q, limit))
 
 @router.get("/photo/{user_id}", response_model=list[UserPhotoSchema])
 async def get_user_photos(
@@ -83,14 +142,14 @@ async def get_user_photos(
     db: AsyncSession = Depends(get_db),
     token: TokenData = Depends(get_token_data)
 ):
-    return await UserService.get_user_photos(db, user_id)
+    return json_response(list[UserPhotoSchema], await UserService.get_user_photos(db, user_id))
 
 @router.get("/me/photo", response_model=list[UserPhotoSchema])
 async def get_current_user_photos(
     db: AsyncSession = Depends(get_db),
     token: TokenData = Depends(get_token_data)
 ):
-    return await UserService.get_user_photos(db, token.id)
+    return json_response(list[UserPhotoSchema], await UserService.get_user_photos(db, token.id))
 # POST /users/me/photo
 
 
@@ -137,7 +196,7 @@ async def set_profile_photo(
     """
     Set the authenticated user's profile photo by photo_id.
     """
-    return await UserService.set_profile_photo(db, user_id=token.id, photo_id=photo_id)
+    return json_response(UserSchema, await UserService.set_profile_photo(db, user_id=token.id, photo_id=photo_id))
 
 # DELETE /users/me/profile-photo
 
@@ -150,7 +209,7 @@ async def remove_profile_photo(
     """
     Remove the authenticated user's profile photo.
     """
-    return await UserService.remove_profile_photo(db, user_id=token.id)
+    return json_response(UserSchema, await UserService.remove_profile_photo(db, user_id=token.id))
 
 
 @router.get("/{user_id}", response_model=UserSchema)
@@ -164,7 +223,7 @@ async def get_user(
     """
     try:
         async with db:
-            return await UserService.get_user(db, user_id)
+            return JSONBytesResponse(await UserService.get_user_card(db, user_id))
     except HTTPException as e:
         raise e
     
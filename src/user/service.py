@@ -2,39 +2,72 @@ from xmlrpc.client import UNSUPPORTED_ENCODING
 from fastapi import HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import exc, insert, select, delete, or_
-from sqlalchemy.orm import selectinload
 from src.user.models.user import User
 from src.user.schemas.user import UserSchema, UserSearch, UserUpdate
 from src.user.schemas.user_photo import UserPhotoSchema
 from src.user.utils.util import UserUtils
+from src.user.utils import search
+from src.user.utils.card_cache import user_cards
+from src.auth.utils.availability import availability_index
 from src.user.models.user_photo import UserPhoto
+from src.monitoring.utils.metrics import instrumented
+from src.serialization import adapter, trusted_list
+from src.config import settings
+from src.dialects import estimated_count
+from typing import Optional
 
 
+@instrumented
 class UserService:
 
     @staticmethod
-    async def get_user(db: AsyncSession, id: int) -> UserSchema:
-        user_query = (
-            select(User)
-            .where(User.id == id)
-            .options(selectinload(User.profile_photo))
-        )
+    async def get_user(db: AsyncSession, id: int) -> dict:
+        user_query = UserUtils.card_query().where(User.id == id)
         result = await db.execute(user_query)
-        user = result.scalar_one_or_none()
+        row = result.first()
 
-        if not user:
+        if not row:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="User not found"
             )
 
-        user_dict = user.__dict__
-        user_dict["profile_photo"] = (
-            UserPhotoSchema.model_validate(user.profile_photo.__dict__)
-            if user.profile_photo else None
-        )
+        return UserUtils.card(row)
 
-        return UserSchema.model_validate(user_dict)
+    @staticmethod
+    async def get_user_card(db: AsyncSession, id: int) -> bytes:
+        """
+        get_user() as UserSchema JSON, from the card cache when it holds the user.
+        A write on another worker may take up to USER_CARD_CACHE_LOCAL_SECONDS
+        to show here; see card_cache.
+        """
+        if not user_cards.enabled:
+            return adapter(UserSchema).dump_json(await UserService.get_user(db, id))
+        card = await user_cards.get(id)
+        if card is not None:
+            return card
+        ticket = user_cards.reserve(id)
+        try:
+            card = adapter(UserSchema).dump_json(await UserService.get_user(db, id))
+        except BaseException:
+            user_cards.release(id, ticket)
+            raise
+        await user_cards.fill(id, ticket, card)
+        return card
+
+    @staticmethod
+    async def _rewrite_card(db: AsyncSession, user_id: int) -> dict:
+        """
+        Read the user's card after a committed write and put it over the cached one.
+        """
+        ticket = await user_cards.invalidate(user_id)
+        try:
+            card = await UserService.get_user(db, user_id)
+        except BaseException:
+            user_cards.release(user_id, ticket)
+            raise
+        await user_cards.write(user_id, ticket, adapter(UserSchema).dump_json(card))
+        return card
 
     @staticmethod
     async def delete_user(db: AsyncSession, id: int) -> int:
@@ -47,6 +80,7 @@ class UserService:
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail="User not found"
                 )
+            await user_cards.evict(id)
             return result.rowcount
         except exc.SQLAlchemyError as e:
             await db.rollback()
@@ -56,9 +90,9 @@ class UserService:
             ) from e
 
     @staticmethod
-    async def edit_user(db: AsyncSession, user_id: int, user_data: UserUpdate) -> UserSchema:
+    async def edit_user(db: AsyncSession, user_id: int, user_data: UserUpdate) -> dict:
         try:
-            user_query = select(User).where(User.id == user_id).options(selectinload(User.profile_photo))
+            user_query = select(User).where(User.id == user_id)
             result = await db.execute(user_query)
             user = result.scalar_one_or_none()
 
@@ -75,15 +109,12 @@ class UserService:
 
             db.add(user)
             await db.commit()
-            await db.refresh(user)
-
-            user_dict = user.__dict__
-            user_dict["profile_photo"] = (
-                UserPhotoSchema.model_validate(user.profile_photo.__dict__)
-                if user.profile_photo else None
-            )
+            # A new login or email is taken now; the availability cache may hold it as free
+            for kind in ("login", "email"):
+                if update_values.get(kind) is not None:
+                    availability_index.mark_taken(kind, update_values[kind])
 
-            return UserSchema.model_validate(user_dict)
+            return await UserService._rewrite_card(db, user_id)
         except exc.SQLAlchemyError as e:
             await db.rollback()
             raise HTTPException(
@@ -92,42 +123,79 @@ class UserService:
             ) from e
 
     @staticmethod
-    async def search_user(db: AsyncSession, user_data: UserSearch) -> list[UserSchema]:
-        try:
-            search_criteria = user_data.model_dump(exclude_unset=True)
+    def _search_filters(user_data: UserSearch) -> list:
+        search_criteria = user_data.model_dump(exclude_unset=True)
 
-            if not search_criteria:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="At least one search criterion must be provided"
-                )
+        if not search_criteria:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="At least one search criterion must be provided"
+            )
 
-            filters = []
-            for key, value in search_criteria.items():
-                column = getattr(User, key)
-                if isinstance(value, str):
-                    filters.append(column.ilike(f"%{value}%"))
-                else:
-                    filters.append(column == value)
+        filters = []
+        for key, value in search_criteria.items():
+            column = getattr(User, key)
+            if isinstance(value, str):
+                filters.append(column.ilike(f"%{value}%"))
+            else:
+                filters.append(column == value)
+        return filters
 
-            user_query = select(User).where(*filters).options(selectinload(User.profile_photo))
+    @staticmethod
+    async def search_user(db: AsyncSession, user_data: UserSearch, limit: int = settings.USER_SEARCH_PAGE_SIZE,
+                          after_id: Optional[int] = None) -> list[dict]:
+        """
+        One page of the users matching every criterion, in id order, starting
+        after `after_id`. Seeking past the last id keeps every page as cheap as
+        the first.
+        """
+        try:
+            user_query = UserUtils.card_query().where(*UserService._search_filters(user_data))
+            if after_id is not None:
+                user_query = user_query.where(User.id > after_id)
+            user_query = user_query.order_by(User.id).limit(min(limit, settings.USER_SEARCH_MAX_PAGE_SIZE))
             result = await db.execute(user_query)
-            users = result.scalars().all()
+            return [UserUtils.card(row) for row in result]
+        except exc.SQLAlchemyError as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="An error occurred while searching for users"
+            ) from e
 
-            if not users:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="No users found with the provided criteria"
-                )
-            
-            user_dicts = [user.__dict__ for user in users]
-            for i in range(len(user_dicts)):
-                user_dicts[i]["profile_photo"] = (
-                UserPhotoSchema.model_validate(users[i].profile_photo.__dict__)
-                if users[i].profile_photo else None
-                )
+    @staticmethod
+    async def estimate_search_total(db: AsyncSession, user_data: UserSearch) -> int:
+        """
+        Roughly how many users match, from the planner on PostgreSQL.
+        """
+        try:
+            return await estimated_count(db, select(User.id).where(*UserService._search_filters(user_data)))
+        except exc.SQLAlchemyError as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="An error occurred while searching for users"
+            ) from e
 
-            return [UserSchema.model_validate(dict) for dict in user_dicts]
+    @staticmethod
+    async def rank_users(db: AsyncSession, query: str, limit: int = settings.USER_SEARCH_PAGE_SIZE,
+                         after: Optional[tuple[float, int]] = None) -> list[tuple[float, dict]]:
+        """
+        (rank, card) of the users whose login, names or email match `query`
+        by prefix or despite typos, best first, continuing after the (rank, id)
+        that ended the previous page.
+        """
+        try:
+            return await search.ranked(db, query, min(limit, settings.USER_SEARCH_MAX_PAGE_SIZE), after)
+        except exc.SQLAlchemyError as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="An error occurred while searching for users"
+            ) from e
+
+    @staticmethod
+    async def autocomplete_users(db: AsyncSession, prefix: str,
+                                 limit: int = settings.USER_AUTOCOMPLETE_LIMIT) -> list[dict]:
+        try:
+            return await search.autocomplete(db, prefix, min(limit, settings.USER_SEARCH_MAX_PAGE_SIZE))
         except exc.SQLAlchemyError as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -135,7 +203,7 @@ class UserService:
             ) from e
 
     @staticmethod
-    async def get_user_photos(db: AsyncSession, user_id: int) -> list[UserPhotoSchema]:
+    async def get_user_photos(db: AsyncSession, user_id: int) -> list[dict]:
         try:
             query = select(UserPhoto).where(UserPhoto.user_id == user_id)
             result = await db.execute(query)
@@ -145,7 +213,7 @@ class UserService:
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail="No photos found for this user"
                 )
-            return [UserPhotoSchema.model_validate(photo.__dict__) for photo in photos]
+            return trusted_list(UserPhotoSchema, photos)
         except exc.SQLAlchemyError as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -183,7 +251,7 @@ class UserService:
     async def delete_photo(db: AsyncSession, photo_id: int, user_id: int):
         try:
             query = delete(UserPhoto).where(
-                (UserPhoto.id == photo_id) and (UserPhoto.user_id == user_id))
+                UserPhoto.id == photo_id, UserPhoto.user_id == user_id)
             result = await db.execute(query)
             await db.commit()
 
@@ -192,6 +260,8 @@ class UserService:
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail="User not found"
                 )
+            # The photo may have been the profile photo
+            await UserService._rewrite_card(db, user_id)
             return result.rowcount
         except exc.SQLAlchemyError as e:
             await db.rollback()
@@ -201,7 +271,7 @@ class UserService:
             ) from e
 
     @staticmethod
-    async def set_profile_photo(db: AsyncSession, user_id: int, photo_id: int) -> UserSchema:
+    async def set_profile_photo(db: AsyncSession, user_id: int, photo_id: int) -> dict:
         user_query = select(User).where(User.id == user_id)
         result = await db.execute(user_query)
         user = result.scalar_one_or_none()
@@ -223,11 +293,10 @@ class UserService:
         user.profile_photo_id = photo_id
         db.add(user)
         await db.commit()
-        await db.refresh(user)
-        return await UserService.get_user(db, user_id)
+        return await UserService._rewrite_card(db, user_id)
 
     @staticmethod
-    async def remove_profile_photo(db: AsyncSession, user_id: int) -> UserSchema:
+    async def remove_profile_photo(db: AsyncSession, user_id: int) -> dict:
         user_query = select(User).where(User.id == user_id)
         result = await db.execute(user_query)
         user = result.scalar_one_or_none()
@@ -239,5 +308,4 @@ class UserService:
         user.profile_photo_id = None
         db.add(user)
         await db.commit()
-        await db.refresh(user)
-        return await UserService.get_user(db, user_id)
+        return await UserService._rewrite_card(db, user_id)
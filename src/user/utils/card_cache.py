@@ -0,0 +1,262 @@
+"""
+User cards (the UserSchema JSON of GET /users/me and /users/{id}) cached by user id.
+
+Cards are kept in a bounded in-process LRU and, when USER_CARD_CACHE_REDIS_URL
+is set, in a shared tier every worker reads. Every write to a card goes
+through the cache once it has committed: the card is read again and written
+over the cached one, or dropped when the user is gone.
+
+A read that misses takes a ticket before it queries and stores its card only
+if no write has taken a newer ticket since, so a card read before a commit is
+never stored after it. In the shared tier such a read only adds a card that
+is not there yet, while writes overwrite it and deleted users leave a
+tombstone, so a worker racing a write on another worker cannot put the old
+card back either.
+
+What a read may see after a write, then: the worker that made the write
+never serves the old card again, nor does the shared tier. A worker's own
+copy of a card is not told about writes made by other workers, so another
+worker may serve the old card for up to USER_CARD_CACHE_LOCAL_SECONDS after
+the write, with or without a shared tier. 0 keeps no copy: with a shared
+tier every read then sees every committed write, and without one the cache
+is off.
+"""
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from src.config import settings
+from src.monitoring.utils.metrics import metrics
+
+# What a deleted user's card is overwritten with in the shared tier
+_TOMBSTONE = b""
+
+
+class CardBackend(ABC):
+    """
+    The shared tier: card JSON by user id, each kept for `ttl` seconds.
+    """
+
+    @abstractmethod
+    async def get(self, user_id: int) -> Optional[bytes]:
+        ...
+
+    @abstractmethod
+    async def add(self, user_id: int, card: bytes, ttl: int) -> None:
+        """
+        Store `card` unless the user already has an entry.
+        """
+
+    @abstractmethod
+    async def set(self, user_id: int, card: bytes, ttl: int) -> None:
+        ...
+
+    @abstractmethod
+    async def delete(self, user_id: int) -> None:
+        ...
+
+
+class InMemoryCardBackend(CardBackend):
+    """
+    A shared tier within one process, standing in for Redis in tests.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        # user id -> (card, expires at)
+        self._cards: dict[int, tuple[bytes, float]] = {}
+
+    async def get(self, user_id: int) -> Optional[bytes]:
+        entry = self._cards.get(user_id)
+        if entry is None or entry[1] <= self._clock():
+            return None
+        return entry[0]
+
+    async def add(self, user_id: int, card: bytes, ttl: int) -> None:
+        if await self.get(user_id) is None:
+            await self.set(user_id, card, ttl)
+
+    async def set(self, user_id: int, card: bytes, ttl: int) -> None:
+        self._cards[user_id] = (card, self._clock() + ttl)
+
+    async def delete(self, user_id: int) -> None:
+        self._cards.pop(user_id, None)
+
+
+class RedisCardBackend(CardBackend):
+    """
+    Cards shared by every worker. Requires the optional `redis` package.
+    """
+
+    def __init__(self, url: str, prefix: str = "card"):
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:
+            raise RuntimeError("USER_CARD_CACHE_REDIS_URL is set but the 'redis' package is not installed") from e
+        self._redis = redis.from_url(url)
+        self.prefix = prefix
+
+    def _key(self, user_id: int) -> str:
+        return f"{self.prefix}:{user_id}"
+
+    async def get(self, user_id: int) -> Optional[bytes]:
+        return await self._redis.get(self._key(user_id))
+
+    async def add(self, user_id: int, card: bytes, ttl: int) -> None:
+        await self._redis.set(self._key(user_id), card, ex=ttl, nx=True)
+
+    async def set(self, user_id: int, card: bytes, ttl: int) -> None:
+        await self._redis.set(self._key(user_id), card, ex=ttl)
+
+    async def delete(self, user_id: int) -> None:
+        await self._redis.delete(self._key(user_id))
+
+
+class UserCardCache:
+    """
+    Card JSON by user id: a bounded LRU in process, each entry kept for
+    `local_seconds`, over an optional shared `backend`.
+
+    Reads call `get`, then on a miss `reserve` before querying and `fill`
+    with the card they read (or `release` when there is none). Writes call
+    `invalidate` once committed, then `write` with the card read after the
+    commit; deleting a user calls `evict`.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 10000,
+        backend: Optional[CardBackend] = None,
+        ttl: int = 3600,
+        local_seconds: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_size = max_size
+        self.backend = backend
+        self.ttl = ttl
+        # Writes on other workers are not seen here, so local cards expire
+        self.local_seconds = local_seconds
+        self._clock = clock
+        # user id -> (card, stored at)
+        self._entries: OrderedDict[int, tuple[bytes, float]] = OrderedDict()
+        # user id -> ticket of the latest read or write in flight
+        self._tickets: dict[int, object] = {}
+        self.local_hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._keeps_local or self.backend is not None
+
+    @property
+    def _keeps_local(self) -> bool:
+        return self.max_size > 0 and self.local_seconds > 0
+
+    def _store(self, user_id: int, card: bytes) -> None:
+        if not self._keeps_local:
+            return
+        self._entries[user_id] = (card, self._clock())
+        self._entries.move_to_end(user_id)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def _current(self, user_id: int, ticket: object) -> bool:
+        if self._tickets.get(user_id) is not ticket:
+            return False
+        del self._tickets[user_id]
+        return True
+
+    async def get(self, user_id: int) -> Optional[bytes]:
+        entry = self._entries.get(user_id)
+        if entry is not None:
+            card, stored_at = entry
+            if self._clock() - stored_at < self.local_seconds:
+                self._entries.move_to_end(user_id)
+                self.local_hits += 1
+                return card
+            del self._entries[user_id]
+
+        if self.backend is not None:
+            card = await self.backend.get(user_id)
+            if card:
+                self.shared_hits += 1
+                self._store(user_id, card)
+                return card
+        self.misses += 1
+        return None
+
+    def reserve(self, user_id: int) -> object:
+        ticket = self._tickets[user_id] = object()
+        return ticket
+
+    def release(self, user_id: int, ticket: object) -> None:
+        self._current(user_id, ticket)
+
+    async def fill(self, user_id: int, ticket: object, card: bytes) -> None:
+        """
+        Cache the card a read got, unless a write has taken a ticket since.
+        """
+        if not self._current(user_id, ticket):
+            return
+        self._store(user_id, card)
+        if self.backend is not None:
+            await self.backend.add(user_id, card, self.ttl)
+
+    async def invalidate(self, user_id: int) -> object:
+        """
+        Drop the user's card after a committed write, turning away every read
+        in flight. Returns the ticket to `write` the new card with.
+        """
+        ticket = self.reserve(user_id)
+        self._entries.pop(user_id, None)
+        if self.backend is not None:
+            await self.backend.delete(user_id)
+        return ticket
+
+    async def write(self, user_id: int, ticket: object, card: bytes) -> None:
+        if not self._current(user_id, ticket):
+            return
+        self._store(user_id, card)
+        if self.backend is not None:
+            await self.backend.set(user_id, card, self.ttl)
+
+    async def evict(self, user_id: int) -> None:
+        # Dropping the ticket turns away the reads in flight
+        self._tickets.pop(user_id, None)
+        self._entries.pop(user_id, None)
+        if self.backend is not None:
+            await self.backend.set(user_id, _TOMBSTONE, self.ttl)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._tickets.clear()
+
+    def stats(self) -> dict:
+        hits = self.local_hits + self.shared_hits
+        lookups = hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": hits,
+            "local_hits": self.local_hits,
+            "shared_hits": self.shared_hits,
+            "misses": self.misses,
+            "hit_ratio": hits / lookups if lookups else 0.0,
+        }
+
+
+def _build_backend() -> Optional[CardBackend]:
+    if settings.USER_CARD_CACHE_REDIS_URL:
+        return RedisCardBackend(settings.USER_CARD_CACHE_REDIS_URL)
+    return None
+
+
+user_cards = UserCardCache(
+    max_size=settings.USER_CARD_CACHE_SIZE,
+    backend=_build_backend(),
+    ttl=settings.USER_CARD_CACHE_TTL_SECONDS,
+    local_seconds=settings.USER_CARD_CACHE_LOCAL_SECONDS,
+)
+metrics.register_cache("user_card", user_cards.stats)
@@ -0,0 +1,301 @@
+"""
+Ranked user search and autocomplete over login, first_name, last_name and email.
+
+On PostgreSQL a query matches the users whose search_document() holds a word
+starting with every word of the query (full text with prefixes, served by the
+ix_users_search_document GIN index) and, where pg_trgm is installed, the users
+with a field close to the query despite typos (the <% operator on the
+ix_users_*_trgm indexes). Matches are ranked by ts_rank_cd plus trigram word
+similarity, at most USER_SEARCH_RANK_WINDOW of them per query: when more
+match, the window keeps logins equal to or starting with the first word
+first and the lowest ids after them, so the ranking of a very common prefix
+is approximate past those. Autocomplete reads each field's
+ix_users_*_prefix index from the prefix onwards, one short range scan per
+field.
+
+Other databases (SQLite in development and tests) get the same answers from
+UserSearchIndex in memory: a sorted word list for prefixes and trigram
+postings for typos, rebuilt on the first search after a write to the users
+table.
+"""
+import asyncio
+import bisect
+import re
+from collections import Counter
+from itertools import islice
+from typing import Optional
+from weakref import WeakKeyDictionary
+
+from sqlalchemy import Float, Row, Select, and_, cast, event, func, literal, or_, select, text, union_all
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.dml import UpdateBase
+
+from src.config import settings
+from src.dialects import has_extension
+from src.user.models.user import SEARCH_FIELDS, User, search_document, search_key
+from src.user.utils.util import UserUtils
+
+# pg_trgm's default word_similarity_threshold, the one <% applies
+WORD_SIMILARITY = 0.6
+# ts_rank weights of the labels search_document() gives each field
+_WEIGHTS = (1.0, 0.4, 0.4, 0.2)
+
+_WORD = re.compile(r"[^\W_]+")
+
+
+def words(value: str) -> list[str]:
+    return _WORD.findall(value.lower())
+
+
+def trigrams(word: str) -> set[str]:
+    # Padded the way pg_trgm pads: two spaces before a word, one after
+    padded = f"  {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def prefix_query(query: str) -> str:
+    """
+    to_tsquery text matching every word of `query` as a prefix. Only letters
+    and digits are kept, so no tsquery syntax gets through.
+    """
+    return " & ".join(f"{word}:*" for word in words(query))
+
+
+def ranked_query(query: str, fuzzy: bool, limit: int, after: Optional[tuple[float, int]] = None) -> Select:
+    """
+    card_query() columns plus the rank of the PostgreSQL users matching
+    `query`, best first, continuing after the (rank, id) of a previous page.
+    """
+    document = search_document()
+    tsquery = func.to_tsquery(text("'simple'::regconfig"), prefix_query(query))
+    matched = document.op("@@")(tsquery)
+    rank = func.ts_rank_cd(document, tsquery)
+    if fuzzy:
+        needle = literal(" ".join(words(query)))
+        fields = [getattr(User, field) for field in SEARCH_FIELDS]
+        matched = or_(matched, *(needle.op("<%")(field) for field in fields))
+        rank = rank + func.greatest(*(func.word_similarity(needle, field) for field in fields))
+    rank = cast(rank, Float)
+
+    # Ranking recomputes the document of every match; a prefix as short as
+    # "ja" matches a large share of all users, so only a window of them is
+    # ranked, chosen by a login match, which costs no more than a comparison
+    login, first = search_key(User.login), words(query)[0]
+    window = (select(User.id.label("user_id"), rank.label("rank"))
+              .where(matched)
+              .order_by((login == first).desc(), login.startswith(first, autoescape=True).desc(), User.id)
+              .limit(settings.USER_SEARCH_RANK_WINDOW)
+              .subquery())
+    page = select(window)
+    if after is not None:
+        after_rank, after_id = after
+        page = page.where(or_(window.c.rank < after_rank,
+                              and_(window.c.rank == after_rank, window.c.user_id > after_id)))
+    # Cards are read for the page alone
+    page = page.order_by(window.c.rank.desc(), window.c.user_id).limit(limit).subquery()
+    return (UserUtils.card_query()
+            .add_columns(page.c.rank)
+            .join(page, page.c.user_id == User.id)
+            .order_by(page.c.rank.desc(), User.id))
+
+
+def autocomplete_query(prefix: str, limit: int) -> Select:
+    """
+    card_query() rows of the PostgreSQL users with a field starting with
+    `prefix`: up to `limit` per field, logins first, each field in order.
+    """
+    lower = prefix.lower()
+    upper = lower[:-1] + chr(ord(lower[-1]) + 1)
+    branches = []
+    for priority, field in enumerate(SEARCH_FIELDS):
+        key = search_key(getattr(User, field))
+        branches.append(
+            select(User.id.label("user_id"), literal(priority).label("priority"), key.label("key"))
+            .where(key >= lower, key < upper)
+            .order_by(key)
+            .limit(limit)
+        )
+    matches = union_all(*branches).subquery()
+    return (UserUtils.card_query()
+            .join(matches, matches.c.user_id == User.id)
+            .order_by(matches.c.priority, matches.c.key, User.id))
+
+
+class UserSearchIndex:
+    """
+    Ranked search and autocomplete from memory, for databases without the
+    PostgreSQL indexes. Loaded from the users table on first use and again
+    after a write to it, so searches never see a user as they were before a
+    committed change.
+    """
+
+    def __init__(self):
+        self.generation = 0
+        self._loaded: Optional[int] = None
+        self._lock = asyncio.Lock()
+        # (word, user id, position of its field in SEARCH_FIELDS), sorted
+        self._words: list[tuple[str, int, int]] = []
+        # trigram -> ids of the users with a word holding it
+        self._postings: dict[str, list[int]] = {}
+        # per field, (lowercased value, user id), sorted
+        self._keys: list[list[tuple[str, int]]] = [[] for _ in SEARCH_FIELDS]
+
+    def _after_execute(self, conn, clauseelement, multiparams, params, execution_options, result) -> None:
+        table = getattr(clauseelement, "table", None)
+        if isinstance(clauseelement, UpdateBase) and getattr(table, "name", None) == User.__tablename__:
+            self.generation += 1
+            conn.info["users_written"] = True
+
+    def _checkin(self, dbapi_connection, connection_record) -> None:
+        # Back in the pool only once committed: a load made while the write was
+        # still uncommitted missed it
+        if connection_record.info.pop("users_written", False):
+            self.generation += 1
+
+    async def refresh(self, db: AsyncSession) -> None:
+        if self._loaded == self.generation:
+            return
+        async with self._lock:
+            generation = self.generation
+            if self._loaded == generation:
+                return
+            fields = [getattr(User, field) for field in SEARCH_FIELDS]
+            self._load((await db.execute(select(User.id, *fields))).all())
+            self._loaded = generation
+
+    def _load(self, rows: list[Row]) -> None:
+        found, postings, keys = [], {}, [[] for _ in SEARCH_FIELDS]
+        for user_id, *values in rows:
+            for position, value in enumerate(values):
+                value = value.lower()
+                keys[position].append((value, user_id))
+                for word in words(value):
+                    found.append((word, user_id, position))
+                    for trigram in trigrams(word):
+                        posting = postings.setdefault(trigram, [])
+                        if not posting or posting[-1] != user_id:
+                            posting.append(user_id)
+        found.sort()
+        for field_keys in keys:
+            field_keys.sort()
+        self._words, self._postings, self._keys = found, postings, keys
+
+    def _prefixed(self, word: str) -> dict[int, float]:
+        weights: dict[int, float] = {}
+        start = bisect.bisect_left(self._words, (word,))
+        for candidate, user_id, position in islice(self._words, start, None):
+            if not candidate.startswith(word):
+                break
+            weights[user_id] = max(weights.get(user_id, 0.0), _WEIGHTS[position])
+        return weights
+
+    def search(self, query: str, fuzzy: bool = True) -> list[tuple[float, int]]:
+        """
+        (rank, user id) of the users matching `query`, best first, ranked the
+        way ranked_query() ranks: field weights of the prefix matches, plus
+        the share of the query's trigrams the user's words hold.
+        """
+        query_words = words(query)
+        if not query_words:
+            return []
+        ranks: Optional[dict[int, float]] = None
+        for word in query_words:
+            weights = self._prefixed(word)
+            ranks = weights if ranks is None else {
+                user_id: rank + weights[user_id] for user_id, rank in ranks.items() if user_id in weights}
+        ranks = {user_id: rank / len(query_words) for user_id, rank in ranks.items()}
+        if fuzzy:
+            needle = set().union(*(trigrams(word) for word in query_words))
+            hits = Counter()
+            for trigram in needle:
+                hits.update(self._postings.get(trigram, ()))
+            for user_id, count in hits.items():
+                similarity = count / len(needle)
+                if user_id in ranks:
+                    ranks[user_id] += similarity
+                elif similarity >= WORD_SIMILARITY:
+                    ranks[user_id] = similarity
+        return sorted(((rank, user_id) for user_id, rank in ranks.items()), key=lambda item: (-item[0], item[1]))
+
+    def autocomplete(self, prefix: str, limit: int) -> list[int]:
+        """
+        Ids of the users with a field starting with `prefix`, in the order of autocomplete_query().
+        """
+        prefix = prefix.lower()
+        ids: dict[int, None] = {}
+        for field_keys in self._keys:
+            start = bisect.bisect_left(field_keys, (prefix,))
+            for value, user_id in field_keys[start:start + limit]:
+                if not value.startswith(prefix):
+                    break
+                ids.setdefault(user_id)
+        return list(ids)[:limit]
+
+
+_indexes: "WeakKeyDictionary[Engine, UserSearchIndex]" = WeakKeyDictionary()
+
+
+def fallback_index(engine: Engine) -> UserSearchIndex:
+    """
+    The UserSearchIndex of `engine`, watching its writes from the first call.
+    """
+    index = _indexes.get(engine)
+    if index is None:
+        index = _indexes[engine] = UserSearchIndex()
+        event.listen(engine, "after_execute", index._after_execute)
+        event.listen(engine, "checkin", index._checkin)
+    return index
+
+
+async def _cards(db: AsyncSession, ids: list[int]) -> dict[int, dict]:
+    result = await db.execute(UserUtils.card_query().where(User.id.in_(ids)))
+    return {card["id"]: card for card in map(UserUtils.card, result)}
+
+
+async def ranked(db: AsyncSession, query: str, limit: int,
+                 after: Optional[tuple[float, int]] = None) -> list[tuple[float, dict]]:
+    """
+    (rank, card) of the users matching `query`, best first, after the (rank,
+    id) of a previous page.
+    """
+    if not words(query):
+        return []
+    connection = await db.connection()
+    if connection.dialect.name == "postgresql":
+        fuzzy = await has_extension(connection, "pg_trgm")
+        result = await db.execute(ranked_query(query, fuzzy, limit, after))
+        return [(row[-1], UserUtils.card(row[:-1])) for row in result]
+
+    index = fallback_index(connection.sync_engine)
+    await index.refresh(db)
+    matches = index.search(query)
+    if after is not None:
+        after_rank, after_id = after
+        matches = [(rank, user_id) for rank, user_id in matches if (-rank, user_id) > (-after_rank, after_id)]
+    matches = matches[:limit]
+    cards = await _cards(db, [user_id for _, user_id in matches])
+    # A user deleted since the index loaded has no card left
+    return [(rank, cards[user_id]) for rank, user_id in matches if user_id in cards]
+
+
+async def autocomplete(db: AsyncSession, prefix: str, limit: int) -> list[dict]:
+    """
+    Cards of up to `limit` users with a field starting with `prefix`.
+    """
+    if not prefix:
+        return []
+    connection = await db.connection()
+    if connection.dialect.name == "postgresql":
+        result = await db.execute(autocomplete_query(prefix, limit))
+        cards = {}
+        for row in result:
+            card = UserUtils.card(row)
+            cards.setdefault(card["id"], card)
+        return list(cards.values())[:limit]
+
+    index = fallback_index(connection.sync_engine)
+    await index.refresh(db)
+    ids = index.autocomplete(prefix, limit)
+    cards = await _cards(db, ids)
+    return [cards[user_id] for user_id in ids if user_id in cards]
@@ -1,6 +1,7 @@
 from src.database import get_db
 from src.user.models.user import User
-from sqlalchemy import exc, select, delete, or_
+from src.user.models.user_photo import UserPhoto
+from sqlalchemy import Row, Select, exc, select, delete, or_
 from sqlalchemy.orm import selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -21,3 +22,36 @@ class UserUtils:
             )
         
         return user
+
+    @staticmethod
+    def card_query() -> Select:
+        """
+        The UserSchema columns and the profile photo in one LEFT JOIN, for
+        reads that return user cards. Never selects the password hash.
+        """
+        return (
+            select(
+                User.id, User.login, User.email, User.phone_number, User.first_name, User.last_name,
+                UserPhoto.id.label("photo_id"), UserPhoto.user_id.label("photo_user_id"), UserPhoto.photo_url
+            )
+            .outerjoin(UserPhoto, UserPhoto.id == User.profile_photo_id)
+        )
+
+    @staticmethod
+    def card(row: Row) -> dict:
+        """
+        A UserSchema payload (see src.serialization) from a card_query row.
+        """
+        id, login, email, phone_number, first_name, last_name, photo_id, photo_user_id, photo_url = row
+        return {
+            "id": id,
+            "login": login,
+            "email": email,
+            "phone_number": phone_number,
+            "first_name": first_name,
+            "last_name": last_name,
+            "profile_photo": (
+                {"id": photo_id, "user_id": photo_user_id, "photo_url": photo_url}
+                if photo_id is not None else None
+            ),
+        }
@@ -0,0 +1,135 @@
+import pytest
+import pytest_asyncio
+from unittest.mock import AsyncMock, patch
+from fastapi import HTTPException
+from src.main import app  # registers every mapped model
+from src.auth import service
+from src.auth.service import AuthService
+from src.auth.utils.availability import AvailabilityIndex
+from src.auth.utils.util import AuthUtil
+from src.user.models.user import User
+from src.user import service as user_service
+from src.user.schemas.user import UserCreate, UserUpdate
+from src.user.service import UserService
+
+
+@pytest_asyncio.fixture
+async def session_factory(session_factory):
+    async with session_factory() as session:
+        session.add(User(login="taken", email="taken@example.com", password="x", first_name="T", last_name="T"))
+        await session.commit()
+    return session_factory
+
+
+@pytest.fixture
+def index(monkeypatch):
+    index = AvailabilityIndex(ttl_seconds=60)
+    monkeypatch.setattr(service, "availability_index", index)
+    return index
+
+
+def new_user(login: str, email: str) -> UserCreate:
+    return UserCreate(login=login, email=email, password="Password123#", password_confirmation="Password123#",
+                      first_name="New", last_name="User")
+
+
+@pytest.mark.asyncio
+async def test_availability_caches_only_free_values(session_factory, index):
+    async with session_factory() as db:
+        first = await AuthService.check_availability(db, email="free@example.com", login="taken")
+        second = await AuthService.check_availability(db, email="free@example.com")
+        third = await AuthService.check_availability(db, login="taken")
+
+    assert (first.email, first.login) == (True, False)
+    assert second.email is True
+    assert third.login is False
+    # One projection query for the first pair, the cached free email needs none
+    assert index.database_checks == 2
+    assert index.cache_hits == 1
+
+
+@pytest.mark.asyncio
+async def test_check_email_returns_id_and_caches_misses(session_factory, index):
+    async with session_factory() as db:
+        assert await AuthService.check_email(db, "taken@example.com") == 1
+        for _ in range(2):
+            with pytest.raises(HTTPException) as exc_info:
+                await AuthService.check_email(db, "nobody@example.com")
+            assert exc_info.value.status_code == 404
+
+    assert index.database_checks == 2
+
+
+@pytest.mark.asyncio
+async def test_filter_answers_definitely_available(session_factory):
+    index = AvailabilityIndex(ttl_seconds=0, filter_enabled=True, filter_capacity=1000,
+                              session_factory=session_factory)
+    await index.sync()
+
+    assert index.is_known_available("login", "someone-new")
+    assert not index.is_known_available("login", "taken")
+    assert not index.is_known_available("email", "taken@example.com")
+
+    index.mark_taken("login", "someone-new")
+    assert not index.is_known_available("login", "someone-new")
+
+
+@pytest.mark.asyncio
+async def test_register_rejects_duplicates_before_hashing(session_factory, index):
+    async with session_factory() as db:
+        with patch.object(AuthUtil, "HashPasswordAsync", new=AsyncMock(return_value="hash")) as hash_password:
+            with pytest.raises(HTTPException) as exc_info:
+                await AuthService.register(db, new_user("taken", "other@example.com"))
+            assert exc_info.value.detail == "Login already exists"
+
+            with pytest.raises(HTTPException) as exc_info:
+                await AuthService.register(db, new_user("other", "taken@example.com"))
+            assert exc_info.value.detail == "Email already exists"
+
+        hash_password.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_register_race_reports_conflicting_field(session_factory, index):
+    real_find_taken = AuthService.find_taken
+    calls = []
+
+    # The pre-check misses a user created concurrently; the unique constraint catches it
+    async def find_taken(db, email=None, login=None):
+        calls.append((email, login))
+        if len(calls) == 1:
+            return None, None
+        return await real_find_taken(db, email, login)
+
+    async with session_factory() as db:
+        with patch.object(AuthService, "find_taken", new=find_taken), \
+                patch.object(AuthUtil, "HashPasswordAsync", new=AsyncMock(return_value="hash")):
+            with pytest.raises(HTTPException) as exc_info:
+                await AuthService.register(db, new_user("fresh", "taken@example.com"))
+
+    assert exc_info.value.status_code == 400
+    assert exc_info.value.detail == "Email already exists"
+
+
+@pytest.mark.asyncio
+async def test_register_marks_values_taken(session_factory, index):
+    index.remember_available("login", "fresh")
+
+    async with session_factory() as db:
+        with patch.object(AuthUtil, "HashPasswordAsync", new=AsyncMock(return_value="hash")):
+            await AuthService.register(db, new_user("fresh", "fresh@example.com"))
+        response = await AuthService.check_availability(db, email="fresh@example.com", login="fresh")
+
+    assert (response.email, response.login) == (False, False)
+
+
+@pytest.mark.asyncio
+async def test_edited_login_and_email_are_taken_at_once(session_factory, index, monkeypatch):
+    monkeypatch.setattr(user_service, "availability_index", index)
+    async with session_factory() as db:
+        before = await AuthService.check_availability(db, email="renamed@example.com", login="renamed")
+        await UserService.edit_user(db, 1, UserUpdate(login="renamed", email="renamed@example.com"))
+        after = await AuthService.check_availability(db, email="renamed@example.com", login="renamed")
+
+    assert (before.email, before.login) == (True, True)
+    assert (after.email, after.login) == (False, False)
@@ -0,0 +1,81 @@
+import io
+import json
+import pytest
+import pytest_asyncio
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import select
+from src.main import app  # registers every mapped model
+from src.config import settings
+from src.auth.service import AuthService
+from src.auth.utils.bulk_import import MAX_BATCH_SIZE, USER_FIELDS, iter_rows, read_batches, validate_row
+from src.auth.utils.util import AuthUtil
+from src.user.models.user import User
+
+
+@pytest_asyncio.fixture
+async def sqlite_db(session_factory):
+    async with session_factory() as session:
+        yield session
+
+
+def test_iter_rows_csv_and_ndjson():
+    csv_rows = list(iter_rows(io.StringIO("login,email,phone_number\nann,ann@example.com,\n"), "csv"))
+    ndjson_rows = list(iter_rows(io.StringIO('{"login": "bob"}\n\nnot json\n[1]\n'), "ndjson"))
+
+    assert csv_rows == [{"login": "ann", "email": "ann@example.com", "phone_number": None}]
+    assert ndjson_rows[0] == {"login": "bob"}
+    assert "Invalid JSON" in ndjson_rows[1]["__error__"]
+    assert ndjson_rows[2] == {"__error__": "Row must be a JSON object"}
+
+
+def test_validate_row_applies_user_create_rules():
+    user, errors = validate_row({"login": "ann", "email": "ann@example.com", "password": "Password123#",
+                                 "first_name": "Ann", "last_name": "Lee"})
+    assert user is not None and errors == []
+
+    user, errors = validate_row({"login": "ann", "email": "not-an-email", "password": "short",
+                                 "first_name": "Ann", "last_name": "Lee"})
+    assert user is None
+    assert any(error.startswith("email") for error in errors)
+    assert any(error.startswith("password") for error in errors)
+
+
+@pytest.mark.asyncio
+async def test_bulk_register_reports_each_row(sqlite_db):
+    sqlite_db.add(User(login="taken", email="taken@example.com", password="x", first_name="T", last_name="T"))
+    await sqlite_db.commit()
+
+    lines = [
+        {"login": "ann", "email": "ann@example.com", "password": "Password123#", "first_name": "Ann", "last_name": "Lee"},
+        {"login": "taken", "email": "new@example.com", "password": "Password123#", "first_name": "T", "last_name": "T"},
+        {"login": "bad", "email": "bad", "password": "Password123#", "first_name": "B", "last_name": "B"},
+        {"login": "ann", "email": "other@example.com", "password": "Password123#", "first_name": "A", "last_name": "L"},
+        {"login": "cid", "email": "cid@example.com", "password": "Password123#", "first_name": "Cid", "last_name": "Ray"},
+    ]
+    stream = io.StringIO("\n".join(json.dumps(line) for line in lines))
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        report = await AuthService.bulk_register(
+            sqlite_db, iter_rows(stream, "ndjson"), batch_size=2, executor=executor)
+
+    assert [row.status for row in report.rows] == ["created", "duplicate", "invalid", "duplicate", "created"]
+    assert (report.total, report.created, report.duplicates, report.invalid) == (5, 2, 2, 1)
+    assert report.users_per_second > 0
+
+    stored = (await sqlite_db.execute(select(User).where(User.login == "cid"))).scalar_one()
+    assert stored.id == report.rows[4].user_id
+    assert AuthUtil.VerifyPassword("Password123#", stored.password)
+
+
+@pytest.mark.asyncio
+async def test_bulk_register_caps_batches_and_requires_the_internal_token(api, monkeypatch):
+    monkeypatch.setattr(settings, "INTERNAL_API_TOKEN", "secret")
+    upload = {"file": ("users.ndjson", b'{"login": "ann"}\n', "application/x-ndjson")}
+    assert (await api.post("/auth/register/bulk", files=upload)).status_code == 403
+    response = await api.post("/auth/register/bulk", files=upload, headers={"X-Internal-Token": "secret"})
+    assert response.status_code == 200 and response.json()["invalid"] == 1
+
+    # One INSERT per batch may bind at most 32767 parameters
+    assert MAX_BATCH_SIZE * len(USER_FIELDS) <= 32767
+    batches = [batch async for batch in read_batches(({"n": i} for i in range(5)), 2)]
+    assert [len(batch) for batch in batches] == [2, 2, 1]
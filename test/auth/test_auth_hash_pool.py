@@ -0,0 +1,94 @@
+import asyncio
+import time
+import pytest
+from fastapi import HTTPException
+from src.auth.utils.hash_pool import PasswordHashPool
+from src.auth.utils.util import AuthUtil
+from src.monitoring.utils.metrics import MetricsRegistry, metrics
+
+
+def slow_identity(value, delay=0.2):
+    time.sleep(delay)
+    return value
+
+
+@pytest.mark.asyncio
+async def test_hash_and_verify_async_roundtrip():
+    hashed = await AuthUtil.HashPasswordAsync("Password123#")
+
+    assert await AuthUtil.VerifyPasswordAsync("Password123#", hashed)
+    assert not await AuthUtil.VerifyPasswordAsync("Wrong123#", hashed)
+
+
+@pytest.mark.asyncio
+async def test_pool_keeps_event_loop_responsive():
+    pool = PasswordHashPool(workers=2, max_pending=4)
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    ticker_task = asyncio.create_task(ticker())
+    try:
+        assert await pool.run(slow_identity, "ok") == "ok"
+    finally:
+        ticker_task.cancel()
+        pool.shutdown()
+
+    # A blocking call would have starved the ticker for the whole 200ms
+    assert ticks >= 5
+
+
+@pytest.mark.asyncio
+async def test_pool_rejects_when_queue_is_full():
+    pool = PasswordHashPool(workers=1, max_pending=2)
+    try:
+        running = [asyncio.create_task(pool.run(slow_identity, i)) for i in range(2)]
+        await asyncio.sleep(0)
+
+        busy = pool.stats()
+        assert (busy["pending"], busy["in_flight"]) == (2, 1)
+        with pytest.raises(HTTPException) as exc_info:
+            await pool.run(slow_identity, 3)
+
+        assert exc_info.value.status_code == 503
+        assert await asyncio.gather(*running) == [0, 1]
+    finally:
+        pool.shutdown()
+
+    stats = pool.stats()
+    assert stats["completed"] == 2
+    assert stats["rejected"] == 1
+    assert stats["pending"] == 0
+    assert stats["max_pending_seen"] == 2
+    assert stats["avg_wait_ms"] > 0
+
+
+def test_pool_rejects_unknown_executor():
+    with pytest.raises(ValueError):
+        PasswordHashPool(workers=1, max_pending=1, executor="fibers")
+
+
+@pytest.mark.asyncio
+async def test_pool_counts_reach_the_metrics():
+    pool = PasswordHashPool(workers=1, max_pending=1)
+    registry = MetricsRegistry()
+    registry.register_executor("password_hash", pool.stats)
+    try:
+        running = asyncio.create_task(pool.run(slow_identity, 1))
+        await asyncio.sleep(0)
+        with pytest.raises(HTTPException):
+            await pool.run(slow_identity, 2)
+        text = registry.render()
+        await running
+    finally:
+        pool.shutdown()
+
+    assert 'executor_pending{executor="password_hash"} 1' in text
+    assert 'executor_in_flight{executor="password_hash"} 1' in text
+    assert 'executor_rejected_total{executor="password_hash"} 1' in text
+    # The application's pool is registered on import
+    assert "password_hash" in metrics.executors
@@ -0,0 +1,62 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from passlib.context import CryptContext
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.auth.service import AuthService
+from src.auth.utils import rehash
+from src.auth.utils.calibrate import recommend_rounds
+from src.auth.utils.util import AuthUtil
+from src.main import app  # registers every mapped model
+from src.user.models.user import User
+
+
+def hash_with_rounds(password: str, rounds: int) -> str:
+    return CryptContext(schemes=["bcrypt"], bcrypt__rounds=rounds).hash(password)
+
+
+def test_needs_rehash_only_for_other_costs():
+    assert AuthUtil.NeedsRehash(hash_with_rounds("Password123#", 4))
+    assert not AuthUtil.NeedsRehash(AuthUtil.HashPassword("Password123#"))
+
+
+@pytest.mark.asyncio
+async def test_login_schedules_rehash_for_outdated_hash():
+    old_hash = hash_with_rounds("Password123#", 4)
+    user = User(id=3, login="cheap", password=old_hash)
+    result = MagicMock()
+    result.scalar_one_or_none.return_value = user
+    db = AsyncMock(spec=AsyncSession)
+    db.execute = AsyncMock(return_value=result)
+
+    with patch("src.auth.service.schedule_rehash") as schedule:
+        token = await AuthService.login(db, "cheap", "Password123#")
+
+    assert token.refresh_token is not None
+    schedule.assert_called_once_with(3, "Password123#", old_hash)
+
+
+@pytest.mark.asyncio
+async def test_rehash_password_swaps_hash_in_place():
+    session = AsyncMock(spec=AsyncSession)
+    session.execute = AsyncMock(return_value=MagicMock(rowcount=1))
+    session_factory = MagicMock()
+    session_factory.return_value.__aenter__.return_value = session
+
+    assert await rehash.rehash_password(3, "Password123#", "old-hash", session_factory)
+
+    statement = session.execute.await_args.args[0]
+    new_hash = statement.compile().params["password"]
+    assert AuthUtil.VerifyPassword("Password123#", new_hash)
+    assert not AuthUtil.NeedsRehash(new_hash)
+    session.commit.assert_awaited_once()
+
+
+def test_recommend_rounds_stays_within_budget():
+    timings = {8: 20.0, 9: 40.0, 10: 80.0, 11: 160.0, 12: 320.0}
+
+    recommended, measured = recommend_rounds(
+        target_ms=100, start_rounds=8, max_rounds=14,
+        measure=lambda rounds, samples: timings[rounds])
+
+    assert recommended == 10
+    assert list(measured) == [8, 9, 10, 11]
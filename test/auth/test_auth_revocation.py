@@ -0,0 +1,145 @@
+import asyncio
+import pytest
+import httpx
+from unittest.mock import AsyncMock
+from fastapi import HTTPException
+from src.main import app
+from sqlalchemy import select
+from src.auth.models.token import RevokedToken
+from src.auth.service import AuthService
+from src.auth.utils.revocation import (
+    BloomFilter, DatabaseRevocationBackend, InMemoryRevocationBackend, RevocationStore, revocation_store
+)
+from src.auth.utils.util import AuthUtil
+from src.user.models.user import User
+
+
+@pytest.fixture
+def memory_store():
+    backend = revocation_store.backend
+    revocation_store.use_backend(InMemoryRevocationBackend())
+    yield revocation_store
+    revocation_store.use_backend(backend)
+
+
+async def seed(session_factory):
+    async with session_factory() as session:
+        session.add(User(id=5, login="user5", email="user5@example.com", password="x",
+                         first_name="First", last_name="Last"))
+        await session.commit()
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    keys = [f"jti-{i}" for i in range(1000)]
+    for key in keys:
+        bloom.add(key)
+
+    assert all(key in bloom for key in keys)
+    false_positives = sum(f"other-{i}" in bloom for i in range(10000))
+    assert false_positives < 300
+
+
+@pytest.mark.asyncio
+async def test_non_revoked_check_skips_backend():
+    backend = InMemoryRevocationBackend()
+    backend.is_revoked = AsyncMock(return_value=False)
+    store = RevocationStore(backend, capacity=100)
+
+    assert not await store.is_revoked("never-revoked")
+    backend.is_revoked.assert_not_awaited()
+
+    await store.revoke("revoked", exp=4102444800)
+    backend.is_revoked.return_value = True
+    assert await store.is_revoked("revoked")
+    backend.is_revoked.assert_awaited_once_with("revoked")
+
+
+@pytest.mark.asyncio
+async def test_sync_picks_up_revocations_from_other_workers():
+    backend = InMemoryRevocationBackend()
+    store = RevocationStore(backend, capacity=100, sync_seconds=0)
+    other_worker = RevocationStore(backend, capacity=100)
+
+    assert not await store.is_revoked("shared")
+    await other_worker.revoke("shared", exp=4102444800)
+
+    assert await store.is_revoked("shared")
+
+
+@pytest.mark.asyncio
+async def test_sync_purges_expired_revocations(session_factory):
+    backend = DatabaseRevocationBackend(session_factory)
+    store = RevocationStore(backend, capacity=100)
+    await store.revoke("expired", exp=946684800)
+    await store.revoke("active", exp=4102444800)
+
+    await store.sync()
+
+    async with session_factory() as session:
+        assert set((await session.execute(select(RevokedToken.jti))).scalars()) == {"active"}
+    assert await store.is_revoked("active")
+    assert not await store.is_revoked("expired")
+
+
+@pytest.mark.asyncio
+async def test_refresh_rotates_and_rejects_reuse(memory_store, session_factory):
+    await seed(session_factory)
+    refresh_token = AuthUtil.GenerateRefreshToken(5)
+
+    async with session_factory() as session:
+        tokens = await AuthService.refresh(session, refresh_token)
+
+        assert AuthUtil.TokenVerification(tokens.access_token).type == "access"
+        assert AuthUtil.TokenVerification(tokens.refresh_token).id == 5
+        with pytest.raises(HTTPException) as exc_info:
+            await AuthService.refresh(session, refresh_token)
+        assert exc_info.value.detail == "Refresh token has been revoked"
+
+        with pytest.raises(HTTPException) as exc_info:
+            await AuthService.refresh(session, AuthUtil.GenerateRefreshToken(6))
+        assert exc_info.value.detail == "User no longer exists"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_refreshes_exchange_a_token_once(memory_store, session_factory):
+    await seed(session_factory)
+    backend = DatabaseRevocationBackend(session_factory)
+    memory_store.use_backend(backend)
+    refresh_token = AuthUtil.GenerateRefreshToken(5)
+
+    async def exchange():
+        async with session_factory() as session:
+            return await AuthService.refresh(session, refresh_token)
+
+    outcomes = await asyncio.gather(*(exchange() for _ in range(5)), return_exceptions=True)
+    assert sum(not isinstance(outcome, HTTPException) for outcome in outcomes) == 1
+    assert await backend.is_revoked(AuthUtil.TokenVerification(refresh_token).jti)
+
+
+@pytest.mark.asyncio
+async def test_refresh_rejects_access_token(memory_store, session_factory):
+    with pytest.raises(HTTPException) as exc_info:
+        async with session_factory() as session:
+            await AuthService.refresh(session, AuthUtil.GenerateAccessToken(5))
+
+    assert exc_info.value.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_logout_revokes_access_and_refresh_tokens(memory_store):
+    access_token = AuthUtil.GenerateAccessToken(9)
+    refresh_token = AuthUtil.GenerateRefreshToken(9)
+    headers = {"access-token": access_token, "token-type": "bearer", "refresh-token": refresh_token}
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.post("/auth/logout", headers=headers)
+        assert response.status_code == 200
+
+        response = await client.post("/auth/logout", headers=headers)
+        assert response.status_code == 401
+        assert response.json()["detail"] == "Token has been revoked"
+
+        response = await client.post("/auth/refresh", json={"refresh_token": refresh_token})
+        assert response.status_code == 401
@@ -0,0 +1,130 @@
+import time
+import pytest
+import httpx
+from unittest.mock import AsyncMock, MagicMock, patch
+from fastapi import HTTPException, Request
+from src.main import app
+from src.database import get_db
+from src.auth.utils.throttle import InMemoryThrottleBackend, LoginThrottle, client_ip, login_throttle
+from src.auth.utils.util import AuthUtil
+from src.user.models.user import User
+
+
+@pytest.mark.asyncio
+async def test_sliding_window_weights_previous_window():
+    backend = InMemoryThrottleBackend()
+    for _ in range(10):
+        await backend.hit("k", window=60, now=30)
+
+    # Halfway through the next window half of the previous 10 still count
+    assert await backend.hit("k", window=60, now=90) == pytest.approx(6)
+    # Two windows later nothing from the first window remains
+    assert await backend.hit("k", window=60, now=150) == pytest.approx(1 + 1 * 0.5)
+
+
+@pytest.mark.asyncio
+async def test_memory_stays_bounded():
+    backend = InMemoryThrottleBackend(max_keys=100)
+    for i in range(1000):
+        await backend.hit(f"ip:{i}", window=60, now=i)
+
+    assert len(backend) <= 100
+
+
+@pytest.mark.asyncio
+async def test_throttle_rejects_per_login_and_per_ip():
+    throttle = LoginThrottle(InMemoryThrottleBackend(), per_ip=5, per_login=2, window_seconds=60)
+
+    await throttle.check("1.1.1.1", "alice")
+    await throttle.check("1.1.1.1", "Alice")
+    with pytest.raises(HTTPException) as exc_info:
+        await throttle.check("1.1.1.1", "ALICE ")
+    assert exc_info.value.status_code == 429
+    # Guessing from one address does not lock the owner out elsewhere
+    await throttle.check("1.1.1.2", "alice")
+
+    for login in ("a", "b", "c", "d"):
+        await throttle.check("2.2.2.2", login)
+    await throttle.check("2.2.2.2", "e")
+    with pytest.raises(HTTPException):
+        await throttle.check("2.2.2.2", "f")
+
+
+@pytest.mark.asyncio
+async def test_throttle_rejects_one_login_attacked_from_many_ips():
+    throttle = LoginThrottle(InMemoryThrottleBackend(), per_ip=5, per_login=2, window_seconds=60, per_account=4)
+
+    for i in range(4):
+        await throttle.check(f"10.0.0.{i}", "carol")
+    with pytest.raises(HTTPException) as exc_info:
+        await throttle.check("10.0.0.99", "Carol")
+    assert exc_info.value.status_code == 429
+    # Other accounts are unaffected
+    await throttle.check("10.0.0.99", "dave")
+
+
+def test_client_ip_trusts_only_the_proxies_hops():
+    def request(forwarded=None):
+        headers = [(b"x-forwarded-for", forwarded.encode())] if forwarded else []
+        return Request({"type": "http", "headers": headers, "client": ("10.0.0.1", 443)})
+
+    # The proxy appends the real client; what the client sent itself is ignored
+    assert client_ip(request("6.6.6.6, 203.0.113.7"), trusted_hops=1) == "203.0.113.7"
+    assert client_ip(request("203.0.113.7, 10.0.0.9"), trusted_hops=2) == "203.0.113.7"
+    assert client_ip(request("203.0.113.7"), trusted_hops=3) == "203.0.113.7"
+    assert client_ip(request(), trusted_hops=1) == "10.0.0.1"
+    assert client_ip(request("6.6.6.6"), trusted_hops=0) == "10.0.0.1"
+
+
+@pytest.mark.asyncio
+async def test_successful_login_resets_login_counter():
+    throttle = LoginThrottle(InMemoryThrottleBackend(), per_ip=100, per_login=2, window_seconds=60)
+    await throttle.check("1.1.1.1", "bob")
+    await throttle.check("1.1.1.1", "bob")
+
+    await throttle.reset_login("1.1.1.1", "bob")
+
+    await throttle.check("1.1.1.1", "bob")
+
+
+@pytest.mark.asyncio
+async def test_flood_of_bad_logins_stops_before_bcrypt():
+    hashed = AuthUtil.HashPassword("Password123#")
+    result = MagicMock()
+    result.scalar_one_or_none.return_value = User(id=1, login="victim", password=hashed)
+    session = AsyncMock()
+    session.execute = AsyncMock(return_value=result)
+
+    async def stub_db():
+        yield session
+
+    app.dependency_overrides[get_db] = stub_db
+    backend = login_throttle.backend
+    login_throttle.backend = InMemoryThrottleBackend()
+    per_login = login_throttle.per_login
+    transport = httpx.ASGITransport(app=app)
+    try:
+        with patch.object(AuthUtil, "VerifyPasswordAsync", wraps=AuthUtil.VerifyPasswordAsync) as verify:
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                statuses = []
+                cpu_started = time.process_time()
+                for _ in range(per_login):
+                    response = await client.post("/auth/login", json={"login": "victim", "password": "Wrong123#"})
+                    statuses.append(response.status_code)
+                allowed_cpu = time.process_time() - cpu_started
+
+                cpu_started = time.process_time()
+                for _ in range(200):
+                    response = await client.post("/auth/login", json={"login": "victim", "password": "Wrong123#"})
+                    statuses.append(response.status_code)
+                flood_cpu = time.process_time() - cpu_started
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        login_throttle.backend = backend
+
+    assert statuses[:per_login] == [401] * per_login
+    assert set(statuses[per_login:]) == {429}
+    assert verify.await_count == per_login
+    assert session.execute.await_count == per_login
+    # 200 rejected attempts cost less CPU than the handful of real bcrypt checks
+    assert flood_cpu < allowed_cpu
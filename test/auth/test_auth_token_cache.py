@@ -0,0 +1,70 @@
+import time
+import pytest
+from datetime import timedelta
+from unittest.mock import patch
+from fastapi import HTTPException
+from src.auth.utils.token_cache import CachingTokenVerifier
+from src.auth.utils.util import AuthUtil
+
+
+def test_repeat_verification_hits_cache():
+    verifier = CachingTokenVerifier(max_size=10)
+    token = AuthUtil.GenerateToken({"id": "7"})
+
+    with patch("src.auth.utils.token_cache.AuthUtil.TokenVerification",
+               wraps=AuthUtil.TokenVerification) as decode:
+        first = verifier.verify(token)
+        second = verifier.verify(token)
+
+    assert first.id == second.id == 7
+    assert decode.call_count == 1
+    assert verifier.stats()["hits"] == 1
+    assert verifier.stats()["misses"] == 1
+
+
+def test_cached_token_rejected_after_exp():
+    now = [time.time()]
+    verifier = CachingTokenVerifier(max_size=10, clock=lambda: now[0])
+    token = AuthUtil.GenerateToken({"id": "1"}, expires_delta=timedelta(seconds=30))
+    verifier.verify(token)
+
+    now[0] += 60
+    with pytest.raises(HTTPException) as exc_info:
+        verifier.verify(token)
+
+    assert exc_info.value.status_code == 401
+    assert verifier.stats()["size"] == 0
+
+
+def test_lru_evicts_oldest_entry():
+    verifier = CachingTokenVerifier(max_size=2)
+    tokens = [AuthUtil.GenerateToken({"id": str(i)}) for i in range(3)]
+    for token in tokens:
+        verifier.verify(token)
+
+    verifier.verify(tokens[0])
+
+    assert verifier.stats()["size"] == 2
+    assert verifier.misses == 4
+
+
+def test_revocation_hook_rejects_cached_token():
+    revoked = set()
+    verifier = CachingTokenVerifier(max_size=10, is_revoked=lambda data: data.id in revoked)
+    token = AuthUtil.GenerateToken({"id": "3"})
+    verifier.verify(token)
+
+    revoked.add(3)
+    with pytest.raises(HTTPException) as exc_info:
+        verifier.verify(token)
+
+    assert exc_info.value.detail == "Token has been revoked"
+
+
+def test_invalid_token_is_not_cached():
+    verifier = CachingTokenVerifier(max_size=10)
+
+    with pytest.raises(HTTPException):
+        verifier.verify("not-a-jwt")
+
+    assert verifier.stats()["size"] == 0
@@ -0,0 +1,104 @@
+from typing import Optional
+
+import httpx
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from src.main import app  # registers every mapped model
+from src.config import settings
+from src.models import Base
+from src.database import PrimarySession, get_db
+from src.dependencies import get_read_db
+from src.dialects import install_sqlite_pragmas
+from src.auth.utils.revocation import InMemoryRevocationBackend, revocation_store
+from src.auth.utils.util import AuthUtil
+from src.monitoring.utils.queries import install_query_hooks
+from src.user.models.user import User
+from src.user.utils.card_cache import user_cards
+
+
+@pytest.fixture
+def auth_headers():
+    def headers(user_id: int) -> dict:
+        return {"access-token": AuthUtil.GenerateAccessToken(user_id), "token-type": "bearer"}
+    return headers
+
+
+@pytest.fixture
+def make_user():
+    """
+    Builds an unsaved User: login user<id> and email <login>@example.com
+    unless given, any other column overridable by keyword.
+    """
+    def make(user_id: int, login: Optional[str] = None, **fields) -> User:
+        login = login or f"user{user_id}"
+        values = {"email": f"{login}@example.com", "password": "x", "first_name": "First", "last_name": "Last"}
+        return User(id=user_id, login=login, **{**values, **fields})
+    return make
+
+
+@pytest.fixture
+def internal_headers(monkeypatch):
+    """
+    Headers for the internal routes, with a token configured for the test.
+    """
+    monkeypatch.setattr(settings, "INTERNAL_API_TOKEN", "internal-test-token")
+    return {"X-Internal-Token": "internal-test-token"}
+
+
+@pytest_asyncio.fixture
+async def make_engine(tmp_path):
+    """
+    Creates SQLite databases under tmp_path, set up as src.database sets up
+    its engines and with every table created; all disposed after the test.
+    """
+    engines = []
+
+    async def make(name: str = "test.db") -> AsyncEngine:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / name}")
+        engines.append(engine)
+        install_sqlite_pragmas(engine.sync_engine)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        return engine
+
+    yield make
+    for engine in engines:
+        await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def session_factory(make_engine):
+    """
+    Sessions on a fresh SQLite database with every table created, and no
+    user card cached from another test's database.
+    """
+    user_cards.clear()
+    engine = await make_engine()
+    install_query_hooks(engine.sync_engine)
+    return sessionmaker(engine, class_=AsyncSession, sync_session_class=PrimarySession, expire_on_commit=False)
+
+
+@pytest_asyncio.fixture
+async def api(session_factory):
+    """
+    HTTP client for the app with both database dependencies bound to
+    `session_factory` and token revocation kept in memory.
+    """
+    async def test_db():
+        async with session_factory() as session:
+            yield session
+
+    backend = revocation_store.backend
+    revocation_store.use_backend(InMemoryRevocationBackend())
+    app.dependency_overrides[get_db] = test_db
+    app.dependency_overrides[get_read_db] = test_db
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            yield client
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        app.dependency_overrides.pop(get_read_db, None)
+        revocation_store.use_backend(backend)
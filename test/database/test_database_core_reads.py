@@ -0,0 +1,93 @@
+from datetime import datetime, timedelta
+
+import pytest
+from src.main import app  # registers every mapped model
+from src.hobby.models.category import Category
+from src.hobby.models.hobby import Hobby, user_hobby_association
+from src.match.models.userLiked import UserLiked
+from src.match.service import MatchService
+from src.messages.models.message import Message
+from src.messages.service import MessageService
+from src.monitoring.utils.queries import track_queries
+from src.reads import CoreReads, core_reads
+from src.user.models.user import User
+from src.user.models.user_photo import UserPhoto
+
+
+async def seed(session_factory, make_user):
+    start = datetime(2025, 1, 1)
+    async with session_factory() as session:
+        session.add_all([make_user(i) for i in range(1, 7)])
+        session.add(Category(id=1, name="Sport"))
+        await session.flush()
+        session.add_all([Hobby(id=1, name="Chess", category_id=1), Hobby(id=2, name="Tennis", category_id=1)])
+        session.add(UserPhoto(id=1, user_id=2, photo_url="https://example.com/2.jpg"))
+        session.add_all(Message(id=i, text=f"Message {i}", timestamp=start + timedelta(minutes=i),
+                                sender_id=1 + i % 2, receiver_id=2 - i % 2) for i in range(1, 31))
+        session.add(Message(id=31, text="Someone else", timestamp=start, sender_id=1, receiver_id=3))
+        # 2 and 3 match with 1; 4 and 5 only like 1; 1 likes 6 alone
+        session.add_all([UserLiked(liker_id=i, liked_id=1) for i in range(2, 6)])
+        session.add_all([UserLiked(liker_id=1, liked_id=i) for i in (2, 3, 6)])
+        await session.flush()
+        # 4 and 5 share a hobby with 6
+        await session.execute(user_hobby_association.insert(), [
+            {"user_id": 6, "hobby_id": 1}, {"user_id": 4, "hobby_id": 1}, {"user_id": 5, "hobby_id": 1},
+            {"user_id": 3, "hobby_id": 2},
+        ])
+        (await session.get(User, 2)).profile_photo_id = 1
+        await session.commit()
+
+
+async def _both_paths(monkeypatch, read):
+    """
+    What `read` returns through the ORM, then through Core.
+    """
+    monkeypatch.setattr(core_reads, "everything", False)
+    orm = await read()
+    monkeypatch.setattr(core_reads, "everything", True)
+    return orm, await read()
+
+
+def test_core_reads_setting():
+    reads = CoreReads("MessageService.get_conversation, MatchService.get_matches,")
+    assert reads.enabled("MatchService.get_matches")
+    assert not reads.enabled("MatchService.browse_users")
+    assert CoreReads("*").enabled("MatchService.browse_users")
+    assert not CoreReads("").enabled("MessageService.get_conversation")
+
+
+@pytest.mark.asyncio
+async def test_conversation_matches_the_orm(session_factory, monkeypatch, make_user):
+    await seed(session_factory, make_user)
+    async with session_factory() as session:
+        service = MessageService(session)
+        for skip, limit in ((0, 100), (5, 10), (28, 10)):
+            orm, core = await _both_paths(
+                monkeypatch, lambda: service.get_conversation(2, 1, skip=skip, limit=limit))
+            assert core == orm
+        assert [message["id"] for message in core] == [2, 1]
+
+        with track_queries() as stats:
+            await service.get_conversation(1, 3)
+        # Core statements still go through the engine hooks
+        assert stats.statements == 1
+
+
+@pytest.mark.asyncio
+async def test_match_lists_match_the_orm(session_factory, monkeypatch, make_user):
+    await seed(session_factory, make_user)
+    async with session_factory() as session:
+        service = MatchService(session)
+        for read in (lambda: service.get_matches(1),
+                     lambda: service.get_pending_likes(1, isIncoming=True),
+                     lambda: service.get_pending_likes(1),
+                     lambda: service.get_pending_likes(4, limit=1)):
+            orm, core = await _both_paths(monkeypatch, read)
+            assert core == orm and core
+
+        # Browsing draws at random, so compare the candidates
+        for user_id in (1, 2, 6):
+            orm, core = await _both_paths(monkeypatch, lambda: service.browse_users(user_id, limit=10))
+            assert sorted(core, key=lambda card: card["id"]) == sorted(orm, key=lambda card: card["id"])
+        assert sorted(card["id"] for card in core) == [4, 5]
+        assert len(await service.browse_users(2, limit=2)) == 2
@@ -0,0 +1,56 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import func, select, text
+from src.main import app  # registers every mapped model
+from src.datagen import DatasetSpec, chunk_ranges, generate_chunk, load_dataset
+from src.models import Base
+
+SPEC = DatasetSpec(seed=7, users=300, categories=4, hobbies=20, hobbies_per_user=3,
+                   likes_per_user=5, photos_per_user=2, messages=2000, chunk_size=400)
+
+
+def test_chunks_are_deterministic_and_cover_every_row():
+    ranges = list(chunk_ranges("user_likes", SPEC))
+    assert ranges[0][0] == 1 and ranges[-1][1] == SPEC.users + 1
+    assert all(stop == next_start for (_, stop), (next_start, _) in zip(ranges, ranges[1:]))
+
+    first = generate_chunk("messages", 1, 401, SPEC, "hash")
+    assert first == generate_chunk("messages", 1, 401, SPEC, "hash")
+    assert first != generate_chunk("messages", 1, 401, SPEC.model_copy(update={"seed": 8}), "hash")
+
+    likes = generate_chunk("user_likes", 1, 81, SPEC, "hash")
+    assert len(likes) == len(set(likes)) == 80 * SPEC.likes_per_user
+    assert all(liker != liked and 1 <= liked <= SPEC.users for liker, liked in likes)
+
+
+@pytest_asyncio.fixture
+async def engine(make_engine):
+    return await make_engine("datagen.db")
+
+
+@pytest.mark.asyncio
+async def test_load_dataset_into_sqlite(engine):
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        report = await load_dataset(engine, SPEC, executor)
+
+    expected = {
+        "users": SPEC.users,
+        "user_photos": SPEC.users * SPEC.photos_per_user,
+        "user_hobby": SPEC.users * SPEC.hobbies_per_user,
+        "user_likes": SPEC.users * SPEC.likes_per_user,
+        "messages": SPEC.messages,
+    }
+    async with engine.connect() as conn:
+        for table, rows in expected.items():
+            assert report[table]["rows"] == rows
+            count = select(func.count()).select_from(Base.metadata.tables[table])
+            assert (await conn.execute(count)).scalar() == rows
+        # Foreign keys are enforced, so every reference above resolved
+        assert (await conn.execute(text("PRAGMA foreign_key_check"))).all() == []
+        assert (await conn.execute(text("SELECT count(*) FROM users WHERE profile_photo_id IS NULL"))).scalar() == 0
+
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        with pytest.raises(ValueError, match="already has users"):
+            await load_dataset(engine, SPEC, executor)
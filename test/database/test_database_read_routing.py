@@ -0,0 +1,86 @@
+import pytest
+from sqlalchemy import text
+from src.main import app  # registers every mapped model
+from src import database, dependencies
+from src.auth.schemas.token_data import TokenData
+from src.database import ReadYourWrites, current_user_id
+from src.hobby.models.category import Category
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def tracker(monkeypatch):
+    tracker = ReadYourWrites(window_seconds=5, clock=FakeClock())
+    monkeypatch.setattr(database, "read_your_writes", tracker)
+    monkeypatch.setattr(dependencies, "read_your_writes", tracker)
+    return tracker
+
+
+def test_window_expires():
+    clock = FakeClock()
+    tracker = ReadYourWrites(window_seconds=5, clock=clock)
+    tracker.mark(7)
+
+    assert tracker.wrote_recently(7)
+    assert not tracker.wrote_recently(8)
+    clock.now += 5
+    assert not tracker.wrote_recently(7)
+
+
+@pytest.mark.asyncio
+async def test_only_committed_writes_mark_the_user(session_factory, tracker):
+    current_user_id.set(1)
+    async with session_factory() as session:
+        await session.execute(text("SELECT 1"))
+        await session.commit()
+    assert not tracker.wrote_recently(1)
+
+    async with session_factory() as session:
+        session.add(Category(name="rolled back"))
+        await session.flush()
+        await session.rollback()
+        await session.commit()
+    assert not tracker.wrote_recently(1)
+
+    async with session_factory() as session:
+        session.add(Category(name="music"))
+        await session.commit()
+    assert tracker.wrote_recently(1)
+
+
+@pytest.mark.asyncio
+async def test_get_read_db_sticks_recent_writers_to_primary(monkeypatch, tracker):
+    primary, replica = object(), object()
+
+    class Factory:
+        def __init__(self, session):
+            self.session = session
+
+        def __call__(self):
+            return self
+
+        async def __aenter__(self):
+            return self.session
+
+        async def __aexit__(self, *exc_info):
+            return False
+
+    monkeypatch.setattr(dependencies, "async_session", Factory(primary))
+    monkeypatch.setattr(dependencies, "read_session", Factory(replica))
+
+    async def session_for(user_id: int):
+        generator = dependencies.get_read_db(TokenData(id=user_id, exp=0))
+        session = await generator.__anext__()
+        await generator.aclose()
+        return session
+
+    tracker.mark(1)
+    assert await session_for(1) is primary
+    assert await session_for(2) is replica
@@ -0,0 +1,101 @@
+import gzip
+import json
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import func, select, text
+from src.main import app  # registers every mapped model
+from src.datagen import DatasetSpec, load_dataset
+from src.models import Base
+from src.snapshot import TABLES, export_snapshot, restore_snapshot
+
+SPEC = DatasetSpec(seed=3, users=200, categories=3, hobbies=12, hobbies_per_user=2,
+                   likes_per_user=4, photos_per_user=2, messages=1000, chunk_size=300)
+
+
+async def _contents(engine) -> dict:
+    async with engine.connect() as conn:
+        contents = {}
+        for name in TABLES:
+            table = Base.metadata.tables[name]
+            contents[name] = (await conn.execute(select(table).order_by(*table.primary_key.columns))).all()
+        contents["indexes"] = (await conn.execute(
+            text("SELECT name FROM sqlite_master WHERE type = 'index' ORDER BY name"))).all()
+        return contents
+
+
+@pytest_asyncio.fixture
+async def source(make_engine):
+    engine = await make_engine("source.db")
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        await load_dataset(engine, SPEC, executor)
+    return engine
+
+
+@pytest.mark.asyncio
+async def test_export_and_restore_round_trip(source, make_engine, tmp_path):
+    directory = str(tmp_path / "snapshot")
+    manifest = await export_snapshot(source, directory)
+    assert manifest["tables"]["messages"]["rows"] == SPEC.messages
+    expected = await _contents(source)
+
+    target = await make_engine("target.db")
+    report = await restore_snapshot(target, directory)
+    assert report["rows"]["users"] == SPEC.users
+    assert await _contents(target) == expected
+
+    # Restoring over existing data replaces it
+    async with target.begin() as conn:
+        await conn.execute(text("DELETE FROM messages WHERE id > 10"))
+    await restore_snapshot(target, directory)
+    assert await _contents(target) == expected
+
+    async with target.connect() as conn:
+        assert (await conn.execute(text("PRAGMA foreign_keys"))).scalar() == 1
+        assert (await conn.execute(text("PRAGMA foreign_key_check"))).all() == []
+
+
+@pytest.mark.asyncio
+async def test_literal_null_marker_survives_a_round_trip(source, make_engine, tmp_path):
+    async with source.begin() as conn:
+        await conn.execute(text("UPDATE messages SET text = '\\N' WHERE id = 1"))
+        await conn.execute(text("UPDATE messages SET text = '\"\\N\", he said' WHERE id = 2"))
+        await conn.execute(text("UPDATE users SET last_name = '\\N', phone_number = NULL WHERE id = 1"))
+    directory = str(tmp_path / "snapshot")
+    await export_snapshot(source, directory)
+    expected = await _contents(source)
+
+    target = await make_engine("target.db")
+    await restore_snapshot(target, directory)
+    assert await _contents(target) == expected
+    async with target.connect() as conn:
+        assert (await conn.execute(text("SELECT text FROM messages WHERE id = 1"))).scalar() == "\\N"
+        user = (await conn.execute(text("SELECT last_name, phone_number FROM users WHERE id = 1"))).one()
+        assert tuple(user) == ("\\N", None)
+
+
+@pytest.mark.asyncio
+async def test_failed_restore_leaves_data_untouched(source, tmp_path):
+    directory = tmp_path / "snapshot"
+    await export_snapshot(source, str(directory))
+    expected = await _contents(source)
+
+    manifest = json.loads((directory / "manifest.json").read_text())
+    manifest["format"] = 99
+    (directory / "manifest.json").write_text(json.dumps(manifest))
+    with pytest.raises(ValueError, match="format"):
+        await restore_snapshot(source, str(directory))
+
+    # Photos, likes and messages of users the snapshot no longer has
+    manifest["format"] = 1
+    manifest["tables"]["users"]["file"] = "empty_users.csv.gz"
+    (directory / "manifest.json").write_text(json.dumps(manifest))
+    with gzip.open(directory / "empty_users.csv.gz", "wt") as out:
+        out.write(",".join(manifest["tables"]["users"]["columns"]) + "\n")
+    with pytest.raises(ValueError, match="foreign key violations"):
+        await restore_snapshot(source, str(directory))
+
+    assert await _contents(source) == expected
+    async with source.connect() as conn:
+        assert (await conn.execute(select(func.count()).select_from(Base.metadata.tables["users"]))).scalar() == SPEC.users
@@ -0,0 +1,103 @@
+import pytest
+import pytest_asyncio
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from src.main import app  # registers every mapped model
+from src.database import PrimarySession, engine_options
+from src.dialects import insert_ignore, install_sqlite_pragmas
+from src.hobby.models.category import Category
+from src.hobby.models.hobby import Hobby
+from src.match.models.userLiked import UserLiked
+from src.messages.models.message import Message
+from src.models import Base
+from src.user.models.user import User
+from src.user.models.user_photo import UserPhoto
+
+MEMORY_URL = "sqlite+aiosqlite:///:memory:"
+
+
+def test_memory_database_shares_one_connection():
+    assert engine_options(MEMORY_URL)["poolclass"] is StaticPool
+    assert "poolclass" not in engine_options("sqlite+aiosqlite:///./connecthub.db")
+
+
+@pytest_asyncio.fixture
+async def session_factory():
+    """
+    The same engine setup src.database uses for a sqlite+aiosqlite DATABASE_URL.
+    """
+    engine = create_async_engine(MEMORY_URL, **engine_options(MEMORY_URL))
+    install_sqlite_pragmas(engine.sync_engine)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield sessionmaker(engine, class_=AsyncSession, sync_session_class=PrimarySession, expire_on_commit=False)
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_foreign_keys_are_enforced_and_cascade(session_factory, make_user):
+    async with session_factory() as session:
+        foreign_keys = (await session.execute(text("PRAGMA foreign_key_list(users)"))).all()
+        assert any(row.table == "user_photos" for row in foreign_keys)  # the use_alter key
+
+        session.add_all([make_user(1), make_user(2)])
+        await session.flush()
+        session.add_all([
+            UserPhoto(id=1, user_id=1, photo_url="https://example.com/1.jpg"),
+            UserLiked(liker_id=1, liked_id=2),
+            Message(text="hi", sender_id=2, receiver_id=1),
+        ])
+        await session.flush()
+        await session.execute(text("UPDATE users SET profile_photo_id = 1 WHERE id = 1"))
+        await session.commit()
+
+    async with session_factory() as session:
+        await session.execute(User.__table__.delete().where(User.id == 1))
+        await session.commit()
+        for model in (UserPhoto, UserLiked, Message):
+            assert (await session.execute(select(func.count()).select_from(model))).scalar() == 0
+
+    async with session_factory() as session:
+        session.add(Message(text="hi", sender_id=2, receiver_id=99))
+        with pytest.raises(Exception, match="FOREIGN KEY"):
+            await session.commit()
+
+
+@pytest.mark.asyncio
+async def test_insert_ignore_skips_duplicates(session_factory, make_user):
+    async with session_factory() as session:
+        session.add(make_user(1))
+        await session.commit()
+        rows = [{"login": "user1", "email": "other@example.com", "password": "x",
+                 "first_name": "A", "last_name": "B"},
+                {"login": "user2", "email": "user2@example.com", "password": "x",
+                 "first_name": "A", "last_name": "B"}]
+        result = await session.execute(insert_ignore(session, User.__table__).values(rows).returning(User.login))
+        assert [row.login for row in result] == ["user2"]
+
+
+@pytest.mark.asyncio
+async def test_routers_work_on_sqlite(session_factory, api, auth_headers, make_user):
+    async with session_factory() as session:
+        session.add_all([make_user(1), make_user(2), Category(id=1, name="Outdoors")])
+        await session.flush()
+        session.add(Hobby(id=1, name="Hiking", category_id=1))
+        await session.commit()
+    me, other = auth_headers(1), auth_headers(2)
+
+    assert (await api.post("/hobbies/my/", json=[1], headers=me)).status_code == 200
+    browsed = await api.get("/match/browse", headers=other)
+    assert [user["id"] for user in browsed.json()] == [1]
+    assert (await api.post("/match/like/1", headers=other)).status_code == 200
+    assert [user["id"] for user in (await api.get("/match/pending-incoming", headers=me)).json()] == [2]
+    sent = await api.post("/messages/", json={"text": "hello", "receiver_id": 2}, headers=me)
+    assert sent.status_code == 201
+    conversation = await api.get("/messages/conversation/2", headers=me)
+    assert [message["text"] for message in conversation.json()] == ["hello"]
+    assert (await api.post("/users/search", json={"login": "USER2"}, headers=me)).json()[0]["id"] == 2
+
+    assert (await api.delete("/users/me", headers=me)).status_code == 204
+    assert (await api.get("/messages/conversation/1", headers=other)).json() == []
+    assert (await api.get("/match/pending-outgoing", headers=other)).json() == []
@@ -5,5 +5,6 @@ from src.match.models.userLiked import UserLiked
 from src.messages.models.message import Message
 from src.hobby.models.hobby import Hobby
 from src.hobby.models.category import Category
+from src.auth.models.token import RevokedToken
 
-__all__ = ["User", "UserPhoto", "UserLiked", "Message", "Hobby", "Category"]
\ No newline at end of file
+__all__ = ["User", "UserPhoto", "UserLiked", "Message", "Hobby", "Category", "RevokedToken"]
\ No newline at end of file
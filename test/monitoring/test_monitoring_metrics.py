@@ -0,0 +1,76 @@
+import pytest
+from src.monitoring.utils import metrics as metrics_module
+from src.monitoring.utils.metrics import MetricsRegistry, instrumented, metrics
+from src.user.models.user import User
+
+
+def test_render_prometheus_text():
+    registry = MetricsRegistry()
+    registry.observe_request("GET", "/users/{user_id}", 200, 0.004)
+    registry.observe_request("GET", "/users/{user_id}", 404, 0.2)
+    registry.in_flight = 3
+
+    text = registry.render()
+
+    assert "http_requests_in_flight 3" in text
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/users/{user_id}",le="0.005"} 1' in text
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/users/{user_id}",le="+Inf"} 2' in text
+    assert 'http_request_duration_seconds_count{method="GET",route="/users/{user_id}"} 2' in text
+    assert 'http_requests_total{method="GET",route="/users/{user_id}",status="404"} 1' in text
+
+
+@pytest.mark.asyncio
+async def test_instrumented_times_static_and_instance_methods(monkeypatch):
+    # A registry of its own, so ExampleService never shows up on /metrics
+    registry = MetricsRegistry()
+    monkeypatch.setattr(metrics_module, "metrics", registry)
+
+    @instrumented
+    class ExampleService:
+        def __init__(self, value):
+            self.value = value
+
+        async def get(self):
+            return self.value
+
+        @staticmethod
+        async def fail():
+            raise ValueError("boom")
+
+        async def _private(self):
+            return None
+
+    assert await ExampleService(5).get() == 5
+    with pytest.raises(ValueError):
+        await ExampleService.fail()
+
+    assert registry.services[("ExampleService", "get")].count == 1
+    assert registry.services[("ExampleService", "fail")].count == 1
+    assert ("ExampleService", "_private") not in registry.services
+    assert not any(service == "ExampleService" for service, _ in metrics.services)
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_reports_routes_and_services(session_factory, api, auth_headers, internal_headers):
+    async with session_factory() as session:
+        session.add(User(id=1, login="user1", email="user1@example.com", password="x",
+                         first_name="First", last_name="Last"))
+        await session.commit()
+    metrics.reset()
+
+    await api.get("/users/me", headers=auth_headers(1))
+    await api.get("/users/me", headers=auth_headers(1))
+    await api.get("/no/such/path")
+    response = await api.get("/metrics", headers=internal_headers)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = response.text
+    assert 'http_request_duration_seconds_count{method="GET",route="/users/me"} 2' in text
+    assert 'http_requests_total{method="GET",route="/users/me",status="200"} 2' in text
+    assert 'http_requests_total{method="GET",route="unmatched",status="404"} 1' in text
+    assert 'service_call_duration_seconds_count{service="UserService",method="get_user_card"} 2' in text
+    # The second card came from the card cache
+    assert 'service_call_duration_seconds_count{service="UserService",method="get_user"} 1' in text
+    # The scrape itself is still in flight while the page is rendered
+    assert "http_requests_in_flight 1" in text
@@ -0,0 +1,81 @@
+import pytest
+import httpx
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from src.main import app
+from src.config import settings
+from src.database import engine_options
+from src.monitoring.utils.histogram import Histogram
+from src.monitoring.utils.pool import InstrumentedAsyncQueuePool, PoolTelemetry, pool_stats
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram(buckets=(0.01, 0.1))
+    for value in (0.001, 0.01, 0.05, 3.0):
+        histogram.observe(value)
+
+    assert histogram.cumulative() == [(0.01, 2), (0.1, 3), (float("inf"), 4)]
+    assert histogram.snapshot()["buckets"] == {"0.01": 2, "0.1": 3, "+Inf": 4}
+
+
+def test_engine_options_follow_settings(monkeypatch):
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 20)
+    monkeypatch.setattr(settings, "DB_STATEMENT_CACHE_SIZE", 0)
+
+    options = engine_options("postgresql+asyncpg://u:p@localhost/db")
+
+    assert options["poolclass"] is InstrumentedAsyncQueuePool
+    assert options["pool_size"] == 20
+    assert options["connect_args"] == {"prepared_statement_cache_size": 0}
+    assert "pool_size" not in engine_options("sqlite+aiosqlite:///:memory:")
+
+
+@pytest.mark.asyncio
+async def test_pool_records_waits_and_timeouts(tmp_path):
+    pool_class = type("TestPool", (InstrumentedAsyncQueuePool,), {"telemetry": PoolTelemetry()})
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+                                 poolclass=pool_class, pool_size=1, max_overflow=0, pool_timeout=0.2)
+    try:
+        async with engine.connect() as held:
+            await held.execute(text("SELECT 1"))
+            stats = pool_stats(engine.sync_engine.pool)
+            assert (stats["checked_out"], stats["checked_in"]) == (1, 0)
+
+            with pytest.raises(exc.TimeoutError):
+                async with engine.connect():
+                    pass
+
+        stats = pool_stats(engine.sync_engine.pool)
+    finally:
+        await engine.dispose()
+
+    assert stats["checked_out"] == 0
+    assert stats["checkouts"] == 1
+    assert stats["timeouts"] == 1
+    assert stats["acquire_seconds"]["count"] == 2
+    # The timed-out checkout waited the full pool_timeout
+    assert stats["acquire_seconds"]["sum"] >= 0.2
+
+
+@pytest.mark.asyncio
+async def test_internal_pool_endpoint_requires_token(monkeypatch):
+    monkeypatch.setattr(settings, "INTERNAL_API_TOKEN", "secret")
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        denied = await client.get("/internal/pool")
+        allowed = await client.get("/internal/pool", headers={"X-Internal-Token": "secret"})
+
+    assert denied.status_code == 403
+    assert allowed.status_code == 200
+    assert "pool_class" in allowed.json()
+    assert allowed.json()["replica"] is None
+
+
+@pytest.mark.asyncio
+async def test_internal_routes_are_closed_without_a_configured_token(monkeypatch):
+    monkeypatch.setattr(settings, "INTERNAL_API_TOKEN", None)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        for path in ("/internal/pool", "/internal/queries", "/internal/profiles", "/metrics"):
+            assert (await client.get(path)).status_code == 404
+            assert (await client.get(path, headers={"X-Internal-Token": ""})).status_code == 404
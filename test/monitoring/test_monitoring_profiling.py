@@ -0,0 +1,89 @@
+import pstats
+
+import httpx
+import pytest
+from src.config import settings
+from src.main import app  # registers every mapped model
+from src.monitoring.middleware import ProfilingMiddleware
+from src.monitoring.utils.profiling import ProfileStore, profile_store
+from src.user.models.user import User
+from src.user.utils.card_cache import user_cards
+
+
+def _client(middleware) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=middleware), base_url="http://test")
+
+
+@pytest.mark.asyncio
+async def test_profiles_only_requests_that_ask(tmp_path, session_factory, api, auth_headers, monkeypatch):
+    # Every request reads the database rather than the card cache
+    monkeypatch.setattr(user_cards, "max_size", 0)
+    async with session_factory() as session:
+        session.add(User(id=1, login="user1", email="user1@example.com", password="x",
+                         first_name="First", last_name="Last"))
+        await session.commit()
+    store = ProfileStore(str(tmp_path))
+    async with _client(ProfilingMiddleware(app, store=store, token="secret")) as client:
+        plain = await client.get("/users/me", headers=auth_headers(1))
+        profiled = await client.get("/users/me",
+                                    headers={"X-Profile": "1", "X-Internal-Token": "secret", **auth_headers(1)})
+
+    assert profiled.status_code == 200
+    assert "x-profile-id" not in plain.headers
+    name = profiled.headers["x-profile-id"]
+    assert [entry["name"] for entry in store.list()] == [name]
+    functions = {function for _, _, function in pstats.Stats(store.path(name)).stats}
+    # Handler, response serialization and the database round trip are all captured
+    assert {"get_current_user", "dump_json", "execute"} <= functions
+
+
+@pytest.mark.asyncio
+async def test_profile_header_requires_internal_token(tmp_path):
+    store = ProfileStore(str(tmp_path))
+    async with _client(ProfilingMiddleware(app, store=store, token="secret")) as client:
+        denied = await client.get("/", headers={"X-Profile": "1", "X-Internal-Token": "wrong"})
+        allowed = await client.get("/", headers={"X-Profile": "1", "X-Internal-Token": "secret"})
+
+    assert "x-profile-id" not in denied.headers
+    assert "x-profile-id" in allowed.headers
+    assert len(store.list()) == 1
+
+
+@pytest.mark.asyncio
+async def test_profile_header_is_ignored_without_a_configured_token(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "INTERNAL_API_TOKEN", None)
+    store = ProfileStore(str(tmp_path))
+    async with _client(ProfilingMiddleware(app, store=store)) as client:
+        response = await client.get("/", headers={"X-Profile": "1", "X-Internal-Token": ""})
+
+    assert response.status_code == 200
+    assert "x-profile-id" not in response.headers
+    assert store.list() == []
+
+
+@pytest.mark.asyncio
+async def test_sampling_and_ring_bound(tmp_path):
+    store = ProfileStore(str(tmp_path), max_files=3)
+    async with _client(ProfilingMiddleware(app, store=store, sample_rate=1.0)) as client:
+        names = [(await client.get("/")).headers["x-profile-id"] for _ in range(5)]
+
+    stored = {entry["name"] for entry in store.list()}
+    assert len(stored) == 3
+    assert names[-1] in stored
+
+
+@pytest.mark.asyncio
+async def test_download_endpoints(tmp_path, monkeypatch, api, internal_headers):
+    monkeypatch.setattr(profile_store, "directory", str(tmp_path))
+    async with _client(ProfilingMiddleware(app, store=profile_store)) as client:
+        name = (await client.get("/", headers={"X-Profile": "1", **internal_headers})).headers["x-profile-id"]
+
+    listing = await api.get("/internal/profiles", headers=internal_headers)
+    raw = await api.get(f"/internal/profiles/{name}", headers=internal_headers)
+    text = await api.get(f"/internal/profiles/{name}", params={"format": "text"}, headers=internal_headers)
+    escape = await api.get("/internal/profiles/..%2F..%2Fetc%2Fpasswd", headers=internal_headers)
+
+    assert [entry["name"] for entry in listing.json()] == [name]
+    assert raw.status_code == 200 and raw.content
+    assert "cumulative time" in text.text
+    assert escape.status_code == 404
@@ -0,0 +1,83 @@
+import logging
+import pytest
+from sqlalchemy import select
+from src.config import settings
+from src.monitoring.utils.queries import assert_max_queries, statement_shape, track_queries
+from src.match.models.userLiked import UserLiked
+from src.user.models.user import User
+from src.user.models.user_photo import UserPhoto
+
+
+async def seed(session_factory):
+    async with session_factory() as session:
+        session.add_all([
+            User(id=i, login=f"user{i}", email=f"user{i}@example.com", password="x",
+                 first_name="First", last_name="Last")
+            for i in range(1, 7)
+        ])
+        await session.flush()
+        session.add(UserPhoto(id=1, user_id=1, photo_url="http://example.com/1.jpg"))
+        session.add_all([UserLiked(liker_id=i, liked_id=1) for i in range(2, 7)])
+        session.add(UserLiked(liker_id=1, liked_id=2))
+        await session.commit()
+
+
+def test_statement_shape_ignores_parameters():
+    assert statement_shape("SELECT * FROM users WHERE id = $1") == "SELECT * FROM users WHERE id = ?"
+    assert (statement_shape("SELECT *\n  FROM users WHERE id IN ($1, $2, $3)")
+            == statement_shape("SELECT * FROM users WHERE id IN (?)"))
+
+
+@pytest.mark.asyncio
+async def test_repeated_shapes_are_flagged(session_factory):
+    await seed(session_factory)
+    with track_queries() as outer:
+        async with session_factory() as session:
+            with track_queries() as inner:
+                for user_id in range(1, 7):
+                    await session.execute(select(User).where(User.id == user_id))
+
+    assert inner.statements == outer.statements == 6
+    assert inner.rows == 6
+    assert inner.db_seconds > 0
+    [(shape, count)] = inner.suspected_n_plus_one()
+    assert count == 6 and "FROM users" in shape
+
+
+@pytest.mark.asyncio
+async def test_assert_max_queries_lists_statements(session_factory):
+    with pytest.raises(AssertionError, match="at most 1 statements, ran 2"):
+        with assert_max_queries(1):
+            async with session_factory() as session:
+                await session.execute(select(User))
+                await session.execute(select(UserPhoto))
+
+
+@pytest.mark.asyncio
+async def test_endpoint_query_budgets(session_factory, api, auth_headers):
+    await seed(session_factory)
+
+    with assert_max_queries(1):
+        assert (await api.get("/users/me", headers=auth_headers(1))).status_code == 200
+    with assert_max_queries(1):
+        assert (await api.get("/match/pending-incoming", headers=auth_headers(1))).status_code == 200
+    # The caller's hobbies, then the candidates
+    with assert_max_queries(2):
+        assert (await api.get("/match/browse", headers=auth_headers(1))).status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_middleware_headers_and_logs(session_factory, api, auth_headers, monkeypatch, caplog):
+    await seed(session_factory)
+    monkeypatch.setattr(settings, "QUERY_STATS_HEADERS", True)
+    # A threshold of 1 flags every shape, which exercises the warning path
+    monkeypatch.setattr(settings, "QUERY_N_PLUS_ONE_THRESHOLD", 1)
+
+    with caplog.at_level(logging.INFO, logger="src.monitoring.middleware"):
+        response = await api.get("/match/browse", headers=auth_headers(1))
+
+    assert response.headers["x-db-statements"] == "2"
+    assert float(response.headers["x-db-time-ms"]) > 0
+    assert response.headers["x-db-n-plus-one"] == "2"
+    assert "GET /match/browse: 2 statements" in caplog.text
+    assert "Suspected N+1" in caplog.text
@@ -0,0 +1,99 @@
+import logging
+
+import pytest
+from sqlalchemy import select, text
+from src.monitoring.utils.slow_queries import (
+    SlowQueryLog, fingerprint, install_slow_query_log, redact_parameters, slow_query_log
+)
+from src.user.models.user import User
+from src.user.utils.card_cache import user_cards
+
+
+def test_fingerprint_strips_literals_and_parameters():
+    first = fingerprint("SELECT users_1.id FROM users AS users_1 WHERE users_1.id = 5 AND login = 'bob'")
+    second = fingerprint("SELECT users_1.id FROM users AS users_1\n WHERE users_1.id = 17 AND login = 'o''neil'")
+    bound = fingerprint("SELECT users_1.id FROM users AS users_1 WHERE users_1.id = $1 AND login = $2")
+
+    assert first == second == bound
+    assert "users_1" in first
+    assert fingerprint("SELECT 1 FROM t WHERE id IN (1, 2, 3)") == fingerprint("SELECT 1 FROM t WHERE id IN ($1, $2)")
+
+
+def test_record_keeps_percentiles_callers_and_slowest_parameters(caplog):
+    log = SlowQueryLog(threshold_seconds=0.5, capture_parameters=True)
+    for millis in range(1, 101):
+        log.record("SELECT * FROM users WHERE id = $1", millis / 1000, (millis,))
+    with caplog.at_level(logging.WARNING, logger="src.monitoring.utils.slow_queries"):
+        log.record("SELECT * FROM users WHERE id = $1", 0.8, (999,))
+
+    [row] = log.top()
+    assert row["count"] == 101
+    assert row["p50_ms"] == pytest.approx(51, abs=1)
+    assert row["p95_ms"] == pytest.approx(96, abs=1)
+    assert row["max_ms"] == 800
+    assert row["parameters"] == "(999,)"
+    assert row["callers"] == {"unknown": 101}
+    assert "Slow query (800.0 ms)" in caplog.text
+
+
+def test_parameters_are_redacted_and_off_by_default():
+    log = SlowQueryLog()
+    log.record("SELECT * FROM users WHERE id = $1", 0.1, (1,))
+    assert log.top()[0]["parameters"] is None
+
+    assert redact_parameters(("bob", 5, "bob@example.com")) == ("<redacted>", 5, "<redacted>")
+    assert redact_parameters({"login": "bob"}) == {"login": "<redacted>"}
+
+
+@pytest.mark.asyncio
+async def test_captured_parameters_hide_passwords_emails_and_messages(session_factory, monkeypatch):
+    monkeypatch.setattr(slow_query_log, "capture_parameters", True)
+    install_slow_query_log(session_factory.kw["bind"].sync_engine)
+    slow_query_log.clear()
+    async with session_factory() as session:
+        session.add(User(id=1, login="user1", email="user1@example.com", password="$2b$12$secrethash",
+                         first_name="First", last_name="Last"))
+        await session.commit()
+        await session.execute(select(User.id).where(User.email == "user1@example.com", User.login == "user1"))
+        await session.execute(text("SELECT id FROM messages WHERE text = :text"), {"text": "private words"})
+
+    captured = " ".join(row["parameters"] or "" for row in slow_query_log.top())
+    assert "user1" in captured
+    for secret in ("secrethash", "example.com", "private words"):
+        assert secret not in captured
+    slow_query_log.clear()
+
+
+def test_fingerprints_are_bounded():
+    log = SlowQueryLog(max_fingerprints=2)
+    for table in ("a", "b", "c"):
+        log.record(f"SELECT * FROM {table}", 0.001)
+
+    assert {row["fingerprint"] for row in log.top()} == {"SELECT * FROM b", "SELECT * FROM c"}
+
+
+@pytest.mark.asyncio
+async def test_endpoint_attributes_statements_to_service_methods(session_factory, api, auth_headers, monkeypatch,
+                                                                 internal_headers):
+    # Every request reads the database rather than the card cache
+    monkeypatch.setattr(user_cards, "max_size", 0)
+    install_slow_query_log(session_factory.kw["bind"].sync_engine)
+    async with session_factory() as session:
+        session.add(User(id=1, login="user1", email="user1@example.com", password="x",
+                         first_name="First", last_name="Last"))
+        await session.commit()
+    slow_query_log.clear()
+
+    await api.get("/users/me", headers=auth_headers(1))
+    await api.get("/users/me", headers=auth_headers(1))
+    response = await api.get("/internal/queries", params={"sort": "count", "limit": 5}, headers=internal_headers)
+
+    assert response.status_code == 200
+    top = response.json()[0]
+    assert top["fingerprint"].startswith("SELECT users.id")
+    assert top["count"] == 2
+    assert top["callers"] == {"UserService.get_user": 2}
+
+    assert (await api.get("/internal/queries", params={"sort": "median"}, headers=internal_headers)).status_code == 422
+    assert (await api.delete("/internal/queries", headers=internal_headers)).status_code == 204
+    assert slow_query_log.top() == []
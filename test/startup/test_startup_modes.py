@@ -0,0 +1,76 @@
+import os
+import subprocess
+import sys
+import pytest
+import pytest_asyncio
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from src.main import app  # registers every mapped model
+from src.startup import SchemaMismatchError, bootstrap, verify_schema
+from src.user.models.user import User
+
+
+@pytest_asyncio.fixture
+async def engine(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'startup.db'}")
+    yield engine
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_startup_mode_timings(engine):
+    factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    await bootstrap("reset", engine, factory)
+    verify = await bootstrap("verify", engine, factory)
+    await bootstrap("skip", engine, factory)
+
+    async with factory() as session:
+        assert await session.scalar(select(func.count()).select_from(User)) == 10
+    assert verify < 0.5
+
+
+@pytest.mark.asyncio
+async def test_create_keeps_existing_rows(engine):
+    factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await bootstrap("create", engine, factory)
+    await verify_schema(engine)
+    async with factory() as session:
+        assert await session.scalar(select(func.count()).select_from(User)) == 0
+
+    await bootstrap("reset", engine, factory)
+    async with engine.begin() as conn:
+        await conn.execute(text("DROP TABLE messages"))
+    await bootstrap("create", engine, factory)
+    await verify_schema(engine)
+    async with factory() as session:
+        assert await session.scalar(select(func.count()).select_from(User)) == 10
+
+
+@pytest.mark.asyncio
+async def test_verify_reports_missing_tables_and_columns(engine):
+    with pytest.raises(SchemaMismatchError, match="users"):
+        await verify_schema(engine)
+
+    factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await bootstrap("reset", engine, factory)
+    async with engine.begin() as conn:
+        await conn.execute(text("ALTER TABLE messages DROP COLUMN photo_url"))
+
+    with pytest.raises(SchemaMismatchError) as exc_info:
+        await verify_schema(engine)
+    assert "messages.photo_url" in str(exc_info.value)
+    assert "users" not in str(exc_info.value)
+
+
+@pytest.mark.asyncio
+async def test_unknown_mode_is_rejected(engine):
+    with pytest.raises(ValueError):
+        await bootstrap("wipe", engine, None)
+
+
+def test_app_import_does_not_load_faker():
+    code = "import sys, src.main; sys.exit('faker' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], env=os.environ.copy(), capture_output=True)
+    assert result.returncode == 0, result.stderr.decode()
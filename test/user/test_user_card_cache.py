@@ -0,0 +1,163 @@
+import json
+
+import pytest
+from src.main import app  # registers every mapped model
+from src.monitoring.utils.metrics import metrics
+from src.user.models.user import User
+from src.user.models.user_photo import UserPhoto
+from src.user.utils.card_cache import InMemoryCardBackend, UserCardCache, user_cards
+
+
+async def seed(session_factory, make_user):
+    async with session_factory() as session:
+        session.add_all([make_user(1), make_user(2)])
+        await session.flush()
+        session.add_all([UserPhoto(id=1, user_id=1, photo_url="https://example.com/1.jpg"),
+                         UserPhoto(id=2, user_id=1, photo_url="https://example.com/2.jpg"),
+                         UserPhoto(id=3, user_id=2, photo_url="https://example.com/3.jpg")])
+        await session.flush()
+        (await session.get(User, 1)).profile_photo_id = 1
+        await session.commit()
+
+
+@pytest.mark.asyncio
+async def test_a_read_racing_a_write_is_not_cached():
+    cache = UserCardCache(max_size=10)
+    # Read before the write commits, cached after it
+    ticket = cache.reserve(1)
+    written = await cache.invalidate(1)
+    await cache.fill(1, ticket, b"old")
+    assert await cache.get(1) is None
+    await cache.write(1, written, b"new")
+    assert await cache.get(1) == b"new"
+
+    # Two writes: the first one's card, read before the second committed, loses
+    first = await cache.invalidate(1)
+    second = await cache.invalidate(1)
+    await cache.write(1, second, b"second")
+    await cache.write(1, first, b"first")
+    assert await cache.get(1) == b"second"
+
+    ticket = cache.reserve(1)
+    await cache.evict(1)
+    await cache.fill(1, ticket, b"deleted")
+    assert await cache.get(1) is None
+
+
+@pytest.mark.asyncio
+async def test_lru_bound_and_stats():
+    cache = UserCardCache(max_size=2)
+    for user_id in (1, 2, 3):
+        await cache.fill(user_id, cache.reserve(user_id), f"{user_id}".encode())
+    assert await cache.get(1) is None
+    assert await cache.get(3) == b"3"
+    assert cache.stats() == {"size": 2, "max_size": 2, "hits": 1, "local_hits": 1, "shared_hits": 0,
+                             "misses": 1, "hit_ratio": 0.5}
+    assert not UserCardCache(max_size=0).enabled
+    assert not UserCardCache(local_seconds=0).enabled
+
+
+@pytest.mark.asyncio
+async def test_local_cards_expire_without_a_shared_tier():
+    now = [0.0]
+    # Two workers without a shared tier: neither sees the other's writes
+    worker_a = UserCardCache(local_seconds=5, clock=lambda: now[0])
+    worker_b = UserCardCache(local_seconds=5, clock=lambda: now[0])
+    await worker_a.fill(1, worker_a.reserve(1), b"v1")
+    await worker_b.write(1, await worker_b.invalidate(1), b"v2")
+
+    now[0] += 4.9
+    assert await worker_a.get(1) == b"v1"
+    now[0] += 0.1
+    assert await worker_a.get(1) is None
+
+
+@pytest.mark.asyncio
+async def test_shared_tier_across_workers():
+    now = [0.0]
+    shared = InMemoryCardBackend(clock=lambda: now[0])
+    worker_a = UserCardCache(backend=shared, local_seconds=0, clock=lambda: now[0])
+    worker_b = UserCardCache(backend=shared, local_seconds=0, clock=lambda: now[0])
+
+    await worker_a.fill(1, worker_a.reserve(1), b"v1")
+    assert await worker_b.get(1) == b"v1"
+    assert worker_b.stats()["shared_hits"] == 1
+
+    await worker_b.write(1, await worker_b.invalidate(1), b"v2")
+    assert await worker_a.get(1) == b"v2"
+
+    # A read on one worker racing a write on the other cannot put its card back
+    ticket = worker_a.reserve(1)
+    await worker_b.write(1, await worker_b.invalidate(1), b"v3")
+    await worker_a.fill(1, ticket, b"v2")
+    assert await worker_a.get(1) == b"v3"
+
+    ticket = worker_a.reserve(1)
+    await worker_b.evict(1)
+    await worker_a.fill(1, ticket, b"v3")
+    assert await worker_a.get(1) is None and await worker_b.get(1) is None
+
+    # Without local copies no worker serves a card older than the last write;
+    # kept copies lag writes on other workers by at most local_seconds
+    lagging = UserCardCache(backend=shared, local_seconds=5, clock=lambda: now[0])
+    await worker_a.write(2, await worker_a.invalidate(2), b"v1")
+    assert await lagging.get(2) == b"v1"
+    await worker_b.write(2, await worker_b.invalidate(2), b"v2")
+    now[0] += 5
+    assert await lagging.get(2) == b"v2"
+
+
+@pytest.mark.asyncio
+async def test_no_stale_card_after_a_write_on_the_same_worker(session_factory, api, auth_headers, make_user):
+    await seed(session_factory, make_user)
+    me, other = auth_headers(1), auth_headers(2)
+
+    async def card(user_id: int = 1) -> dict:
+        # Read through both endpoints, twice, so cached cards are served too
+        response = await api.get("/users/me", headers=auth_headers(user_id))
+        assert response.status_code == 200
+        for _ in range(2):
+            assert (await api.get("/users/me", headers=auth_headers(user_id))).json() == response.json()
+            assert (await api.get(f"/users/{user_id}", headers=other)).json() == response.json()
+        return response.json()
+
+    hits = user_cards.stats()["hits"]
+    assert (await card())["profile_photo"]["id"] == 1
+    assert user_cards.stats()["hits"] == hits + 4
+
+    assert (await api.put("/users/me", json={"first_name": "Changed"}, headers=me)).status_code == 200
+    assert (await card())["first_name"] == "Changed"
+
+    assert (await api.put("/users/me/profile-photo", json={"photo_id": 2}, headers=me)).status_code == 200
+    assert (await card())["profile_photo"]["id"] == 2
+
+    assert (await api.delete("/users/me/profile-photo", headers=me)).status_code == 200
+    assert (await card())["profile_photo"] is None
+
+    await api.put("/users/me/profile-photo", json={"photo_id": 1}, headers=me)
+    assert (await card())["profile_photo"]["id"] == 1
+    assert (await api.delete("/users/me/photo/1", headers=me)).status_code == 204
+    assert (await card())["profile_photo"] is None
+
+    # Only the owner deletes a photo
+    assert (await card(2))["id"] == 2
+    assert (await api.delete("/users/me/photo/3", headers=me)).status_code == 404
+    async with session_factory() as session:
+        assert await session.get(UserPhoto, 3) is not None
+
+    assert (await api.delete("/users/me", headers=me)).status_code == 204
+    assert (await api.get("/users/me", headers=me)).status_code == 404
+    assert (await api.get("/users/1", headers=other)).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_cached_card_matches_the_response_model(session_factory, api, auth_headers, make_user):
+    await seed(session_factory, make_user)
+    cached = (await api.get("/users/2", headers=auth_headers(1))).content
+    assert json.loads(cached) == {"id": 2, "login": "user2", "email": "user2@example.com", "phone_number": None,
+                                  "first_name": "First", "last_name": "Last", "profile_photo": None}
+    assert await user_cards.get(2) == cached
+
+    text = metrics.render()
+    assert 'cache_hits_total{cache="user_card"}' in text
+    assert 'cache_hit_ratio{cache="user_card"}' in text
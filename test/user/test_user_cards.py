@@ -0,0 +1,64 @@
+import pytest
+from src.main import app  # registers every mapped model
+from src.match.models.userLiked import UserLiked
+from src.match.service import MatchService
+from src.monitoring.utils.queries import track_queries
+from src.user.models.user import User
+from src.user.models.user_photo import UserPhoto
+from src.user.schemas.user import UserSearch
+from src.user.service import UserService
+from src.user.utils.util import UserUtils
+
+
+async def seed(session_factory, make_user):
+    async with session_factory() as session:
+        session.add_all([make_user(i) for i in range(1, 6)])
+        await session.flush()
+        session.add(UserPhoto(id=1, user_id=2, photo_url="https://example.com/2.jpg"))
+        # 2 and 3 match with 1; 4 and 5 only like 1
+        session.add_all([UserLiked(liker_id=i, liked_id=1) for i in range(2, 6)])
+        session.add_all([UserLiked(liker_id=1, liked_id=i) for i in (2, 3)])
+        await session.flush()
+        (await session.get(User, 2)).profile_photo_id = 1
+        await session.commit()
+
+
+def test_card_query_skips_the_password():
+    columns = [column.name for column in UserUtils.card_query().selected_columns]
+    assert "password" not in columns
+    assert str(UserUtils.card_query()).count("JOIN") == 1
+
+
+@pytest.mark.asyncio
+async def test_cards_carry_the_profile_photo(session_factory, make_user):
+    await seed(session_factory, make_user)
+    async with session_factory() as session:
+        with track_queries() as stats:
+            card = await UserService.get_user(session, 2)
+        assert stats.statements == 1
+        assert card == {"id": 2, "login": "user2", "email": "user2@example.com", "phone_number": None,
+                        "first_name": "First", "last_name": "Last",
+                        "profile_photo": {"id": 1, "user_id": 2, "photo_url": "https://example.com/2.jpg"}}
+        assert (await UserService.get_user(session, 3))["profile_photo"] is None
+
+        found = await UserService.search_user(session, UserSearch(login="USER"))
+        assert sorted(card["id"] for card in found) == [1, 2, 3, 4, 5]
+        assert next(card for card in found if card["id"] == 2)["profile_photo"]["id"] == 1
+
+
+@pytest.mark.asyncio
+async def test_match_lists(session_factory, make_user):
+    await seed(session_factory, make_user)
+    async with session_factory() as session:
+        service = MatchService(session)
+        assert sorted(card["id"] for card in await service.get_matches(user_id=1)) == [2, 3]
+        # Matches are left out before the limit applies
+        assert sorted(card["id"] for card in await service.get_pending_likes(1, limit=2, isIncoming=True)) == [4, 5]
+        assert await service.get_pending_likes(1) == []
+
+        browsed = await service.browse_users(current_user_id=1, limit=10)
+        assert sorted(card["id"] for card in browsed) == [4, 5]
+        browsed = await service.browse_users(current_user_id=4, limit=1)
+        assert len(browsed) == 1 and browsed[0]["id"] in (2, 3, 5)
+        photos = {card["id"]: card["profile_photo"] for card in await service.browse_users(current_user_id=5)}
+        assert photos[2]["photo_url"] == "https://example.com/2.jpg" and photos[3] is None
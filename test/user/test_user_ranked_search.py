@@ -0,0 +1,115 @@
+import pytest
+from src.main import app  # registers every mapped model
+from src.pagination import encode_cursor
+from src.user.schemas.user import UserUpdate
+from src.user.service import UserService
+from src.user.utils.search import UserSearchIndex, prefix_query, trigrams
+
+
+async def seed(session_factory, make_user):
+    async with session_factory() as session:
+        session.add_all([
+            make_user(1, "anna", first_name="Anna", last_name="Nowak"),
+            make_user(2, "kowalski", first_name="Jan", last_name="Kowalski"),
+            make_user(3, "jan_k", first_name="Jan", last_name="Kowalczyk"),
+            make_user(4, "annabelle", first_name="Belle", last_name="Zielinska"),
+            make_user(5, "piotr", first_name="Piotr", last_name="Annanowicz"),
+        ])
+        await session.commit()
+
+
+def test_query_helpers():
+    assert prefix_query("Jan  Kowal!") == "jan:* & kowal:*"
+    assert prefix_query("' | !:*") == ""
+    assert trigrams("ab") == {"  a", " ab", "ab "}
+
+
+def test_index_ranks_prefixes_by_field():
+    index = UserSearchIndex()
+    index._load([(1, "anna", "Anna", "Nowak", "anna@example.com"),
+                 (2, "piotr", "Piotr", "Annanowicz", "piotr@example.com"),
+                 (3, "zofia", "Zofia", "Lis", "zofia@example.com")])
+    # A login match outranks a surname match
+    assert [user_id for _, user_id in index.search("ann", fuzzy=False)] == [1, 2]
+    # Every word has to match
+    assert [user_id for _, user_id in index.search("anna nowak", fuzzy=False)] == [1]
+    assert index.search("anna lis", fuzzy=False) == []
+    assert index.autocomplete("ZO", limit=5) == [3]
+
+
+@pytest.mark.asyncio
+async def test_ranked_search(session_factory, api, auth_headers, make_user):
+    await seed(session_factory, make_user)
+    me = auth_headers(1)
+
+    found = (await api.get("/users/search", params={"q": "Kowal"}, headers=me)).json()
+    assert [user["id"] for user in found] == [2, 3]
+    assert found[0] == {"id": 2, "login": "kowalski", "email": "kowalski@example.com", "phone_number": None,
+                        "first_name": "Jan", "last_name": "Kowalski", "profile_photo": None}
+    # Every word matching as a prefix ranks above a near miss
+    assert [user["id"] for user in (await api.get("/users/search", params={"q": "jan kowalcz"},
+                                                  headers=me)).json()] == [3, 2]
+    # A typo still finds the user
+    assert [user["id"] for user in (await api.get("/users/search", params={"q": "kowalsky"},
+                                                  headers=me)).json()][:1] == [2]
+    assert (await api.get("/users/search", params={"q": "!!"}, headers=me)).json() == []
+    assert (await api.get("/users/search", params={"q": ""}, headers=me)).status_code == 422
+    assert (await api.get("/users/search", params={"q": "anna", "cursor": encode_cursor(1)},
+                          headers=me)).status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_ranked_search_pages(session_factory, api, auth_headers, make_user):
+    await seed(session_factory, make_user)
+    me = auth_headers(1)
+
+    everyone = [user["id"] for user in (await api.get("/users/search", params={"q": "ann"}, headers=me)).json()]
+    assert everyone[:2] == [1, 4]
+
+    seen, cursor = [], None
+    while True:
+        params = {"q": "ann", "limit": 1, **({"cursor": cursor} if cursor else {})}
+        response = await api.get("/users/search", params=params, headers=me)
+        seen += [user["id"] for user in response.json()]
+        cursor = response.headers.get("x-next-cursor")
+        if cursor is None:
+            break
+    assert seen == everyone
+
+
+@pytest.mark.asyncio
+async def test_autocomplete(session_factory, api, auth_headers, make_user):
+    await seed(session_factory, make_user)
+    me = auth_headers(1)
+
+    suggested = (await api.get("/users/autocomplete", params={"q": "AN"}, headers=me)).json()
+    # Logins first, in order, then names; each user once
+    assert [user["id"] for user in suggested] == [1, 4, 5]
+    assert [user["id"] for user in (await api.get("/users/autocomplete", params={"q": "jan"},
+                                                  headers=me)).json()] == [3, 2]
+    assert [user["id"] for user in (await api.get("/users/autocomplete", params={"q": "a", "limit": 1},
+                                                  headers=me)).json()] == [1]
+    assert (await api.get("/users/autocomplete", params={"q": "x%"}, headers=me)).json() == []
+
+
+@pytest.mark.asyncio
+async def test_search_follows_writes(session_factory, make_user):
+    await seed(session_factory, make_user)
+    async with session_factory() as session:
+        assert [card["id"] for _, card in await UserService.rank_users(session, "nowak")] == [1]
+
+    async with session_factory() as session:
+        await UserService.edit_user(session, 1, UserUpdate(last_name="Lewandowska"))
+    async with session_factory() as session:
+        assert await UserService.rank_users(session, "nowak") == []
+        assert [card["last_name"] for _, card in await UserService.rank_users(session, "lewandowska")] \
+            == ["Lewandowska"]
+        assert [card["id"] for card in await UserService.autocomplete_users(session, "lewan")] == [1]
+
+    async with session_factory() as session:
+        await UserService.delete_user(session, 1)
+        session.add(make_user(6, "nowakowski", first_name="Adam", last_name="Nowakowski"))
+        await session.commit()
+    async with session_factory() as session:
+        assert [card["id"] for _, card in await UserService.rank_users(session, "lewandowska")] == []
+        assert [card["id"] for _, card in await UserService.rank_users(session, "nowak")] == [6]
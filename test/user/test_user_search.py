@@ -0,0 +1,74 @@
+import pytest
+from fastapi import HTTPException
+from src.main import app  # registers every mapped model
+from src.config import settings
+from src.monitoring.utils.queries import track_queries
+from src.pagination import decode_cursor, encode_cursor
+from src.user.schemas.user import UserSearch
+from src.user.service import UserService
+
+
+async def seed(session_factory, make_user):
+    async with session_factory() as session:
+        # Inserted out of id order; every third user is a Bob
+        session.add_all([make_user(i, first_name="Bob" if i % 3 == 0 else "Anna")
+                         for i in (7, 3, 1, 9, 4, 2, 8, 6, 5, 10)])
+        await session.commit()
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor(42), int) == (42,)
+    assert decode_cursor(encode_cursor(0.5, 42), float, int) == (0.5, 42)
+    for cursor in ("not a cursor", encode_cursor("42"), encode_cursor(1, 2), "", "=="):
+        with pytest.raises(HTTPException) as raised:
+            decode_cursor(cursor, int)
+        assert raised.value.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_search_pages_through_every_match_once(session_factory, api, auth_headers, make_user):
+    await seed(session_factory, make_user)
+    me = auth_headers(1)
+
+    seen, cursor, pages = [], None, 0
+    while True:
+        params = {"limit": 3, **({"cursor": cursor} if cursor else {})}
+        response = await api.post("/users/search", json={"login": "user"}, params=params, headers=me)
+        assert response.status_code == 200
+        seen += [user["id"] for user in response.json()]
+        pages += 1
+        cursor = response.headers.get("x-next-cursor")
+        if cursor is None:
+            break
+    assert seen == list(range(1, 11))
+    assert pages == 4
+
+    first_page = await api.post("/users/search", json={"first_name": "bob"}, params={"count": "true"}, headers=me)
+    assert [user["id"] for user in first_page.json()] == [3, 6, 9]
+    # SQLite has no planner estimate, so the count is exact there
+    assert first_page.headers["x-total-count"] == "3"
+    assert "x-next-cursor" not in first_page.headers
+
+
+@pytest.mark.asyncio
+async def test_search_bounds(session_factory, api, auth_headers, monkeypatch, make_user):
+    await seed(session_factory, make_user)
+    me = auth_headers(1)
+
+    # No match is an empty page, not an error
+    empty = await api.post("/users/search", json={"login": "nobody"}, headers=me)
+    assert empty.status_code == 200 and empty.json() == []
+    assert (await api.post("/users/search", json={"login": "user"}, params={"limit": 10_000},
+                           headers=me)).status_code == 422
+    assert (await api.post("/users/search", json={"login": "user"}, params={"cursor": "bogus"},
+                           headers=me)).status_code == 400
+    assert (await api.post("/users/search", json={}, headers=me)).status_code == 400
+
+    async with session_factory() as session:
+        # Callers of the service are capped too
+        monkeypatch.setattr(settings, "USER_SEARCH_MAX_PAGE_SIZE", 4)
+        assert len(await UserService.search_user(session, UserSearch(login="user"), limit=10_000)) == 4
+        with track_queries() as stats:
+            page = await UserService.search_user(session, UserSearch(login="user"), limit=2, after_id=8)
+        assert [user["id"] for user in page] == [9, 10]
+        assert stats.statements == 1
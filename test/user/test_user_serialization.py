@@ -0,0 +1,69 @@
+import json
+from datetime import datetime
+
+import pytest
+from sqlalchemy import select
+from src.main import app  # registers every mapped model
+from src.hobby.models.category import Category
+from src.hobby.models.hobby import Hobby
+from src.hobby.schemas.category import CategorySchema
+from src.messages.models.message import Message
+from src.messages.schemas.message import MessageSchema
+from src.serialization import json_response, trusted, trusted_list
+from src.user.models.user_photo import UserPhoto
+from src.user.schemas.user import UserSchema
+
+
+def test_payloads_serialize_like_validated_models(make_user):
+    photo = UserPhoto(id=3, user_id=1, photo_url="https://example.com/3.jpg")
+    user = make_user(1)
+    user.profile_photo = photo
+    payload = trusted(UserSchema, user)
+    assert payload["profile_photo"] == {"id": 3, "user_id": 1, "photo_url": "https://example.com/3.jpg"}
+    assert "password" not in payload
+    validated = UserSchema.model_validate(user, from_attributes=True)
+    assert json_response(UserSchema, payload).body == validated.model_dump_json().encode()
+
+    # Relationships that were never loaded take the default instead of lazy-loading
+    category = Category(id=1, name="Outdoors")
+    assert "hobbies" not in vars(category)
+    assert trusted(CategorySchema, category) == {"id": 1, "name": "Outdoors", "hobbies": []}
+
+    message = {"id": 1, "text": "hi", "photo_url": None, "timestamp": datetime(2025, 1, 1),
+               "sender_id": 1, "receiver_id": 2}
+    response = json_response(list[MessageSchema], trusted_list(MessageSchema, [message]))
+    assert response.media_type == "application/json"
+    assert json.loads(response.body) == [MessageSchema(**message).model_dump(mode="json")]
+
+
+@pytest.mark.asyncio
+async def test_responses_keep_their_shape(session_factory, api, auth_headers, make_user):
+    async with session_factory() as session:
+        session.add_all([make_user(1), make_user(2), Category(id=1, name="Outdoors")])
+        await session.flush()
+        session.add_all([UserPhoto(id=1, user_id=1, photo_url="https://example.com/1.jpg"),
+                         Hobby(id=1, name="Hiking", category_id=1),
+                         Message(text="hello", sender_id=1, receiver_id=2)])
+        await session.commit()
+    me = auth_headers(1)
+
+    assert (await api.put("/users/me/profile-photo", json={"photo_id": 1}, headers=me)).status_code == 200
+    edited = await api.put("/users/me", json={"first_name": "Renamed"}, headers=me)
+    assert edited.headers["content-type"] == "application/json"
+    assert edited.json() == {
+        "id": 1, "login": "user1", "email": "user1@example.com", "phone_number": None,
+        "first_name": "Renamed", "last_name": "Last",
+        "profile_photo": {"id": 1, "user_id": 1, "photo_url": "https://example.com/1.jpg"},
+    }
+    assert (await api.get("/users/1", headers=auth_headers(2))).json() == edited.json()
+    assert [user["id"] for user in (await api.post("/users/search", json={"login": "user"}, headers=me)).json()] == [1, 2]
+
+    async with session_factory() as session:
+        stored = (await session.execute(select(Message))).scalar_one()
+    conversation = (await api.get("/messages/conversation/2", headers=me)).json()
+    assert conversation == [json.loads(MessageSchema.model_validate(stored, from_attributes=True).model_dump_json())]
+
+    categories = (await api.get("/hobbies/categories/", headers=me)).json()
+    assert categories == [{"id": 1, "name": "Outdoors", "hobbies": [{"id": 1, "name": "Hiking", "category_id": 1}]}]
+    created = await api.post("/hobbies/categories/", json={"name": "Music"}, headers=me)
+    assert created.status_code == 201 and created.json() == {"id": 2, "name": "Music", "hobbies": []}